@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "0012_add_list_indexes"
+down_revision = "0011_add_scim"
+branch_labels = None
+depends_on = None
+
+# List endpoints filter on tenant (+ project) and order by created_at DESC, id DESC.
+# Postgres walks these ascending indexes backwards, so no sort node is needed.
+LIST_INDEXES = [
+    (
+        "ix_policies_tenant_project_created",
+        "policies",
+        ["tenant_id", "project_id", "created_at", "id"],
+    ),
+    (
+        "ix_runbooks_tenant_project_created",
+        "runbooks",
+        ["tenant_id", "project_id", "created_at", "id"],
+    ),
+    ("ix_projects_tenant_created", "projects", ["tenant_id", "created_at", "id"]),
+    (
+        "ix_role_bindings_tenant_project_created",
+        "role_bindings",
+        ["tenant_id", "project_id", "created_at", "id"],
+    ),
+]
+
+
+def upgrade() -> None:
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block.
+    with op.get_context().autocommit_block():
+        for name, table, columns in LIST_INDEXES:
+            op.create_index(name, table, columns, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(LIST_INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
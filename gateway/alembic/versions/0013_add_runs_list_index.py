@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "0013_add_runs_list_index"
+down_revision = "0012_add_list_indexes"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Backs keyset pagination in list_runs: (created_at, id) < cursor within a tenant/project.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_runs_tenant_project_created",
+            "runs",
+            ["tenant_id", "project_id", "created_at", "id"],
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_runs_tenant_project_created", table_name="runs", postgresql_concurrently=True
+        )
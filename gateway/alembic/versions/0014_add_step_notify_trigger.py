@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+from alembic import op
+from app.run_events import STEP_NOTIFY_DDL  # type: ignore
+
+# revision identifiers, used by Alembic.
+revision = "0014_add_step_notify_trigger"
+down_revision = "0013_add_runs_list_index"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Announces step inserts/status changes on the step_update channel so SSE streams are pushed
+    # updates instead of polling.
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    # Same statements init_db runs, so both paths install an identical trigger.
+    for statement in STEP_NOTIFY_DDL:
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    op.execute("DROP TRIGGER IF EXISTS steps_notify_update ON steps")
+    op.execute("DROP FUNCTION IF EXISTS notify_step_update()")
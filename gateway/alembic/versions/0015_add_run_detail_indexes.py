@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "0015_add_run_detail_indexes"
+down_revision = "0014_add_step_notify_trigger"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Steps are always listed per run ordered by started_at NULLS FIRST, name, and approvals are
+    # looked up per (run_id, step_name). The new indexes cover the old single-purpose prefixes.
+    # SQLite already sorts NULLs first and rejects NULLS FIRST in an index, as in the model.
+    started_at = (
+        sa.text("started_at ASC NULLS FIRST")
+        if op.get_bind().dialect.name == "postgresql"
+        else "started_at"
+    )
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_steps_run_started_name",
+            "steps",
+            ["run_id", started_at, "name"],
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "ix_steps_run_id_started_at", table_name="steps", postgresql_concurrently=True
+        )
+        op.create_index(
+            "ix_approvals_run_step",
+            "approvals",
+            ["run_id", "step_name"],
+            postgresql_concurrently=True,
+        )
+        op.drop_index("ix_approvals_run_id", table_name="approvals", postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_approvals_run_id", "approvals", ["run_id"], postgresql_concurrently=True
+        )
+        op.drop_index("ix_approvals_run_step", table_name="approvals", postgresql_concurrently=True)
+        op.create_index(
+            "ix_steps_run_id_started_at",
+            "steps",
+            ["run_id", "started_at"],
+            postgresql_concurrently=True,
+        )
+        op.drop_index("ix_steps_run_started_name", table_name="steps", postgresql_concurrently=True)
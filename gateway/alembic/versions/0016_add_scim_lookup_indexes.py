@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "0016_add_scim_lookup_indexes"
+down_revision = "0015_add_run_detail_indexes"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # SCIM resolves identities by (provider, external id) or (provider, email) and members by
+    # (user, provider); groups by (tenant, external id); role sync reads memberships per user.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_user_identities_provider_external",
+            "user_identities",
+            ["provider_id", "external_id"],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_user_identities_provider_email",
+            "user_identities",
+            ["provider_id", "email"],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_user_identities_user_provider",
+            "user_identities",
+            ["user_id", "provider_id"],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_groups_tenant_external",
+            "groups",
+            ["tenant_id", "external_id"],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_group_members_user_id", "group_members", ["user_id"], postgresql_concurrently=True
+        )
+        # Superseded by the (provider, external id) index; only databases built from the
+        # models ever had it
+        op.drop_index(
+            "ix_user_identities_external_id",
+            table_name="user_identities",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_user_identities_external_id",
+            "user_identities",
+            ["external_id"],
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "ix_group_members_user_id", table_name="group_members", postgresql_concurrently=True
+        )
+        op.drop_index(
+            "ix_groups_tenant_external", table_name="groups", postgresql_concurrently=True
+        )
+        op.drop_index(
+            "ix_user_identities_user_provider",
+            table_name="user_identities",
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "ix_user_identities_provider_email",
+            table_name="user_identities",
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "ix_user_identities_provider_external",
+            table_name="user_identities",
+            postgresql_concurrently=True,
+        )
@@ -1,6 +1,9 @@
 from __future__ import annotations
 
-from sqlalchemy import select
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+from sqlalchemy import func, insert, select
 from sqlalchemy.orm import Session
 
 from .db import SessionLocal
@@ -16,44 +19,126 @@ def write_audit(
     resource_type: str,
     resource_id: str | None,
     payload: dict | None = None,
+    db: Session | None = None,
 ) -> None:
-    """Write audit log entry with hash chain."""
-    with SessionLocal() as db:
-        # Get previous hash for tenant (or None if first)
-        prev_hash = None
-        if tenant_id:
-            stmt = (
-                select(AuditLog)
-                .where(AuditLog.tenant_id == tenant_id)
-                .order_by(AuditLog.ts.desc())
-                .limit(1)
-            )
-            prev = db.scalars(stmt).first()
-            if prev:
-                prev_hash = prev.hash
-
-        record = {
-            "actor_type": actor_type,
-            "actor_id": actor_id,
-            "tenant_id": tenant_id,
-            "action": action,
-            "resource_type": resource_type,
-            "resource_id": resource_id,
-            "payload": payload,
-        }
-        hash_value = hmac_hash(prev_hash, record)
-
-        audit_entry = AuditLog(
-            actor_type=actor_type,
-            actor_id=actor_id,
-            tenant_id=tenant_id,
-            action=action,
-            resource_type=resource_type,
-            resource_id=resource_id,
-            payload=payload,
-            prev_hash=prev_hash,
-            hash=hash_value,
+    """Write audit log entry with hash chain.
+
+    When ``db`` is given the entry is flushed on that session and committed with the caller's
+    transaction; otherwise it is written and committed on a session of its own.
+    """
+    if db is not None:
+        _append_audit(
+            db, actor_type, actor_id, tenant_id, action, resource_type, resource_id, payload
+        )
+        return
+
+    with SessionLocal() as own_db:
+        _append_audit(
+            own_db, actor_type, actor_id, tenant_id, action, resource_type, resource_id, payload
         )
-        db.add(audit_entry)
-        db.commit()
+        own_db.commit()
+
+
+def write_audit_batch(db: Session, tenant_id: str | None, entries: list[dict[str, Any]]) -> None:
+    """Append several audit entries of one tenant to its hash chain with a single INSERT.
+
+    Each entry holds the ``write_audit`` arguments other than ``tenant_id`` and ``db``. The
+    chain tail is read once and entries are chained in order, exactly as consecutive
+    ``write_audit`` calls would; they commit with the caller's transaction.
+    """
+    if not entries:
+        return
+    prev_hash, prev_ts = _chain_tail(db, tenant_id)
+    rows = []
+    for entry in entries:
+        row = _audit_row(prev_hash, prev_ts, tenant_id=tenant_id, **{"payload": None, **entry})
+        rows.append(row)
+        prev_hash, prev_ts = row["hash"], row["ts"]
+    db.execute(insert(AuditLog), rows)
+
 
+def _append_audit(
+    db: Session,
+    actor_type: str,
+    actor_id: str,
+    tenant_id: str | None,
+    action: str,
+    resource_type: str,
+    resource_id: str | None,
+    payload: dict | None,
+) -> None:
+    row = _audit_row(
+        *_chain_tail(db, tenant_id),
+        actor_type=actor_type,
+        actor_id=actor_id,
+        tenant_id=tenant_id,
+        action=action,
+        resource_type=resource_type,
+        resource_id=resource_id,
+        payload=payload,
+    )
+    db.add(AuditLog(**row))
+    db.flush()
+
+
+def _chain_tail(db: Session, tenant_id: str | None) -> tuple[str | None, datetime | None]:
+    """Hash and timestamp of the tenant's latest entry, or (None, None) if it has none.
+
+    On Postgres this first takes a per-tenant transaction-scoped advisory lock, so concurrent
+    writers of one tenant append one after another instead of chaining off the same tail.
+    """
+    if not tenant_id:
+        return None, None
+    if db.get_bind().dialect.name == "postgresql":
+        db.execute(select(func.pg_advisory_xact_lock(func.hashtext(tenant_id))))
+    stmt = (
+        select(AuditLog.hash, AuditLog.ts)
+        .where(AuditLog.tenant_id == tenant_id)
+        .order_by(AuditLog.ts.desc())
+        .limit(1)
+    )
+    prev = db.execute(stmt).first()
+    return (prev.hash, prev.ts) if prev else (None, None)
+
+
+def _next_ts(prev_ts: datetime | None) -> datetime:
+    """Timestamp for the entry after ``prev_ts``, strictly later even within one transaction.
+
+    The chain is replayed in ts order, and a server-side now() is frozen for a whole
+    transaction, so entries written together would tie and verify in arbitrary order.
+    """
+    now = datetime.now(UTC)
+    if prev_ts is None:
+        return now
+    if prev_ts.tzinfo is None:  # SQLite hands back naive UTC values
+        prev_ts = prev_ts.replace(tzinfo=UTC)
+    return max(now, prev_ts + timedelta(microseconds=1))
+
+
+def _audit_row(
+    prev_hash: str | None,
+    prev_ts: datetime | None,
+    *,
+    actor_type: str,
+    actor_id: str,
+    tenant_id: str | None,
+    action: str,
+    resource_type: str,
+    resource_id: str | None,
+    payload: dict | None,
+) -> dict[str, Any]:
+    record = {
+        "actor_type": actor_type,
+        "actor_id": actor_id,
+        "tenant_id": tenant_id,
+        "action": action,
+        "resource_type": resource_type,
+        "resource_id": resource_id,
+        "payload": payload,
+    }
+    return {
+        **record,
+        "ts": _next_ts(prev_ts),
+        "prev_hash": prev_hash,
+        "hash": hmac_hash(prev_hash, record),
+    }
@@ -1,13 +1,23 @@
 """Quota checking and enforcement."""
 
 import os
+import threading
 from datetime import datetime, date, timedelta
 from typing import Dict, Any, Optional, Tuple
-from sqlalchemy import select, func
+from sqlalchemy import and_, select, func
 from sqlalchemy.orm import Session
 
+from ..cache import TTLCache
 from ..models import BillingUsage, Tenant
 
+# enforce_quota reuses a tenant's usage snapshot for this long, reserving each admitted
+# projection against it, and only re-reads the DB when the snapshot lacks headroom.
+QUOTA_CACHE_TTL_SEC = float(os.getenv("QUOTA_CACHE_TTL_SEC", "5"))
+_usage_cache = TTLCache(ttl=QUOTA_CACHE_TTL_SEC, maxsize=10_000)
+_usage_lock = threading.Lock()
+
+_METRICS = ("tokens", "cost", "adapter_calls")
+
 
 class QuotaExceeded(Exception):
     """Raised when hard quota limit is exceeded."""
@@ -43,13 +53,8 @@ def get_quota_limits() -> Dict[str, Dict[str, float]]:
     }
 
 
-def get_current_usage(
-    db: Session,
-    tenant_id: str,
-    period: str = "day",  # "day" or "month"
-) -> Dict[str, float]:
-    """Get current usage for tenant for the period."""
-    now = datetime.utcnow()
+def _period_bounds(now: datetime, period: str) -> Tuple[datetime, datetime]:
+    """[start, end) of the UTC day or month containing ``now``."""
     if period == "day":
         start_date = now.date()
         end_date = start_date + timedelta(days=1)
@@ -60,33 +65,68 @@ def get_current_usage(
         else:
             end_date = date(now.year, now.month + 1, 1)
 
-    start_datetime = datetime.combine(start_date, datetime.min.time())
-    end_datetime = datetime.combine(end_date, datetime.min.time())
+    return (
+        datetime.combine(start_date, datetime.min.time()),
+        datetime.combine(end_date, datetime.min.time()),
+    )
+
+
+def _add_usage(totals: Dict[str, float], metrics: Optional[Dict[str, Any]]) -> None:
+    metrics = metrics or {}
+    totals["tokens"] += metrics.get("tokens_in", 0) + metrics.get("tokens_out", 0)
+    totals["cost"] += metrics.get("total_cost", 0.0)
+    adapter_calls = metrics.get("adapter_calls", {})
+    totals["adapter_calls"] += sum(adapter_calls.values())
+
+
+def get_current_usage(
+    db: Session,
+    tenant_id: str,
+    period: str = "day",  # "day" or "month"
+) -> Dict[str, float]:
+    """Get current usage for tenant for the period."""
+    start_datetime, end_datetime = _period_bounds(datetime.utcnow(), period)
 
     usage_records = db.execute(
-        select(BillingUsage).where(
+        select(BillingUsage.metrics).where(
             BillingUsage.tenant_id == tenant_id,
             BillingUsage.day >= start_datetime,
             BillingUsage.day < end_datetime,
         )
-    ).scalars().all()
+    ).scalars()
 
-    total_tokens = 0
-    total_cost = 0.0
-    total_adapter_calls = 0
+    totals: Dict[str, float] = {"tokens": 0, "cost": 0.0, "adapter_calls": 0}
+    for metrics in usage_records:
+        _add_usage(totals, metrics)
+    return totals
 
-    for record in usage_records:
-        metrics = record.metrics or {}
-        total_tokens += metrics.get("tokens_in", 0) + metrics.get("tokens_out", 0)
-        total_cost += metrics.get("total_cost", 0.0)
-        adapter_calls = metrics.get("adapter_calls", {})
-        total_adapter_calls += sum(adapter_calls.values())
 
-    return {
-        "tokens": total_tokens,
-        "cost": total_cost,
-        "adapter_calls": total_adapter_calls,
+def get_day_and_month_usage(db: Session, tenant_id: str) -> Dict[str, Dict[str, float]]:
+    """Current day and month usage for tenant, read in one query over the month's rows."""
+    now = datetime.utcnow()
+    day_start, day_end = _period_bounds(now, "day")
+    month_start, month_end = _period_bounds(now, "month")
+
+    rows = db.execute(
+        select(
+            BillingUsage.metrics,
+            and_(BillingUsage.day >= day_start, BillingUsage.day < day_end).label("today"),
+        ).where(
+            BillingUsage.tenant_id == tenant_id,
+            BillingUsage.day >= month_start,
+            BillingUsage.day < month_end,
+        )
+    )
+
+    usage: Dict[str, Dict[str, float]] = {
+        "day": {"tokens": 0, "cost": 0.0, "adapter_calls": 0},
+        "month": {"tokens": 0, "cost": 0.0, "adapter_calls": 0},
     }
+    for metrics, today in rows:
+        _add_usage(usage["month"], metrics)
+        if today:
+            _add_usage(usage["day"], metrics)
+    return usage
 
 
 def check_quota(
@@ -108,8 +148,9 @@ def check_quota(
         return False, {}
 
     quotas = get_quota_limits()
-    usage_day = get_current_usage(db, tenant_id, "day")
-    usage_month = get_current_usage(db, tenant_id, "month")
+    usage = get_day_and_month_usage(db, tenant_id)
+    usage_day = usage["day"]
+    usage_month = usage["month"]
 
     # Add projected usage if provided
     if projected_usage:
@@ -157,19 +198,78 @@ def check_quota(
     return is_warning, quota_info
 
 
+def _first_exceeded(
+    quotas: Dict[str, Dict[str, float]],
+    usage: Dict[str, Dict[str, float]],
+    projected: Dict[str, float],
+) -> Optional[Dict[str, Any]]:
+    """First hard limit hit, checked in the same order and with the same rules as check_quota."""
+    for metric in _METRICS:
+        day_usage = usage["day"].get(metric, 0) + projected.get(metric, 0)
+        if day_usage >= quotas[metric]["day_hard"]:
+            return {"metric": metric, "limit": quotas[metric]["day_hard"], "current": day_usage}
+    for metric in _METRICS:
+        month_usage = usage["month"].get(metric, 0)
+        if month_usage >= quotas[metric]["month_hard"]:
+            return {"metric": metric, "limit": quotas[metric]["month_hard"], "current": month_usage}
+    return None
+
+
+def _near_soft_limit(
+    quotas: Dict[str, Dict[str, float]],
+    usage: Dict[str, Dict[str, float]],
+) -> bool:
+    """Whether check_quota would report a warning for ``usage``: a metric at 80% of its soft
+    limit without having reached the hard one."""
+    for period in ("day", "month"):
+        for metric in _METRICS:
+            current = usage[period].get(metric, 0)
+            limits = quotas[metric]
+            if limits[f"{period}_soft"] * 0.8 <= current < limits[f"{period}_hard"]:
+                return True
+    return False
+
+
+def _reserve(usage: Dict[str, Dict[str, float]], projected: Dict[str, float]) -> None:
+    for period in ("day", "month"):
+        for metric in _METRICS:
+            usage[period][metric] = usage[period].get(metric, 0) + projected.get(metric, 0)
+
+
 def enforce_quota(
     db: Session,
     tenant_id: str,
     projected_usage: Optional[Dict[str, float]] = None,
-) -> None:
-    """Check quota and raise QuotaExceeded if hard limit exceeded."""
-    is_warning, quota_info = check_quota(db, tenant_id, projected_usage)
+) -> bool:
+    """Check quota and raise QuotaExceeded if hard limit exceeded.
 
-    if quota_info.get("exceeded"):
-        exceeded = quota_info["exceeded"][0]  # First exceeded metric
+    Calls with headroom in the tenant's cached usage snapshot skip the DB; anything the
+    snapshot cannot admit is decided on fresh usage, so a quota is never refused on stale data.
+    Returns whether usage before this call is near a soft limit, judged on the same snapshot,
+    so callers can warn without a second usage query.
+    """
+    if not os.getenv("BILLING_ENABLED", "false").lower() == "true":
+        return False
+
+    quotas = get_quota_limits()
+    projected = projected_usage or {}
+    with _usage_lock:
+        usage = _usage_cache.get(tenant_id)
+        if usage is not None and _first_exceeded(quotas, usage, projected) is None:
+            is_warning = _near_soft_limit(quotas, usage)
+            _reserve(usage, projected)
+            return is_warning
+
+    usage = get_day_and_month_usage(db, tenant_id)
+    exceeded = _first_exceeded(quotas, usage, projected)
+    if exceeded:
         raise QuotaExceeded(
             metric=exceeded["metric"],
             limit=exceeded["limit"],
             current=exceeded["current"],
         )
-
+    is_warning = _near_soft_limit(quotas, usage)
+    with _usage_lock:
+        _reserve(usage, projected)
+        _usage_cache.set(tenant_id, usage)
+    return is_warning
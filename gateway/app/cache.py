@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections.abc import Callable, Hashable
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+LIST_CACHE_TTL_SEC = float(os.getenv("LIST_CACHE_TTL_SEC", "30"))
+POLICY_CACHE_TTL_SEC = float(os.getenv("POLICY_CACHE_TTL_SEC", "5"))
+
+
+class TTLCache:
+    """Small thread-safe in-process cache whose entries expire after ``ttl`` seconds."""
+
+    def __init__(self, ttl: float, maxsize: int = 1024) -> None:
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._data: dict[Hashable, tuple[float, Any]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return default
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+            if len(self._data) >= self.maxsize:
+                # Evict the oldest insertion; dicts preserve insertion order.
+                self._data.pop(next(iter(self._data)))
+            self._data[key] = (time.monotonic() + self.ttl, value)
+
+    def pop(self, key: Hashable) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def discard_where(self, predicate: Callable[[Hashable], bool]) -> None:
+        with self._lock:
+            for key in [key for key in self._data if predicate(key)]:
+                del self._data[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+# Serialized list responses keyed by (resource, tenant_id, project_id). Process-local, so
+# other workers may serve a list up to LIST_CACHE_TTL_SEC old; set it to 0 to disable.
+list_cache = TTLCache(ttl=LIST_CACHE_TTL_SEC, maxsize=2048)
+
+
+def invalidate_lists(resource: str, tenant_id: str) -> None:
+    """Drop every cached ``resource`` list of a tenant, whatever project it was scoped to."""
+    list_cache.discard_where(lambda key: key[0] == resource and key[1] == tenant_id)
+
+
+_STALE_LISTS_KEY = "stale_lists"
+
+
+def invalidate_lists_on_commit(db: Session, resource: str, tenant_id: str) -> None:
+    """Invalidate a tenant's ``resource`` lists once ``db`` commits; a rollback keeps them.
+
+    Dropping them before the commit would let a concurrent list request cache the old rows
+    again for a whole TTL.
+    """
+    db.info.setdefault(_STALE_LISTS_KEY, set()).add((resource, tenant_id))
+
+
+# Parsed YAML of the newest policy per name, read by every tool plan/invoke call.
+policy_cache = TTLCache(ttl=POLICY_CACHE_TTL_SEC, maxsize=16)
+
+
+def invalidate_policy_cache() -> None:
+    """Forget every parsed policy; writes can rename policies, so drop all names at once."""
+    policy_cache.clear()
+
+
+_STALE_POLICIES_KEY = "stale_policies"
+
+
+def invalidate_policy_cache_on_commit(db: Session) -> None:
+    """Forget every parsed policy once ``db`` commits; a rollback keeps them."""
+    db.info[_STALE_POLICIES_KEY] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_stale_entries(session: Session) -> None:
+    for resource, tenant_id in session.info.pop(_STALE_LISTS_KEY, ()):
+        invalidate_lists(resource, tenant_id)
+    if session.info.pop(_STALE_POLICIES_KEY, False):
+        invalidate_policy_cache()
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_stale_entries(session: Session) -> None:
+    session.info.pop(_STALE_LISTS_KEY, None)
+    session.info.pop(_STALE_POLICIES_KEY, None)
@@ -6,8 +6,10 @@ from typing import Any, Generator
 
 from dotenv import load_dotenv
 from sqlalchemy import create_engine, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import Session, declarative_base, sessionmaker
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.pool import NullPool, StaticPool
 
 load_dotenv()
 
@@ -15,10 +17,33 @@ logger = logging.getLogger(__name__)
 
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite+pysqlite:///:memory:")
 
+# Connection pool sizing. Keep DB_POOL_SIZE + DB_MAX_OVERFLOW multiplied by the number of
+# gateway workers/replicas below Postgres max_connections. When running behind PgBouncer,
+# set DB_POOL_DISABLED=true so PgBouncer owns pooling and the app opens NullPool connections.
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "20"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "3600"))
+DB_POOL_DISABLED = os.getenv("DB_POOL_DISABLED", "false").lower() == "true"
+# Sync endpoints run on the worker threadpool; keep it at least as large as the pool so threads
+# never cap concurrent DB work below what the pool allows (40 is the framework default).
+DB_THREADPOOL_SIZE = int(
+    os.getenv("DB_THREADPOOL_SIZE", str(max(40, DB_POOL_SIZE + DB_MAX_OVERFLOW)))
+)
+
 engine_kwargs: dict[str, Any] = {}
 if DATABASE_URL.startswith("sqlite"):
     engine_kwargs["connect_args"] = {"check_same_thread": False}
     engine_kwargs["poolclass"] = StaticPool
+elif DB_POOL_DISABLED:
+    engine_kwargs["poolclass"] = NullPool
+    engine_kwargs["pool_pre_ping"] = True
+else:
+    engine_kwargs["pool_size"] = DB_POOL_SIZE
+    engine_kwargs["max_overflow"] = DB_MAX_OVERFLOW
+    engine_kwargs["pool_timeout"] = DB_POOL_TIMEOUT
+    engine_kwargs["pool_recycle"] = DB_POOL_RECYCLE
+    engine_kwargs["pool_pre_ping"] = True
 
 engine = create_engine(DATABASE_URL, future=True, **engine_kwargs)
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False, future=True)
@@ -38,6 +63,32 @@ def get_db() -> Generator[Session, None, None]:
         db.close()
 
 
+def insert_on_conflict_do_nothing(db: Session, model: Any) -> Any:
+    """Build an INSERT for ``model`` that skips rows violating a unique constraint.
+
+    Pair it with ``.returning(...)``: a conflicting row yields no result instead of raising
+    IntegrityError, so callers answer 409 without rolling back the session.
+    """
+    return _dialect_insert(db)(model).on_conflict_do_nothing()
+
+
+def insert_on_conflict_do_update(
+    db: Session, model: Any, index_elements: list[str], set_: dict[str, Any]
+) -> Any:
+    """Build an INSERT for ``model`` that applies ``set_`` to the row it conflicts with instead.
+
+    Add ``.values(...)`` and ``.returning(...)`` to get the inserted or updated row back in a
+    single round trip.
+    """
+    return _dialect_insert(db)(model).on_conflict_do_update(
+        index_elements=index_elements, set_=set_
+    )
+
+
+def _dialect_insert(db: Session) -> Any:
+    return pg_insert if db.get_bind().dialect.name == "postgresql" else sqlite_insert
+
+
 def init_db() -> None:
     if engine.url.get_backend_name().startswith("postgresql"):
         with engine.connect() as conn:
@@ -46,5 +97,10 @@ def init_db() -> None:
     from .models import Base
 
     Base.metadata.create_all(bind=engine)
+    if engine.url.get_backend_name().startswith("postgresql"):
+        from .run_events import install_step_notify_trigger
+
+        with engine.begin() as conn:
+            install_step_notify_trigger(conn)
 
 
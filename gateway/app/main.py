@@ -1,18 +1,27 @@
+import asyncio
 import logging
 
+from anyio import to_thread
 from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from prometheus_client import CONTENT_TYPE_LATEST, Counter, generate_latest
 
-from . import otel
-from .db import init_db
+from . import otel, run_events, temporal
+from .db import DB_THREADPOOL_SIZE, engine, init_db
 from .middleware import auth_middleware
+from .pagination import NEXT_CURSOR_HEADER
+from .responses import ORJSONResponse
+from .slo import close_slo_evaluator
 from .routers import analytics, approvals, audit, canary, evals, feature_flags, health, oidc, policies, projects, runbooks, runs, scim, settings, slo, tenant_export, tenants, tools
 from .billing import routers as billing_routers
 
 logging.basicConfig(level=logging.INFO)
 
-app = FastAPI(title="OpsGenie-for-Agents: Gateway", version="0.1.0")
+app = FastAPI(
+    title="OpsGenie-for-Agents: Gateway",
+    version="0.1.0",
+    default_response_class=ORJSONResponse,
+)
 otel.instrument(app)
 
 # CORS
@@ -22,6 +31,8 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Browsers hide non-safelisted response headers from scripts unless exposed
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
 # Auth middleware (runs after CORS)
@@ -39,6 +50,35 @@ def startup() -> None:
     init_db()
 
 
+@app.on_event("startup")
+async def size_threadpool() -> None:
+    to_thread.current_default_thread_limiter().total_tokens = DB_THREADPOOL_SIZE
+
+
+@app.on_event("startup")
+async def connect_temporal() -> None:
+    await temporal.connect_on_startup(app)
+
+
+@app.on_event("startup")
+async def start_step_listener() -> None:
+    app.state.step_listener = None
+    if engine.url.get_backend_name().startswith("postgresql"):
+        app.state.step_listener = asyncio.create_task(run_events.listen_for_step_updates())
+
+
+@app.on_event("shutdown")
+async def stop_step_listener() -> None:
+    task = getattr(app.state, "step_listener", None)
+    if task is not None:
+        task.cancel()
+
+
+@app.on_event("shutdown")
+async def close_prometheus_client() -> None:
+    await close_slo_evaluator()
+
+
 @app.middleware("http")
 async def record_requests(request: Request, call_next):
     response = await call_next(request)
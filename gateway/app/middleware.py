@@ -5,13 +5,19 @@ from collections import defaultdict
 from typing import Callable
 
 from fastapi import Request, Response, status
+from fastapi.concurrency import run_in_threadpool
 from prometheus_client import Counter
 from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from .db import SessionLocal
 from .models import APIKey, User
-from .security import decode_access_token, verify_api_key
+from .security import (
+    LEGACY_API_KEY_HASH_PREFIX,
+    decode_access_token,
+    hash_api_key,
+    verify_api_key,
+)
 from .sessions import get_session
 
 rate_limit_dropped_total = Counter("rate_limit_dropped_total", "Rate limit drops", ["subject"])
@@ -25,17 +31,29 @@ RATE_LIMIT_BURST = float(__import__("os").getenv("RATE_LIMIT_BURST", "20"))
 
 def resolve_api_key(key: str) -> tuple[str | None, str | None, str | None]:
     """Resolve API key to tenant_id and api_key_id. Returns (tenant_id, authn_method, api_key_id)."""
+    hashed = hash_api_key(key)
     with SessionLocal() as db:
-        stmt = select(APIKey).where(APIKey.is_active == True)
-        keys = db.scalars(stmt).all()
-        for api_key in keys:
-            if verify_api_key(key, api_key.hashed_key):
-                # Update last_used_at
-                from datetime import datetime, timezone
-
-                api_key.last_used_at = datetime.now(timezone.utc)
-                db.commit()
-                return (api_key.tenant_id, "apikey", api_key.id)
+        stmt = select(APIKey).where(APIKey.is_active.is_(True), APIKey.hashed_key == hashed)
+        api_key = db.scalars(stmt).first()
+        if api_key is None:
+            # Keys issued before HMAC hashing still carry bcrypt hashes; the first successful
+            # match moves a key to the new hash so later requests take the lookup above.
+            stmt = select(APIKey).where(
+                APIKey.is_active.is_(True),
+                APIKey.hashed_key.startswith(LEGACY_API_KEY_HASH_PREFIX, autoescape=True),
+            )
+            for candidate in db.scalars(stmt):
+                if verify_api_key(key, candidate.hashed_key):
+                    candidate.hashed_key = hashed
+                    api_key = candidate
+                    break
+        if api_key is not None:
+            # Update last_used_at
+            from datetime import datetime, timezone
+
+            api_key.last_used_at = datetime.now(timezone.utc)
+            db.commit()
+            return (api_key.tenant_id, "apikey", api_key.id)
     return (None, None, None)
 
 
@@ -61,7 +79,8 @@ async def auth_middleware(request: Request, call_next: Callable) -> Response:
     # Try API key first
     api_key = request.headers.get("X-API-Key")
     if api_key:
-        tenant_id, authn, api_key_id = resolve_api_key(api_key)
+        # The key lookup is blocking DB work; keep it off the event loop
+        tenant_id, authn, api_key_id = await run_in_threadpool(resolve_api_key, api_key)
         if tenant_id:
             request.state.tenant_id = tenant_id
             request.state.authn = authn
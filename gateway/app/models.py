@@ -32,7 +32,10 @@ class Runbook(Base):
     tenant: Mapped["Tenant"] = relationship("Tenant")
     project: Mapped["Project | None"] = relationship("Project")
 
-    __table_args__ = (Index("ix_runbooks_tenant_project_name", "tenant_id", "project_id", "name", unique=True),)
+    __table_args__ = (
+        Index("ix_runbooks_tenant_project_name", "tenant_id", "project_id", "name", unique=True),
+        Index("ix_runbooks_tenant_project_created", "tenant_id", "project_id", "created_at", "id"),
+    )
 
 
 class Policy(Base):
@@ -51,7 +54,10 @@ class Policy(Base):
     tenant: Mapped["Tenant"] = relationship("Tenant")
     project: Mapped["Project | None"] = relationship("Project")
 
-    __table_args__ = (Index("ix_policies_tenant_project_name", "tenant_id", "project_id", "name", unique=True),)
+    __table_args__ = (
+        Index("ix_policies_tenant_project_name", "tenant_id", "project_id", "name", unique=True),
+        Index("ix_policies_tenant_project_created", "tenant_id", "project_id", "created_at", "id"),
+    )
 
 
 class Run(Base):
@@ -72,7 +78,14 @@ class Run(Base):
     tenant: Mapped["Tenant"] = relationship("Tenant")
     project: Mapped["Project | None"] = relationship("Project")
     steps: Mapped[list["Step"]] = relationship(
-        "Step", back_populates="run", cascade="all, delete-orphan"
+        "Step",
+        back_populates="run",
+        cascade="all, delete-orphan",
+        order_by=lambda: (Step.started_at.asc().nullsfirst(), Step.name),
+    )
+
+    __table_args__ = (
+        Index("ix_runs_tenant_project_created", "tenant_id", "project_id", "created_at", "id"),
     )
 
 
@@ -105,7 +118,14 @@ class Step(Base):
     run: Mapped[Run] = relationship("Run", back_populates="steps")
 
 
-Index("ix_steps_run_id_started_at", Step.run_id, Step.started_at)
+# Matches the ORDER BY started_at NULLS FIRST, name every step listing of a run uses. SQLite
+# already sorts NULLs first and rejects NULLS FIRST in an index, so it gets plain columns.
+Index(
+    "ix_steps_run_started_name", Step.run_id, Step.started_at.asc().nullsfirst(), Step.name
+).ddl_if(dialect="postgresql")
+Index("ix_steps_run_started_name", Step.run_id, Step.started_at, Step.name).ddl_if(
+    callable_=lambda ddl, target, bind, **kw: bind.dialect.name != "postgresql"
+)
 
 
 class Approval(Base):
@@ -129,6 +149,9 @@ class Approval(Base):
     project: Mapped["Project | None"] = relationship("Project")
 
 
+Index("ix_approvals_run_step", Approval.run_id, Approval.step_name)
+
+
 class Tenant(Base):
     __tablename__ = "tenants"
 
@@ -138,6 +161,10 @@ class Tenant(Base):
         DateTime(timezone=True), server_default=func.now(), nullable=False
     )
 
+    @property
+    def slug(self) -> str:
+        return self.name.lower().replace(" ", "-")
+
 
 class Project(Base):
     __tablename__ = "projects"
@@ -151,7 +178,10 @@ class Project(Base):
 
     tenant: Mapped[Tenant] = relationship("Tenant")
 
-    __table_args__ = (Index("ix_projects_tenant_name", "tenant_id", "name", unique=True),)
+    __table_args__ = (
+        Index("ix_projects_tenant_name", "tenant_id", "name", unique=True),
+        Index("ix_projects_tenant_created", "tenant_id", "created_at", "id"),
+    )
 
 
 class RoleBinding(Base):
@@ -180,6 +210,7 @@ class RoleBinding(Base):
             "role",
             unique=True,
         ),
+        Index("ix_role_bindings_tenant_project_created", "tenant_id", "project_id", "created_at", "id"),
     )
 
 
@@ -315,6 +346,11 @@ class User(Base):
         DateTime(timezone=True), server_default=func.now(), nullable=False
     )
 
+    @property
+    def display_name(self) -> str:
+        """Name derived from the email's local part ("jane.doe@x" -> "Jane Doe")."""
+        return self.email.split("@")[0].replace(".", " ").title()
+
 
 Index("ix_users_email", User.email, unique=True)
 
@@ -350,7 +386,9 @@ class UserIdentity(Base):
 
 
 Index("ix_user_identities_provider_subject", UserIdentity.provider_id, UserIdentity.subject)
-Index("ix_user_identities_external_id", UserIdentity.external_id)
+Index("ix_user_identities_provider_external", UserIdentity.provider_id, UserIdentity.external_id)
+Index("ix_user_identities_provider_email", UserIdentity.provider_id, UserIdentity.email)
+Index("ix_user_identities_user_provider", UserIdentity.user_id, UserIdentity.provider_id)
 
 
 class Group(Base):
@@ -367,7 +405,10 @@ class Group(Base):
     tenant: Mapped[Tenant] = relationship("Tenant")
     members: Mapped[list["GroupMember"]] = relationship("GroupMember", back_populates="group", cascade="all, delete-orphan")
 
-    __table_args__ = (Index("ix_groups_tenant_display_name", "tenant_id", "display_name", unique=True),)
+    __table_args__ = (
+        Index("ix_groups_tenant_display_name", "tenant_id", "display_name", unique=True),
+        Index("ix_groups_tenant_external", "tenant_id", "external_id"),
+    )
 
 
 class GroupMember(Base):
@@ -379,6 +420,8 @@ class GroupMember(Base):
     group: Mapped[Group] = relationship("Group", back_populates="members")
     user: Mapped[User] = relationship("User")
 
+    __table_args__ = (Index("ix_group_members_user_id", "user_id"),)
+
 
 class EvalResult(Base):
     __tablename__ = "eval_results"
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import base64
+from collections.abc import Sequence
+from datetime import datetime
+from typing import Any
+
+from fastapi import HTTPException, Response, status
+from sqlalchemy import Select, func, select, tuple_
+
+# List endpoints return the cursor for the following page in this header so their JSON
+# bodies keep the shape existing clients expect.
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+
+
+def encode_cursor(created_at: datetime, row_id: str) -> str:
+    raw = f"{created_at.isoformat()}|{row_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode()
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, str]:
+    try:
+        created_at, row_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|", 1)
+        return datetime.fromisoformat(created_at), row_id
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="invalid cursor") from e
+
+
+def page_size(limit: int | None, cursor: str | None) -> int | None:
+    """Rows per page for a list request.
+
+    Requests that pass neither ``limit`` nor ``cursor`` still get the whole list, as before
+    lists were paginated, so None is returned for them. A cursor alone pages by
+    DEFAULT_PAGE_SIZE.
+    """
+    if limit is None and cursor:
+        return DEFAULT_PAGE_SIZE
+    return limit
+
+
+def keyset_page(stmt: Select, model: Any, limit: int | None, cursor: str | None) -> Select:
+    """Order ``stmt`` newest first by (created_at, id) and seek past ``cursor``.
+
+    One row beyond ``limit`` is fetched so ``split_page`` can tell whether another page exists;
+    a None ``limit`` selects every remaining row.
+    """
+    if cursor:
+        created_at, row_id = decode_cursor(cursor)
+        # Prefer the stored created_at of the cursor row: SQLite keeps server-default timestamps
+        # in a different text format than bound datetimes, which breaks the row comparison.
+        # The decoded value still applies if that row has been deleted since.
+        stored = select(model.created_at).where(model.id == row_id).scalar_subquery()
+        boundary = tuple_(func.coalesce(stored, created_at), row_id)
+        stmt = stmt.where(tuple_(model.created_at, model.id) < boundary)
+    stmt = stmt.order_by(model.created_at.desc(), model.id.desc())
+    return stmt if limit is None else stmt.limit(limit + 1)
+
+
+def split_page(rows: Sequence[Any], limit: int | None) -> tuple[Sequence[Any], str | None]:
+    """Trim the look-ahead row and return the page with the cursor of the next one, if any."""
+    if limit is None or len(rows) <= limit:
+        return rows, None
+    page = rows[:limit]
+    return page, encode_cursor(page[-1].created_at, page[-1].id)
+
+
+def json_page(body: bytes, next_cursor: str | None) -> Response:
+    response = Response(content=body, media_type="application/json")
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return response
@@ -1,9 +1,10 @@
 from __future__ import annotations
 
+from functools import lru_cache
 from typing import Any
 
 from fastapi import Depends, HTTPException, Request, status
-from sqlalchemy import select
+from sqlalchemy import and_, or_, select
 from sqlalchemy.orm import Session
 
 from .db import get_db
@@ -40,6 +41,7 @@ PERMISSIONS: dict[str, dict[tuple[str, str], bool]] = {
 }
 
 
+@lru_cache(maxsize=256)
 def _check_permission(role: str, action: str, resource: str) -> bool:
     """Check if role has permission for action on resource."""
     # Admin has all permissions
@@ -89,8 +91,45 @@ def _get_subject_identifiers(request: Request) -> list[tuple[str, str]]:
     return subjects
 
 
+def _bound_roles(
+    request: Request, db: Session, tenant_id: str, project_id: str | None
+) -> frozenset[str]:
+    """Roles bound to the request's subjects, loaded once per request in a single query.
+
+    Project-level bindings count alongside tenant-level ones when a project is selected.
+    """
+    cached = getattr(request.state, "bound_roles", None)
+    if cached is not None:
+        return cached
+
+    subjects = _get_subject_identifiers(request)
+    scope = RoleBinding.project_id.is_(None)
+    if project_id:
+        scope = or_(scope, RoleBinding.project_id == project_id)
+    stmt = select(RoleBinding.role).where(
+        RoleBinding.tenant_id == tenant_id,
+        scope,
+        or_(
+            *(
+                and_(RoleBinding.subject_type == subject_type, RoleBinding.subject_id == subject_id)
+                for subject_type, subject_id in subjects
+            )
+        ),
+    )
+    roles = frozenset(db.scalars(stmt).all())
+    request.state.bound_roles = roles
+    return roles
+
+
+@lru_cache(maxsize=64)
 def authorize(action: str, resource: str):
-    """Dependency to authorize action on resource."""
+    """Dependency to authorize action on resource.
+
+    Cached per (action, resource), so every route declaring the same check shares one
+    dependency callable and FastAPI resolves it only once per request. Different checks in
+    one request share the roles memoized on ``request.state`` by ``_bound_roles``. The check
+    stays a sync dependency: the role lookup it may run would otherwise block the event loop.
+    """
 
     def _authorize(
         request: Request,
@@ -99,59 +138,17 @@ def authorize(action: str, resource: str):
         # Resolve tenant and project
         tenant_id, project_id = get_tenant_and_project(request, db)
 
-        # Get subject identifiers
-        subjects = _get_subject_identifiers(request)
-
-        if not subjects:
+        if not _get_subject_identifiers(request):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED, detail="authentication required"
             )
 
-        # Look up role bindings
-        allowed = False
-        roles_checked: set[str] = set()
-
-        for subject_type, subject_id in subjects:
-            # Try project-level binding first
-            if project_id:
-                stmt = select(RoleBinding).where(
-                    RoleBinding.tenant_id == tenant_id,
-                    RoleBinding.project_id == project_id,
-                    RoleBinding.subject_type == subject_type,
-                    RoleBinding.subject_id == subject_id,
-                )
-                bindings = db.scalars(stmt).all()
-                for binding in bindings:
-                    if binding.role not in roles_checked:
-                        roles_checked.add(binding.role)
-                        if _check_permission(binding.role, action, resource):
-                            allowed = True
-                            break
-
-            # Fall back to tenant-level binding
-            if not allowed:
-                stmt = select(RoleBinding).where(
-                    RoleBinding.tenant_id == tenant_id,
-                    RoleBinding.project_id.is_(None),
-                    RoleBinding.subject_type == subject_type,
-                    RoleBinding.subject_id == subject_id,
-                )
-                bindings = db.scalars(stmt).all()
-                for binding in bindings:
-                    if binding.role not in roles_checked:
-                        roles_checked.add(binding.role)
-                        if _check_permission(binding.role, action, resource):
-                            allowed = True
-                            break
-
-            if allowed:
-                break
+        roles = _bound_roles(request, db, tenant_id, project_id)
+        allowed = any(_check_permission(role, action, resource) for role in roles)
 
         # Special case: SRE can approve if also OnCall
         if action == "approve" and resource == "approval":
-            has_sre = "SRE" in roles_checked
-            has_oncall = "OnCall" in roles_checked
-            if has_sre and has_oncall:
+            if "SRE" in roles and "OnCall" in roles:
                 allowed = True
 
         if not allowed:
@@ -161,4 +158,3 @@ def authorize(action: str, resource: str):
             )
 
     return _authorize
-
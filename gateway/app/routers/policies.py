@@ -1,15 +1,20 @@
 from __future__ import annotations
 
 import logging
+from uuid import uuid4
 
-from fastapi import APIRouter, Depends, HTTPException, Request, status
-from sqlalchemy import select
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from pydantic import TypeAdapter
+from sqlalchemy import String, lambda_stmt, literal, select, update
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
+from sqlalchemy.sql.lambdas import StatementLambdaElement
 
 from ..audit import write_audit
-from ..db import get_db
+from ..cache import invalidate_lists_on_commit, invalidate_policy_cache_on_commit, list_cache
+from ..db import get_db, insert_on_conflict_do_nothing
 from ..models import Policy
+from ..pagination import MAX_PAGE_SIZE, json_page, keyset_page, page_size, split_page
 from ..rbac import authorize
 from ..schemas import PolicyCreate, PolicyList, PolicyRead
 from ..tenancy import get_tenant_and_project
@@ -17,29 +22,55 @@ from ..tenancy import get_tenant_and_project
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
+# Shared dependency instances so each permission check is one closure across routes.
+_AUTH_READ = Depends(authorize("read", "policy"))
+_AUTH_WRITE = Depends(authorize("write", "policy"))
+
+# Validates and serializes a whole result set in one pydantic-core pass.
+_POLICY_LIST_ADAPTER: TypeAdapter[PolicyList] = TypeAdapter(PolicyList)
+
+
+def _policy_by_id(
+    policy_id: str, tenant_id: str, project_id: str | None
+) -> StatementLambdaElement:
+    """Tenant-scoped lookup by id; the lambda form compiles once and only rebinds parameters."""
+    stmt = lambda_stmt(
+        lambda: select(Policy).where(Policy.id == policy_id, Policy.tenant_id == tenant_id)
+    )
+    if project_id:
+        stmt += lambda s: s.where(Policy.project_id == project_id)
+    return stmt
+
 
 @router.post("/policies", response_model=PolicyRead, status_code=status.HTTP_201_CREATED)
 def create_policy(
     payload: PolicyCreate,
     request: Request,
     db: Session = Depends(get_db),
-    _auth: None = Depends(authorize("write", "policy")),
+    _auth: None = _AUTH_WRITE,
 ) -> PolicyRead:
     tenant_id, project_id = get_tenant_and_project(request, db)
-    policy = Policy(
-        name=payload.name, yaml=payload.yaml, version=payload.version, tenant_id=tenant_id, project_id=project_id
+    stmt = (
+        insert_on_conflict_do_nothing(db, Policy)
+        .values(
+            name=payload.name,
+            yaml=payload.yaml,
+            version=payload.version,
+            tenant_id=tenant_id,
+            project_id=project_id,
+        )
+        .returning(Policy.id, Policy.created_at)
     )
-    db.add(policy)
-    try:
-        db.flush()
-    except IntegrityError:
-        db.rollback()
+    row = db.execute(stmt).one_or_none()
+    if not row:
         logger.info("Policy name already exists: %s", payload.name)
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail="policy with this name already exists",
         )
-    db.refresh(policy)
+
+    invalidate_lists_on_commit(db, "policies", tenant_id)
+    invalidate_policy_cache_on_commit(db)
 
     write_audit(
         actor_type="user",
@@ -47,26 +78,45 @@ def create_policy(
         tenant_id=tenant_id,
         action="policy.create",
         resource_type="policy",
-        resource_id=policy.id,
+        resource_id=row.id,
         payload={"name": payload.name, "version": payload.version},
+        db=db,
     )
 
-    return PolicyRead.model_validate(policy)
+    db.commit()
+
+    # Everything but the generated keys came from the already-validated payload.
+    return PolicyRead.model_construct(
+        id=row.id,
+        created_at=row.created_at,
+        name=payload.name,
+        yaml=payload.yaml,
+        version=payload.version,
+    )
 
 
 @router.get("/policies", response_model=PolicyList)
 def list_policies(
     request: Request,
+    limit: int | None = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
     db: Session = Depends(get_db),
-    _auth: None = Depends(authorize("read", "policy")),
-) -> PolicyList:
+    _auth: None = _AUTH_READ,
+) -> Response:
     tenant_id, project_id = get_tenant_and_project(request, db)
-    stmt = select(Policy).where(Policy.tenant_id == tenant_id)
-    if project_id:
-        stmt = stmt.where(Policy.project_id == project_id)
-    stmt = stmt.order_by(Policy.created_at.desc())
-    results = db.scalars(stmt).all()
-    return PolicyList(policies=[PolicyRead.model_validate(item) for item in results])
+    limit = page_size(limit, cursor)
+    cache_key = ("policies", tenant_id, project_id, limit, cursor)
+    cached = list_cache.get(cache_key)
+    if cached is None:
+        stmt = select(Policy).where(Policy.tenant_id == tenant_id)
+        if project_id:
+            stmt = stmt.where(Policy.project_id == project_id)
+        stmt = keyset_page(stmt, Policy, limit, cursor)
+        results, next_cursor = split_page(db.scalars(stmt).all(), limit)
+        policies = _POLICY_LIST_ADAPTER.validate_python(results, from_attributes=True)
+        cached = (_POLICY_LIST_ADAPTER.dump_json(policies), next_cursor)
+        list_cache.set(cache_key, cached)
+    return json_page(*cached)
 
 
 @router.get("/policies/{policy_id}", response_model=PolicyRead)
@@ -74,12 +124,10 @@ def get_policy(
     policy_id: str,
     request: Request,
     db: Session = Depends(get_db),
-    _auth: None = Depends(authorize("read", "policy")),
+    _auth: None = _AUTH_READ,
 ) -> PolicyRead:
     tenant_id, project_id = get_tenant_and_project(request, db)
-    stmt = select(Policy).where(Policy.id == policy_id, Policy.tenant_id == tenant_id)
-    if project_id:
-        stmt = stmt.where(Policy.project_id == project_id)
+    stmt = _policy_by_id(policy_id, tenant_id, project_id)
     obj = db.scalars(stmt).first()
     if not obj:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="policy not found")
@@ -92,21 +140,28 @@ def update_policy(
     payload: PolicyCreate,
     request: Request,
     db: Session = Depends(get_db),
-    _auth: None = Depends(authorize("write", "policy")),
+    _auth: None = _AUTH_WRITE,
 ) -> PolicyRead:
     tenant_id, project_id = get_tenant_and_project(request, db)
-    stmt = select(Policy).where(Policy.id == policy_id, Policy.tenant_id == tenant_id)
+    stmt = update(Policy).where(Policy.id == policy_id, Policy.tenant_id == tenant_id)
     if project_id:
         stmt = stmt.where(Policy.project_id == project_id)
-    policy = db.scalars(stmt).first()
+    stmt = stmt.values(name=payload.name, yaml=payload.yaml, version=payload.version).returning(
+        Policy
+    )
+    try:
+        policy = db.scalars(stmt).one_or_none()
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="policy with this name already exists",
+        ) from None
     if not policy:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="policy not found")
     
-    policy.name = payload.name
-    policy.yaml = payload.yaml
-    policy.version = payload.version
-    db.commit()
-    db.refresh(policy)
+    invalidate_lists_on_commit(db, "policies", tenant_id)
+    invalidate_policy_cache_on_commit(db)
     
     write_audit(
         actor_type="user",
@@ -116,9 +171,13 @@ def update_policy(
         resource_type="policy",
         resource_id=policy_id,
         payload={"name": payload.name, "version": payload.version},
+        db=db,
     )
-    
-    return PolicyRead.model_validate(policy)
+
+    # Read the row before committing; the commit expires it
+    policy_read = PolicyRead.model_validate(policy)
+    db.commit()
+    return policy_read
 
 
 @router.delete("/policies/{policy_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -126,19 +185,14 @@ def delete_policy(
     policy_id: str,
     request: Request,
     db: Session = Depends(get_db),
-    _auth: None = Depends(authorize("write", "policy")),
+    _auth: None = _AUTH_WRITE,
 ):
     tenant_id, project_id = get_tenant_and_project(request, db)
-    stmt = select(Policy).where(Policy.id == policy_id, Policy.tenant_id == tenant_id)
-    if project_id:
-        stmt = stmt.where(Policy.project_id == project_id)
+    stmt = _policy_by_id(policy_id, tenant_id, project_id)
     policy = db.scalars(stmt).first()
     if not policy:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="policy not found")
     
-    db.delete(policy)
-    db.commit()
-    
     write_audit(
         actor_type="user",
         actor_id=getattr(request.state, "user_email", "unknown"),
@@ -147,7 +201,13 @@ def delete_policy(
         resource_type="policy",
         resource_id=policy_id,
         payload={"name": policy.name},
+        db=db,
     )
+    db.delete(policy)
+
+    invalidate_lists_on_commit(db, "policies", tenant_id)
+    invalidate_policy_cache_on_commit(db)
+    db.commit()
 
 
 @router.post("/policies/{policy_id}/duplicate", response_model=PolicyRead, status_code=status.HTTP_201_CREATED)
@@ -155,33 +215,36 @@ def duplicate_policy(
     policy_id: str,
     request: Request,
     db: Session = Depends(get_db),
-    _auth: None = Depends(authorize("write", "policy")),
+    _auth: None = _AUTH_WRITE,
 ) -> PolicyRead:
     tenant_id, project_id = get_tenant_and_project(request, db)
-    stmt = select(Policy).where(Policy.id == policy_id, Policy.tenant_id == tenant_id)
+    # Copy the row server-side so the YAML never round-trips through the gateway.
+    source = select(
+        literal(str(uuid4()), String),
+        Policy.name + " (Copy)",
+        Policy.yaml,
+        Policy.version,
+        literal(tenant_id, String),
+        literal(project_id, String),
+    ).where(Policy.id == policy_id, Policy.tenant_id == tenant_id)
     if project_id:
-        stmt = stmt.where(Policy.project_id == project_id)
-    original = db.scalars(stmt).first()
-    if not original:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="policy not found")
-    
-    new_policy = Policy(
-        name=f"{original.name} (Copy)",
-        yaml=original.yaml,
-        version=original.version,
-        tenant_id=tenant_id,
-        project_id=project_id,
+        source = source.where(Policy.project_id == project_id)
+    insert_stmt = (
+        insert_on_conflict_do_nothing(db, Policy)
+        .from_select(["id", "name", "yaml", "version", "tenant_id", "project_id"], source)
+        .returning(Policy)
     )
-    db.add(new_policy)
-    try:
-        db.flush()
-    except IntegrityError:
-        db.rollback()
+    new_policy = db.scalars(insert_stmt).one_or_none()
+    if not new_policy:
+        if not db.scalar(select(source.exists())):
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="policy not found")
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail="duplicate policy name already exists",
         )
-    db.refresh(new_policy)
+    
+    invalidate_lists_on_commit(db, "policies", tenant_id)
+    invalidate_policy_cache_on_commit(db)
     
     write_audit(
         actor_type="user",
@@ -191,9 +254,12 @@ def duplicate_policy(
         resource_type="policy",
         resource_id=new_policy.id,
         payload={"original_id": policy_id, "name": new_policy.name},
+        db=db,
     )
-    
-    return PolicyRead.model_validate(new_policy)
+
+    new_policy_read = PolicyRead.model_validate(new_policy)
+    db.commit()
+    return new_policy_read
 
 
 @router.post("/policies/{policy_id}/test")
@@ -201,13 +267,11 @@ def test_policy(
     policy_id: str,
     request: Request,
     db: Session = Depends(get_db),
-    _auth: None = Depends(authorize("read", "policy")),
+    _auth: None = _AUTH_READ,
 ) -> dict:
     """Test a policy against sample data."""
     tenant_id, project_id = get_tenant_and_project(request, db)
-    stmt = select(Policy).where(Policy.id == policy_id, Policy.tenant_id == tenant_id)
-    if project_id:
-        stmt = stmt.where(Policy.project_id == project_id)
+    stmt = _policy_by_id(policy_id, tenant_id, project_id)
     policy = db.scalars(stmt).first()
     if not policy:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="policy not found")
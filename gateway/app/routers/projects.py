@@ -1,21 +1,29 @@
 from __future__ import annotations
 
 from datetime import datetime, timezone
+from typing import Literal
 
-from fastapi import APIRouter, Depends, HTTPException, Request, status
-from pydantic import BaseModel
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from pydantic import BaseModel, ConfigDict, TypeAdapter
 from sqlalchemy import select
-from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
 from ..audit import write_audit
-from ..db import get_db
+from ..cache import invalidate_lists_on_commit, list_cache
+from ..db import get_db, insert_on_conflict_do_nothing
 from ..models import Project, RoleBinding, Tenant
+from ..pagination import MAX_PAGE_SIZE, json_page, keyset_page, page_size, split_page
 from ..rbac import authorize
 from ..tenancy import get_tenant_and_project
 
 router = APIRouter()
 
+# Shared dependency instances so each permission check is one closure across routes.
+_AUTH_READ_PROJECT = Depends(authorize("read", "project"))
+_AUTH_WRITE_PROJECT = Depends(authorize("write", "project"))
+_AUTH_READ_ROLE_BINDING = Depends(authorize("read", "role_binding"))
+_AUTH_WRITE_ROLE_BINDING = Depends(authorize("write", "role_binding"))
+
 
 class ProjectCreate(BaseModel):
     name: str
@@ -27,8 +35,7 @@ class ProjectRead(BaseModel):
     name: str
     created_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, revalidate_instances="never")
 
 
 class ProjectList(BaseModel):
@@ -36,7 +43,7 @@ class ProjectList(BaseModel):
 
 
 class RoleBindingCreate(BaseModel):
-    subject_type: str  # 'user', 'group', 'apikey'
+    subject_type: Literal["user", "group", "apikey"]
     subject_id: str
     role: str
     project: str | None = None  # Project name (optional)
@@ -51,35 +58,41 @@ class RoleBindingRead(BaseModel):
     role: str
     created_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, revalidate_instances="never")
 
 
 class RoleBindingList(BaseModel):
     bindings: list[RoleBindingRead]
 
 
+# Built once at import; list handlers wrap the adapter's JSON bytes in the envelope key.
+_PROJECT_LIST_ADAPTER: TypeAdapter[list[ProjectRead]] = TypeAdapter(list[ProjectRead])
+_ROLE_BINDING_LIST_ADAPTER: TypeAdapter[list[RoleBindingRead]] = TypeAdapter(list[RoleBindingRead])
+
+
 @router.post("/projects", response_model=ProjectRead, status_code=status.HTTP_201_CREATED)
 def create_project(
     payload: ProjectCreate,
     request: Request,
     db: Session = Depends(get_db),
-    _auth: None = Depends(authorize("write", "project")),
+    _auth: None = _AUTH_WRITE_PROJECT,
 ) -> ProjectRead:
     """Create a project (Admin only)."""
     tenant_id, _ = get_tenant_and_project(request, db)
 
-    project = Project(tenant_id=tenant_id, name=payload.name)
-    db.add(project)
-    try:
-        db.flush()
-    except IntegrityError:
-        db.rollback()
+    stmt = (
+        insert_on_conflict_do_nothing(db, Project)
+        .values(tenant_id=tenant_id, name=payload.name)
+        .returning(Project.id, Project.created_at)
+    )
+    row = db.execute(stmt).one_or_none()
+    if not row:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail=f"project '{payload.name}' already exists in tenant",
         )
-    db.refresh(project)
+
+    invalidate_lists_on_commit(db, "projects", tenant_id)
 
     write_audit(
         actor_type="user",
@@ -87,26 +100,41 @@ def create_project(
         tenant_id=tenant_id,
         action="project.create",
         resource_type="project",
-        resource_id=project.id,
+        resource_id=row.id,
         payload={"name": payload.name},
+        db=db,
     )
 
-    return ProjectRead.model_validate(project)
+    db.commit()
+
+    # Everything but the generated keys came from the already-validated payload.
+    return ProjectRead.model_construct(
+        id=row.id, tenant_id=tenant_id, name=payload.name, created_at=row.created_at
+    )
 
 
 @router.get("/projects", response_model=ProjectList)
 def list_projects(
     request: Request,
+    limit: int | None = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
     db: Session = Depends(get_db),
-    _auth: None = Depends(authorize("read", "project")),
-) -> ProjectList:
+    _auth: None = _AUTH_READ_PROJECT,
+) -> Response:
     """List projects in tenant."""
     tenant_id, _ = get_tenant_and_project(request, db)
+    limit = page_size(limit, cursor)
 
-    stmt = select(Project).where(Project.tenant_id == tenant_id).order_by(Project.created_at.desc())
-    projects = db.scalars(stmt).all()
-
-    return ProjectList(projects=[ProjectRead.model_validate(p) for p in projects])
+    cache_key = ("projects", tenant_id, None, limit, cursor)
+    cached = list_cache.get(cache_key)
+    if cached is None:
+        stmt = select(Project).where(Project.tenant_id == tenant_id)
+        stmt = keyset_page(stmt, Project, limit, cursor)
+        results, next_cursor = split_page(db.scalars(stmt).all(), limit)
+        projects = _PROJECT_LIST_ADAPTER.validate_python(results, from_attributes=True)
+        cached = (b'{"projects":' + _PROJECT_LIST_ADAPTER.dump_json(projects) + b"}", next_cursor)
+        list_cache.set(cache_key, cached)
+    return json_page(*cached)
 
 
 @router.post("/role-bindings", response_model=RoleBindingRead, status_code=status.HTTP_201_CREATED)
@@ -114,15 +142,9 @@ def create_role_binding(
     payload: RoleBindingCreate,
     request: Request,
     db: Session = Depends(get_db),
-    _auth: None = Depends(authorize("write", "role_binding")),
+    _auth: None = _AUTH_WRITE_ROLE_BINDING,
 ) -> RoleBindingRead:
     """Create a role binding (Admin only)."""
-    if payload.subject_type not in ("user", "group", "apikey"):
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="subject_type must be 'user', 'group', or 'apikey'",
-        )
-
     tenant_id, _ = get_tenant_and_project(request, db)
     project_id = None
 
@@ -136,23 +158,23 @@ def create_role_binding(
             )
         project_id = project.id
 
-    binding = RoleBinding(
-        tenant_id=tenant_id,
-        project_id=project_id,
-        subject_type=payload.subject_type,
-        subject_id=payload.subject_id,
-        role=payload.role,
+    stmt = (
+        insert_on_conflict_do_nothing(db, RoleBinding)
+        .values(
+            tenant_id=tenant_id,
+            project_id=project_id,
+            subject_type=payload.subject_type,
+            subject_id=payload.subject_id,
+            role=payload.role,
+        )
+        .returning(RoleBinding)
     )
-    db.add(binding)
-    try:
-        db.flush()
-    except IntegrityError:
-        db.rollback()
+    binding = db.scalars(stmt).one_or_none()
+    if not binding:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail="role binding already exists",
         )
-    db.refresh(binding)
 
     write_audit(
         actor_type="user",
@@ -167,28 +189,35 @@ def create_role_binding(
             "role": payload.role,
             "project_id": project_id,
         },
+        db=db,
     )
 
-    return RoleBindingRead.model_validate(binding)
+    binding_read = RoleBindingRead.model_validate(binding)
+    db.commit()
+    return binding_read
 
 
 @router.get("/role-bindings", response_model=RoleBindingList)
 def list_role_bindings(
     request: Request,
+    limit: int | None = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
     db: Session = Depends(get_db),
-    _auth: None = Depends(authorize("read", "role_binding")),
-) -> RoleBindingList:
+    _auth: None = _AUTH_READ_ROLE_BINDING,
+) -> Response:
     """List role bindings (Admin only)."""
     tenant_id, project_id = get_tenant_and_project(request, db)
+    limit = page_size(limit, cursor)
 
     stmt = select(RoleBinding).where(RoleBinding.tenant_id == tenant_id)
     if project_id:
         stmt = stmt.where(
             (RoleBinding.project_id == project_id) | (RoleBinding.project_id.is_(None))
         )
-    stmt = stmt.order_by(RoleBinding.created_at.desc())
-
-    bindings = db.scalars(stmt).all()
+    stmt = keyset_page(stmt, RoleBinding, limit, cursor)
 
-    return RoleBindingList(bindings=[RoleBindingRead.model_validate(b) for b in bindings])
+    results, next_cursor = split_page(db.scalars(stmt).all(), limit)
+    bindings = _ROLE_BINDING_LIST_ADAPTER.validate_python(results, from_attributes=True)
+    body = b'{"bindings":' + _ROLE_BINDING_LIST_ADAPTER.dump_json(bindings) + b"}"
+    return json_page(body, next_cursor)
 
@@ -1,15 +1,20 @@
 from __future__ import annotations
 
 import logging
+from uuid import uuid4
 
-from fastapi import APIRouter, Depends, HTTPException, Request, status
-from sqlalchemy import select
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from pydantic import TypeAdapter
+from sqlalchemy import String, lambda_stmt, literal, select, update
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
+from sqlalchemy.sql.lambdas import StatementLambdaElement
 
 from ..audit import write_audit
-from ..db import get_db
+from ..cache import invalidate_lists_on_commit, list_cache
+from ..db import get_db, insert_on_conflict_do_nothing
 from ..models import Runbook
+from ..pagination import MAX_PAGE_SIZE, json_page, keyset_page, page_size, split_page
 from ..rbac import authorize
 from ..schemas import RunbookCreate, RunbookList, RunbookRead
 from ..tenancy import get_tenant_and_project
@@ -17,27 +22,48 @@ from ..tenancy import get_tenant_and_project
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
+# Shared dependency instances so each permission check is one closure across routes.
+_AUTH_READ = Depends(authorize("read", "runbook"))
+_AUTH_WRITE = Depends(authorize("write", "runbook"))
+
+# Validates and serializes a whole result set in one pydantic-core pass.
+_RUNBOOK_LIST_ADAPTER: TypeAdapter[RunbookList] = TypeAdapter(RunbookList)
+
+
+def _runbook_by_id(
+    runbook_id: str, tenant_id: str, project_id: str | None
+) -> StatementLambdaElement:
+    """Tenant-scoped lookup by id; the lambda form compiles once and only rebinds parameters."""
+    stmt = lambda_stmt(
+        lambda: select(Runbook).where(Runbook.id == runbook_id, Runbook.tenant_id == tenant_id)
+    )
+    if project_id:
+        stmt += lambda s: s.where(Runbook.project_id == project_id)
+    return stmt
+
 
 @router.post("/runbooks", response_model=RunbookRead, status_code=status.HTTP_201_CREATED)
 def create_runbook(
     payload: RunbookCreate,
     request: Request,
     db: Session = Depends(get_db),
-    _auth: None = Depends(authorize("write", "runbook")),
+    _auth: None = _AUTH_WRITE,
 ) -> RunbookRead:
     tenant_id, project_id = get_tenant_and_project(request, db)
-    runbook = Runbook(name=payload.name, yaml=payload.yaml, tenant_id=tenant_id, project_id=project_id)
-    db.add(runbook)
-    try:
-        db.flush()
-    except IntegrityError:
-        db.rollback()
+    stmt = (
+        insert_on_conflict_do_nothing(db, Runbook)
+        .values(name=payload.name, yaml=payload.yaml, tenant_id=tenant_id, project_id=project_id)
+        .returning(Runbook.id, Runbook.created_at)
+    )
+    row = db.execute(stmt).one_or_none()
+    if not row:
         logger.info("Runbook name already exists: %s", payload.name)
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail="runbook with this name already exists",
         )
-    db.refresh(runbook)
+
+    invalidate_lists_on_commit(db, "runbooks", tenant_id)
 
     write_audit(
         actor_type="user",
@@ -45,26 +71,41 @@ def create_runbook(
         tenant_id=tenant_id,
         action="runbook.create",
         resource_type="runbook",
-        resource_id=runbook.id,
+        resource_id=row.id,
         payload={"name": payload.name},
+        db=db,
     )
 
-    return RunbookRead.model_validate(runbook)
+    db.commit()
+
+    # Everything but the generated keys came from the already-validated payload.
+    return RunbookRead.model_construct(
+        id=row.id, created_at=row.created_at, name=payload.name, yaml=payload.yaml
+    )
 
 
 @router.get("/runbooks", response_model=RunbookList)
 def list_runbooks(
     request: Request,
+    limit: int | None = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
     db: Session = Depends(get_db),
-    _auth: None = Depends(authorize("read", "runbook")),
-) -> RunbookList:
+    _auth: None = _AUTH_READ,
+) -> Response:
     tenant_id, project_id = get_tenant_and_project(request, db)
-    stmt = select(Runbook).where(Runbook.tenant_id == tenant_id)
-    if project_id:
-        stmt = stmt.where(Runbook.project_id == project_id)
-    stmt = stmt.order_by(Runbook.created_at.desc())
-    results = db.scalars(stmt).all()
-    return RunbookList(runbooks=[RunbookRead.model_validate(item) for item in results])
+    limit = page_size(limit, cursor)
+    cache_key = ("runbooks", tenant_id, project_id, limit, cursor)
+    cached = list_cache.get(cache_key)
+    if cached is None:
+        stmt = select(Runbook).where(Runbook.tenant_id == tenant_id)
+        if project_id:
+            stmt = stmt.where(Runbook.project_id == project_id)
+        stmt = keyset_page(stmt, Runbook, limit, cursor)
+        results, next_cursor = split_page(db.scalars(stmt).all(), limit)
+        runbooks = _RUNBOOK_LIST_ADAPTER.validate_python(results, from_attributes=True)
+        cached = (_RUNBOOK_LIST_ADAPTER.dump_json(runbooks), next_cursor)
+        list_cache.set(cache_key, cached)
+    return json_page(*cached)
 
 
 @router.get("/runbooks/{runbook_id}", response_model=RunbookRead)
@@ -72,12 +113,10 @@ def get_runbook(
     runbook_id: str,
     request: Request,
     db: Session = Depends(get_db),
-    _auth: None = Depends(authorize("read", "runbook")),
+    _auth: None = _AUTH_READ,
 ) -> RunbookRead:
     tenant_id, project_id = get_tenant_and_project(request, db)
-    stmt = select(Runbook).where(Runbook.id == runbook_id, Runbook.tenant_id == tenant_id)
-    if project_id:
-        stmt = stmt.where(Runbook.project_id == project_id)
+    stmt = _runbook_by_id(runbook_id, tenant_id, project_id)
     obj = db.scalars(stmt).first()
     if not obj:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="runbook not found")
@@ -90,20 +129,25 @@ def update_runbook(
     payload: RunbookCreate,
     request: Request,
     db: Session = Depends(get_db),
-    _auth: None = Depends(authorize("write", "runbook")),
+    _auth: None = _AUTH_WRITE,
 ) -> RunbookRead:
     tenant_id, project_id = get_tenant_and_project(request, db)
-    stmt = select(Runbook).where(Runbook.id == runbook_id, Runbook.tenant_id == tenant_id)
+    stmt = update(Runbook).where(Runbook.id == runbook_id, Runbook.tenant_id == tenant_id)
     if project_id:
         stmt = stmt.where(Runbook.project_id == project_id)
-    runbook = db.scalars(stmt).first()
+    stmt = stmt.values(name=payload.name, yaml=payload.yaml).returning(Runbook)
+    try:
+        runbook = db.scalars(stmt).one_or_none()
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="runbook with this name already exists",
+        ) from None
     if not runbook:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="runbook not found")
     
-    runbook.name = payload.name
-    runbook.yaml = payload.yaml
-    db.commit()
-    db.refresh(runbook)
+    invalidate_lists_on_commit(db, "runbooks", tenant_id)
     
     write_audit(
         actor_type="user",
@@ -113,9 +157,13 @@ def update_runbook(
         resource_type="runbook",
         resource_id=runbook_id,
         payload={"name": payload.name},
+        db=db,
     )
-    
-    return RunbookRead.model_validate(runbook)
+
+    # Read the row before committing; the commit expires it
+    runbook_read = RunbookRead.model_validate(runbook)
+    db.commit()
+    return runbook_read
 
 
 @router.delete("/runbooks/{runbook_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -123,19 +171,14 @@ def delete_runbook(
     runbook_id: str,
     request: Request,
     db: Session = Depends(get_db),
-    _auth: None = Depends(authorize("write", "runbook")),
+    _auth: None = _AUTH_WRITE,
 ):
     tenant_id, project_id = get_tenant_and_project(request, db)
-    stmt = select(Runbook).where(Runbook.id == runbook_id, Runbook.tenant_id == tenant_id)
-    if project_id:
-        stmt = stmt.where(Runbook.project_id == project_id)
+    stmt = _runbook_by_id(runbook_id, tenant_id, project_id)
     runbook = db.scalars(stmt).first()
     if not runbook:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="runbook not found")
     
-    db.delete(runbook)
-    db.commit()
-    
     write_audit(
         actor_type="user",
         actor_id=getattr(request.state, "user_email", "unknown"),
@@ -144,7 +187,12 @@ def delete_runbook(
         resource_type="runbook",
         resource_id=runbook_id,
         payload={"name": runbook.name},
+        db=db,
     )
+    db.delete(runbook)
+
+    invalidate_lists_on_commit(db, "runbooks", tenant_id)
+    db.commit()
 
 
 @router.post("/runbooks/{runbook_id}/duplicate", response_model=RunbookRead, status_code=status.HTTP_201_CREATED)
@@ -152,32 +200,34 @@ def duplicate_runbook(
     runbook_id: str,
     request: Request,
     db: Session = Depends(get_db),
-    _auth: None = Depends(authorize("write", "runbook")),
+    _auth: None = _AUTH_WRITE,
 ) -> RunbookRead:
     tenant_id, project_id = get_tenant_and_project(request, db)
-    stmt = select(Runbook).where(Runbook.id == runbook_id, Runbook.tenant_id == tenant_id)
+    # Copy the row server-side so the YAML never round-trips through the gateway.
+    source = select(
+        literal(str(uuid4()), String),
+        Runbook.name + " (Copy)",
+        Runbook.yaml,
+        literal(tenant_id, String),
+        literal(project_id, String),
+    ).where(Runbook.id == runbook_id, Runbook.tenant_id == tenant_id)
     if project_id:
-        stmt = stmt.where(Runbook.project_id == project_id)
-    original = db.scalars(stmt).first()
-    if not original:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="runbook not found")
-    
-    new_runbook = Runbook(
-        name=f"{original.name} (Copy)",
-        yaml=original.yaml,
-        tenant_id=tenant_id,
-        project_id=project_id,
+        source = source.where(Runbook.project_id == project_id)
+    insert_stmt = (
+        insert_on_conflict_do_nothing(db, Runbook)
+        .from_select(["id", "name", "yaml", "tenant_id", "project_id"], source)
+        .returning(Runbook)
     )
-    db.add(new_runbook)
-    try:
-        db.flush()
-    except IntegrityError:
-        db.rollback()
+    new_runbook = db.scalars(insert_stmt).one_or_none()
+    if not new_runbook:
+        if not db.scalar(select(source.exists())):
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="runbook not found")
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail="duplicate runbook name already exists",
         )
-    db.refresh(new_runbook)
+    
+    invalidate_lists_on_commit(db, "runbooks", tenant_id)
     
     write_audit(
         actor_type="user",
@@ -187,9 +237,12 @@ def duplicate_runbook(
         resource_type="runbook",
         resource_id=new_runbook.id,
         payload={"original_id": runbook_id, "name": new_runbook.name},
+        db=db,
     )
-    
-    return RunbookRead.model_validate(new_runbook)
+
+    new_runbook_read = RunbookRead.model_validate(new_runbook)
+    db.commit()
+    return new_runbook_read
 
 
 @router.post("/runbooks/{runbook_id}/archive", response_model=RunbookRead)
@@ -197,13 +250,11 @@ def archive_runbook(
     runbook_id: str,
     request: Request,
     db: Session = Depends(get_db),
-    _auth: None = Depends(authorize("write", "runbook")),
+    _auth: None = _AUTH_WRITE,
 ) -> RunbookRead:
     """Archive a runbook (soft delete - mark as archived)."""
     tenant_id, project_id = get_tenant_and_project(request, db)
-    stmt = select(Runbook).where(Runbook.id == runbook_id, Runbook.tenant_id == tenant_id)
-    if project_id:
-        stmt = stmt.where(Runbook.project_id == project_id)
+    stmt = _runbook_by_id(runbook_id, tenant_id, project_id)
     runbook = db.scalars(stmt).first()
     if not runbook:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="runbook not found")
@@ -217,7 +268,10 @@ def archive_runbook(
         resource_type="runbook",
         resource_id=runbook_id,
         payload={"name": runbook.name},
+        db=db,
     )
-    
-    return RunbookRead.model_validate(runbook)
+
+    runbook_read = RunbookRead.model_validate(runbook)
+    db.commit()
+    return runbook_read
 
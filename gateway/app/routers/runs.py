@@ -1,26 +1,35 @@
 from __future__ import annotations
 
-import json
-import uuid
 import asyncio
+import uuid
 from datetime import datetime, timedelta
-from typing import Any, Optional
-import os
+from functools import lru_cache
+from typing import Any, NamedTuple, Optional
 
+import orjson
 import yaml
-from fastapi import APIRouter, Depends, Header, HTTPException, Request, status
-from pydantic import BaseModel
-from sqlalchemy import select, asc, nullsfirst
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
+from pydantic import BaseModel, ConfigDict, TypeAdapter
+from sqlalchemy import func, insert, select, update
+from sqlalchemy.orm import Session, raiseload, selectinload
+from sqlalchemy.orm.attributes import set_committed_value
 from sse_starlette.sse import EventSourceResponse
 
+from app import run_events, temporal
 from app.audit import write_audit
+from app.billing.quotas import QuotaExceeded, enforce_quota
 from app.db import get_db
-from app.models import Approval, Run, RunStatus, Runbook, Step, StepStatus
+from app.models import Approval, Run, Runbook, RunStatus, Step, StepStatus
+from app.pagination import MAX_PAGE_SIZE, json_page, keyset_page, split_page
 from app.rbac import authorize
-from app.schemas import RunRead, RunbookRead, StepRead
+from app.schemas import RunbookRead, RunRead, StepRead
 from app.tenancy import get_tenant_and_project
-# Lazy import for temporalio to avoid Pydantic TypedDict conflicts at startup
+
+try:  # LibYAML-backed parser when PyYAML was built with it
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
 
 router = APIRouter()
 
@@ -38,8 +47,10 @@ class RunResponse(BaseModel):
     metrics: dict[str, Any]
     steps: list[StepRead]
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, revalidate_instances="never")
+
+
+_RUN_LIST_ADAPTER: TypeAdapter[list[RunResponse]] = TypeAdapter(list[RunResponse])
 
 
 def _load_runbook(db: Session, runbook_id: str, tenant_id: str, project_id: str | None) -> RunbookRead:
@@ -52,38 +63,67 @@ def _load_runbook(db: Session, runbook_id: str, tenant_id: str, project_id: str
     return RunbookRead.model_validate(obj)
 
 
-def _plan_from_yaml(yaml_str: str) -> list[dict[str, Any]]:
-    data = yaml.safe_load(yaml_str) or {}
+def _load_run(db: Session, run_id: str, tenant_id: str, project_id: str | None) -> Run:
+    """Tenant-scoped run with its steps, already ordered by the relationship."""
+    stmt = (
+        select(Run)
+        .options(selectinload(Run.steps))
+        .where(Run.id == run_id, Run.tenant_id == tenant_id)
+    )
+    if project_id:
+        stmt = stmt.where(Run.project_id == project_id)
+    run = db.scalars(stmt).first()
+    if not run:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="run not found")
+    return run
+
+
+class _PlanStep(NamedTuple):
+    name: str
+    tool: str
+    input: Any
+    requires_approval: bool
+    required_roles: Any
+
+
+@lru_cache(maxsize=512)
+def _plan_from_yaml(yaml_str: str) -> tuple[_PlanStep, ...]:
+    """Parse the runbook's steps into compact tuples; cached by YAML content."""
+    data = yaml.load(yaml_str, Loader=_YamlLoader) or {}
     steps = data.get("steps", [])
-    normalized = []
-    if isinstance(steps, list):
-        for step in steps:
-            if isinstance(step, dict):
-                normalized.append(step)
-    return normalized
+    if not isinstance(steps, list):
+        return ()
+    return tuple(
+        _PlanStep(
+            name=step.get("name", ""),
+            tool=step.get("tool", ""),
+            input=step.get("input"),
+            requires_approval=bool(step.get("requires_approval")),
+            required_roles=step.get("required_roles"),
+        )
+        for step in steps
+        if isinstance(step, dict)
+    )
 
 
-@router.post("/runs", response_model=RunResponse, status_code=status.HTTP_201_CREATED)
-def create_run(
+def _prepare_run(
+    db: Session,
     payload: RunRequest,
-    request: Request,
-    db: Session = Depends(get_db),
-    x_orchestrate: Optional[str] = Header(default=None),
-    _auth: None = Depends(authorize("execute", "run")),
-) -> RunResponse:
-    tenant_id, project_id = get_tenant_and_project(request, db)
-    
-    # Check quotas before creating run
+    tenant_id: str,
+    project_id: str | None,
+    x_orchestrate: Optional[str],
+) -> Run:
+    """Check quotas and persist the run with its planned steps and approvals."""
+    runbook = _load_runbook(db, payload.runbook_id, tenant_id, project_id)
+    plan_steps = _plan_from_yaml(runbook.yaml)
+    # Check quotas before creating run; estimate projected usage from the number of steps
+    projected = {
+        "steps": len(plan_steps),
+        "adapter_calls": len(plan_steps),
+        "tokens": 0,  # Will be calculated during execution
+        "cost": len(plan_steps) * 0.01,  # Estimate
+    }
     try:
-        # Estimate projected usage: number of steps
-        runbook = _load_runbook(db, payload.runbook_id, tenant_id, project_id)
-        plan_steps = _plan_from_yaml(runbook.yaml)
-        projected = {
-            "steps": len(plan_steps),
-            "adapter_calls": len(plan_steps),
-            "tokens": 0,  # Will be calculated during execution
-            "cost": len(plan_steps) * 0.01,  # Estimate
-        }
         enforce_quota(db, tenant_id, projected)
     except QuotaExceeded as e:
         raise HTTPException(
@@ -95,14 +135,46 @@ def create_run(
                 "current": e.current,
             },
         )
-    
-    runbook = _load_runbook(db, payload.runbook_id, tenant_id, project_id)
-    plan_steps = _plan_from_yaml(runbook.yaml)
+
+    run_id = str(uuid.uuid4())
+    # One walk over the plan builds the metrics plan and the step/approval rows.
+    plan_names: list[str] = []
+    step_rows: list[dict[str, Any]] = []
+    approval_rows: list[dict[str, Any]] = []
+    for step in plan_steps:
+        plan_names.append(step.name)
+        step_rows.append(
+            {
+                "run_id": run_id,
+                "name": step.name,
+                "tool": step.tool,
+                "status": StepStatus.PENDING,
+                "input": step.input,
+            }
+        )
+        # Create approval if needed
+        if step.requires_approval:
+            from ..security import sign_approval
+
+            signed = sign_approval({"run_id": run_id, "step_name": step.name})
+            approval_rows.append(
+                {
+                    "run_id": run_id,
+                    "tenant_id": tenant_id,
+                    "project_id": project_id,
+                    "step_name": step.name,
+                    "required_roles": step.required_roles,
+                    "approved": False,
+                    "sig": signed["sig"],
+                    "sig_expires_at": signed["expires_at"],
+                }
+            )
+
     metrics: dict[str, Any] = {
         "validation": {"rbac_violations": [], "unknown_tools": [], "needs_approval": []},
         "estimated_cost_usd": 0,
         "estimated_tokens": 0,
-        "plan": [s.get("name", "") for s in plan_steps],
+        "plan": plan_names,
         "mode": payload.mode,
     }
     if x_orchestrate == "temporal":
@@ -111,7 +183,7 @@ def create_run(
         metrics["expected"] = payload.shadow_expected
     status_value = RunStatus.RUNNING if payload.mode in {"execute", "dry-run", "shadow"} else RunStatus.PENDING
     run = Run(
-        id=str(uuid.uuid4()),
+        id=run_id,
         runbook_id=payload.runbook_id,
         tenant_id=tenant_id,
         project_id=project_id,
@@ -121,73 +193,57 @@ def create_run(
     db.add(run)
     db.flush()
 
-    approval_rows: list[Approval] = []
-    for step in plan_steps:
-        step_obj = Step(
-            run_id=run.id,
-            name=step.get("name", ""),
-            tool=step.get("tool", ""),
-            status=StepStatus.PENDING,
-            input=step.get("input"),
+    # One multi-row INSERT each for steps and approvals instead of a round-trip per object.
+    steps: list[Step] = []
+    if step_rows:
+        steps = list(db.scalars(insert(Step).returning(Step), step_rows))
+        # Bulk statements bypass the flush hook that announces step changes to event streams.
+        run_events.mark_run_changed(db, run.id)
+    # These are all of the run's steps, so attach them without another SELECT.
+    set_committed_value(run, "steps", steps)
+    if approval_rows:
+        db.execute(insert(Approval), approval_rows)
+    return run
+
+
+def _complete_inline(db: Session, run: Run) -> None:
+    """Inline fallback when Temporal is unavailable: mark steps succeeded (mock execution)."""
+    now = datetime.utcnow()
+    # One UPDATE for the whole run; RETURNING refreshes the steps already attached to it.
+    db.scalars(
+        update(Step)
+        .where(Step.run_id == run.id)
+        .values(
+            status=StepStatus.SUCCEEDED,
+            started_at=func.coalesce(Step.started_at, now),
+            ended_at=func.coalesce(Step.ended_at, now),
         )
-        db.add(step_obj)
-        # Create approval if needed
-        if step.get("requires_approval"):
-            from ..security import sign_approval
+        .returning(Step),
+        execution_options={"synchronize_session": False, "populate_existing": True},
+    ).all()
+    run_events.mark_run_changed(db, run.id)
+    run.status = RunStatus.SUCCEEDED
+
+
+def _record_workflow(run: Run, workflow_id: str, workflow_run_id: str | None) -> None:
+    """Mark the run as handed to its Temporal workflow."""
+    run.status = RunStatus.RUNNING
+    # Assign a new dict: in-place changes to a JSON column are not tracked
+    run.metrics = {
+        **run.metrics,
+        "temporal": {"workflow_id": workflow_id, "run_id": workflow_run_id},
+    }
 
-            signed = sign_approval({"run_id": run.id, "step_name": step.get("name", "")})
-            approval = Approval(
-                run_id=run.id,
-                tenant_id=tenant_id,
-                project_id=project_id,
-                step_name=step.get("name", ""),
-                required_roles=step.get("required_roles"),
-                approved=False,
-                sig=signed["sig"],
-                sig_expires_at=signed["expires_at"],
-            )
-            db.add(approval)
-            approval_rows.append(approval)
 
-    db.flush()
-    # start workflow if needed
-    if payload.mode in {"execute", "shadow"}:
-        try:
-            # Lazy import to avoid Pydantic TypedDict conflicts at startup
-            from temporalio.client import Client
-            
-            temporal_host = os.getenv("TEMPORAL_HOST", "temporal:7233")
-            temporal_namespace = os.getenv("TEMPORAL_NAMESPACE", "default")
-            client = asyncio.get_event_loop().run_until_complete(
-                Client.connect(temporal_host, namespace=temporal_namespace)
-            )
-            wf = asyncio.get_event_loop().run_until_complete(
-                client.start_workflow(
-                    "RunbookWorkflow",
-                    run.id,
-                    payload.mode,
-                    id=f"run-{run.id}",
-                    task_queue="runbook-queue",
-                )
-            )
-            run.status = RunStatus.RUNNING
-            run.metrics["temporal"] = {"workflow_id": wf.id, "run_id": wf.result_run_id}
-        except Exception:
-            # inline fallback: mark steps succeeded (mock execution)
-            for step in db.query(Step).filter(Step.run_id == run.id).all():
-                step.status = StepStatus.SUCCEEDED
-                step.started_at = step.started_at or datetime.utcnow()
-                step.ended_at = step.ended_at or datetime.utcnow()
-            run.status = RunStatus.SUCCEEDED
-
-    db.refresh(run)
-    db.refresh(run, attribute_names=["steps"])
-    ordered_steps = (
-        db.query(Step)
-        .filter(Step.run_id == run.id)
-        .order_by(nullsfirst(asc(Step.started_at)), asc(Step.name))
-        .all()
-    )
+def _step_order(step: Step) -> tuple[bool, datetime, str]:
+    """In-memory equivalent of ORDER BY started_at NULLS FIRST, name."""
+    return (step.started_at is not None, step.started_at or datetime.min, step.name)
+
+
+def _run_response(
+    db: Session, run: Run, request: Request, payload: RunRequest, tenant_id: str
+) -> RunResponse:
+    ordered_steps = sorted(run.steps, key=_step_order)
     # Audit log
     write_audit(
         actor_type="user",
@@ -197,40 +253,91 @@ def create_run(
         resource_type="run",
         resource_id=run.id,
         payload={"runbook_id": payload.runbook_id, "mode": payload.mode},
+        db=db,
     )
-    
+
     run.steps = ordered_steps
-    return RunResponse.model_validate(run)
+    # Read the run before committing; the commit expires it
+    response = RunResponse.model_validate(run)
+    db.commit()
+    return response
+
+
+@router.post("/runs", response_model=RunResponse, status_code=status.HTTP_201_CREATED)
+async def create_run(
+    payload: RunRequest,
+    request: Request,
+    db: Session = Depends(get_db),
+    x_orchestrate: Optional[str] = Header(default=None),
+    _auth: None = Depends(authorize("execute", "run")),
+) -> RunResponse:
+    # The session is synchronous, so its work runs on the threadpool while the Temporal
+    # calls are awaited on the event loop instead of blocking a worker thread.
+    tenant_id, project_id = await run_in_threadpool(get_tenant_and_project, request, db)
+    run = await run_in_threadpool(_prepare_run, db, payload, tenant_id, project_id, x_orchestrate)
+    run_id = run.id
+
+    # start workflow if needed
+    if payload.mode in {"execute", "shadow"}:
+        # The workflow's first activity loads the run and its steps, so commit them before it
+        # can start; the status/metrics update below commits with the response.
+        await run_in_threadpool(db.commit)
+        client = None
+        try:
+            client = await temporal.get_client(request.app)
+            wf = await client.start_workflow(
+                "RunbookWorkflow",
+                run_id,
+                payload.mode,
+                id=f"run-{run_id}",
+                task_queue="runbook-queue",
+            )
+        except Exception:
+            if client is not None:
+                # The cached connection may be dead; reconnect on the next run.
+                temporal.reset_client(request.app)
+            await run_in_threadpool(_complete_inline, db, run)
+        else:
+            await run_in_threadpool(_record_workflow, run, wf.id, wf.result_run_id)
+
+    return await run_in_threadpool(_run_response, db, run, request, payload, tenant_id)
 
 
 @router.get("/runs", response_model=list[RunResponse])
 def list_runs(
     request: Request,
-    limit: int = 50,
-    offset: int = 0,
+    limit: int = Query(50, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    offset: int = Query(0, ge=0),
     db: Session = Depends(get_db),
     _auth: None = Depends(authorize("read", "run")),
-) -> list[RunResponse]:
-    """List runs with pagination."""
+) -> Response:
+    """List runs newest first, one keyset page at a time (see X-Next-Cursor).
+
+    ``offset`` is still honoured for existing callers; it scans the skipped rows, so deep pages
+    should follow the cursor instead. The two cannot be combined.
+    """
+    if offset and cursor:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="pass either offset or cursor, not both; prefer the X-Next-Cursor cursor",
+        )
     tenant_id, project_id = get_tenant_and_project(request, db)
-    stmt = select(Run).where(Run.tenant_id == tenant_id)
+    # Steps for the whole page arrive in one batched SELECT ... WHERE run_id IN (...), already
+    # ordered by the relationship; any other lazy load would be an N+1 and raises instead.
+    stmt = (
+        select(Run)
+        .options(selectinload(Run.steps), raiseload("*"))
+        .where(Run.tenant_id == tenant_id)
+    )
     if project_id:
         stmt = stmt.where(Run.project_id == project_id)
-    stmt = stmt.order_by(Run.created_at.desc()).limit(limit).offset(offset)
-    results = db.scalars(stmt).all()
-    runs = []
-    for run in results:
-        # Load steps for each run
-        steps_stmt = (
-            select(Step)
-            .where(Step.run_id == run.id)
-            .order_by(nullsfirst(Step.started_at), Step.name)
-        )
-        steps = db.scalars(steps_stmt).all()
-        run_dict = RunResponse.model_validate(run).model_dump()
-        run_dict["steps"] = [StepRead.model_validate(s).model_dump() for s in steps]
-        runs.append(run_dict)
-    return runs
+    stmt = keyset_page(stmt, Run, limit, cursor).offset(offset or None)
+    results, next_cursor = split_page(db.scalars(stmt).all(), limit)
+    # One validation pass straight from the ORM rows, serialized by pydantic-core; returning a
+    # Response skips FastAPI's second response_model validation.
+    runs = _RUN_LIST_ADAPTER.validate_python(results, from_attributes=True)
+    return json_page(_RUN_LIST_ADAPTER.dump_json(runs), next_cursor)
 
 
 @router.get("/runs/{run_id}", response_model=RunResponse)
@@ -241,29 +348,17 @@ def get_run(
     _auth: None = Depends(authorize("read", "run")),
 ) -> RunResponse:
     tenant_id, project_id = get_tenant_and_project(request, db)
-    stmt = select(Run).where(Run.id == run_id, Run.tenant_id == tenant_id)
-    if project_id:
-        stmt = stmt.where(Run.project_id == project_id)
-    obj = db.scalars(stmt).first()
-    if not obj:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="run not found")
-    steps = (
-        db.query(Step)
-        .filter(Step.run_id == run_id)
-        .order_by(nullsfirst(asc(Step.started_at)), asc(Step.name))
-        .all()
-    )
-    obj.steps = steps
-    return RunResponse.model_validate(obj)
+    return RunResponse.model_validate(_load_run(db, run_id, tenant_id, project_id))
 
 
-def _terminal(step_status: StepStatus) -> bool:
-    return step_status in {
+_TERMINAL_STATUSES: frozenset[StepStatus] = frozenset(
+    {
         StepStatus.SUCCEEDED,
         StepStatus.FAILED,
         StepStatus.SKIPPED,
         StepStatus.COMPENSATED,
     }
+)
 
 
 @router.get("/runs/{run_id}/events")
@@ -285,30 +380,32 @@ async def stream_run_events(
     async def event_generator():
         end_time = datetime.utcnow() + timedelta(minutes=5)
         last_states: dict[str, str] = {}
-        while datetime.utcnow() < end_time:
-            steps = (
-                db.query(Step)
-                .filter(Step.run_id == run_id)
-                .order_by(nullsfirst(asc(Step.started_at)), asc(Step.name))
-                .all()
-            )
-            all_terminal = True
-            for step in steps:
-                status_value = step.status.value if isinstance(step.status, StepStatus) else str(step.status)
-                if status_value != last_states.get(step.id):
-                    last_states[step.id] = status_value
-                    yield {
-                        "event": "step",
-                        "data": json.dumps({"type": "step", "step": {"name": step.name, "status": status_value}}),
-                    }
-                if not _terminal(step.status if isinstance(step.status, StepStatus) else StepStatus(status_value)):
-                    all_terminal = False
-            if all_terminal and steps:
-                break
-            await asyncio.sleep(1)
-        yield {"event": "done", "data": json.dumps({"type": "done", "run_id": run_id})}
-
-    return EventSourceResponse(event_generator())
+        async with run_events.watch_run(run_id) as snapshots:
+            while True:
+                remaining = (end_time - datetime.utcnow()).total_seconds()
+                try:
+                    steps = await asyncio.wait_for(snapshots.get(), timeout=max(0.0, remaining))
+                except TimeoutError:
+                    break
+                all_terminal = True
+                for step_id, name, step_status in steps:
+                    if step_status.value != last_states.get(step_id):
+                        last_states[step_id] = step_status.value
+                        step_event = {"name": name, "status": step_status.value}
+                        yield {
+                            "event": "step",
+                            "data": orjson.dumps({"type": "step", "step": step_event}).decode(),
+                        }
+                    if step_status not in _TERMINAL_STATUSES:
+                        all_terminal = False
+                if all_terminal and steps:
+                    break
+        yield {"event": "done", "data": orjson.dumps({"type": "done", "run_id": run_id}).decode()}
+
+    # The request session lives until the stream ends; release its connection now, since the
+    # shared run watcher reads steps on sessions of its own
+    db.commit()
+    return EventSourceResponse(event_generator(), ping=30)
 
 
 @router.post("/runs/{run_id}/resume", response_model=RunResponse)
@@ -319,35 +416,36 @@ def resume_run(
     _auth: None = Depends(authorize("execute", "run")),
 ) -> RunResponse:
     tenant_id, project_id = get_tenant_and_project(request, db)
-    stmt = select(Run).where(Run.id == run_id, Run.tenant_id == tenant_id)
-    if project_id:
-        stmt = stmt.where(Run.project_id == project_id)
-    run = db.scalars(stmt).first()
-    if not run:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="run not found")
-    # inline resume: mark any approved pending steps as succeeded
-    steps = (
-        db.query(Step)
-        .filter(Step.run_id == run_id)
-        .order_by(nullsfirst(asc(Step.started_at)), asc(Step.name))
-        .all()
+    run = _load_run(db, run_id, tenant_id, project_id)
+    # inline resume: mark any approved pending steps as succeeded, in a single UPDATE
+    now = datetime.utcnow()
+    awaiting_approval = (
+        select(Approval.id)
+        .where(
+            Approval.run_id == run_id,
+            Approval.step_name == Step.name,
+            Approval.approved.is_(False),
+        )
+        .exists()
     )
-    for step in steps:
-        if step.status == StepStatus.PENDING:
-            approval = (
-                db.query(Approval)
-                .filter(Approval.run_id == run_id)
-                .filter(Approval.step_name == step.name)
-                .first()
-            )
-            if approval and not approval.approved:
-                continue
-            step.status = StepStatus.SUCCEEDED
-            step.started_at = step.started_at or datetime.utcnow()
-            step.ended_at = step.ended_at or datetime.utcnow()
+    # RETURNING refreshes the steps already loaded with the run
+    db.scalars(
+        update(Step)
+        .where(Step.run_id == run_id, Step.status == StepStatus.PENDING, ~awaiting_approval)
+        .values(
+            status=StepStatus.SUCCEEDED,
+            started_at=func.coalesce(Step.started_at, now),
+            ended_at=func.coalesce(Step.ended_at, now),
+        )
+        .returning(Step),
+        execution_options={"synchronize_session": False, "populate_existing": True},
+    ).all()
+    run_events.mark_run_changed(db, run_id)
+    # Newly started steps move within the started_at order
+    set_committed_value(run, "steps", sorted(run.steps, key=_step_order))
+    response = RunResponse.model_validate(run)
     db.commit()
-    run.steps = steps
-    return RunResponse.model_validate(run)
+    return response
 
 
 @router.post("/runs/{run_id}/pause", response_model=RunResponse)
@@ -359,21 +457,14 @@ def pause_run(
 ) -> RunResponse:
     """Pause a running run."""
     tenant_id, project_id = get_tenant_and_project(request, db)
-    stmt = select(Run).where(Run.id == run_id, Run.tenant_id == tenant_id)
-    if project_id:
-        stmt = stmt.where(Run.project_id == project_id)
-    run = db.scalars(stmt).first()
-    if not run:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="run not found")
+    run = _load_run(db, run_id, tenant_id, project_id)
     
     if run.status != RunStatus.RUNNING:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="run is not running")
     
     # TODO: Implement Temporal workflow pause
     run.status = RunStatus.PENDING
-    db.commit()
-    db.refresh(run)
-    
+
     write_audit(
         actor_type="user",
         actor_id=getattr(request.state, "user_email", "unknown"),
@@ -382,16 +473,12 @@ def pause_run(
         resource_type="run",
         resource_id=run_id,
         payload={"runbook_id": run.runbook_id},
+        db=db,
     )
-    
-    steps = (
-        db.query(Step)
-        .filter(Step.run_id == run_id)
-        .order_by(nullsfirst(asc(Step.started_at)), asc(Step.name))
-        .all()
-    )
-    run.steps = steps
-    return RunResponse.model_validate(run)
+
+    response = RunResponse.model_validate(run)
+    db.commit()
+    return response
 
 
 @router.post("/runs/{run_id}/cancel", response_model=RunResponse)
@@ -403,33 +490,22 @@ def cancel_run(
 ) -> RunResponse:
     """Cancel a running run."""
     tenant_id, project_id = get_tenant_and_project(request, db)
-    stmt = select(Run).where(Run.id == run_id, Run.tenant_id == tenant_id)
-    if project_id:
-        stmt = stmt.where(Run.project_id == project_id)
-    run = db.scalars(stmt).first()
-    if not run:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="run not found")
+    run = _load_run(db, run_id, tenant_id, project_id)
     
     if run.status not in (RunStatus.RUNNING, RunStatus.PENDING):
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="run cannot be cancelled")
     
     run.status = RunStatus.FAILED
-    # Cancel all pending/running steps
-    steps = (
-        db.query(Step)
-        .filter(Step.run_id == run_id)
-        .order_by(nullsfirst(asc(Step.started_at)), asc(Step.name))
-        .all()
-    )
-    for step in steps:
-        if step.status in (StepStatus.PENDING, StepStatus.RUNNING):
-            step.status = StepStatus.SKIPPED
-            step.ended_at = datetime.utcnow()
-    
-    db.commit()
-    db.refresh(run)
-    run.steps = steps
-    
+    # Cancel all pending/running steps; RETURNING refreshes the steps loaded with the run
+    db.scalars(
+        update(Step)
+        .where(Step.run_id == run_id, Step.status.in_((StepStatus.PENDING, StepStatus.RUNNING)))
+        .values(status=StepStatus.SKIPPED, ended_at=datetime.utcnow())
+        .returning(Step),
+        execution_options={"synchronize_session": False, "populate_existing": True},
+    ).all()
+    run_events.mark_run_changed(db, run_id)
+
     write_audit(
         actor_type="user",
         actor_id=getattr(request.state, "user_email", "unknown"),
@@ -438,7 +514,10 @@ def cancel_run(
         resource_type="run",
         resource_id=run_id,
         payload={"runbook_id": run.runbook_id},
+        db=db,
     )
-    
-    return RunResponse.model_validate(run)
+
+    response = RunResponse.model_validate(run)
+    db.commit()
+    return response
 
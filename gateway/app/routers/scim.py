@@ -1,20 +1,29 @@
 from __future__ import annotations
 
+import hmac
 import json
 import os
+from collections import defaultdict
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
 from datetime import datetime, timezone
+from functools import lru_cache
+from types import MappingProxyType
 from typing import Any
 from uuid import uuid4
 
-from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from pydantic import BaseModel
-from sqlalchemy import select
+from sqlalchemy import delete, func, insert, lambda_stmt, select, update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
+from sqlalchemy.sql.lambdas import StatementLambdaElement
 
-from ..audit import write_audit
-from ..db import get_db
+from ..audit import write_audit_batch
+from ..db import get_db, insert_on_conflict_do_nothing, insert_on_conflict_do_update
 from ..models import Group, GroupMember, IdentityProvider, RoleBinding, Tenant, User, UserIdentity
 from ..rbac import authorize
+from ..responses import ORJSONResponse
 from ..scim_utils import (
     build_scim_group,
     build_scim_user,
@@ -28,15 +37,54 @@ from ..tenancy import get_tenant_and_project
 
 router = APIRouter()
 
-SCIM_ENABLED = os.getenv("SCIM_ENABLED", "false").lower() == "true"
-SCIM_BEARER_TOKEN = os.getenv("SCIM_BEARER_TOKEN", "")
-SCIM_ROLE_MAP_STR = os.getenv("SCIM_ROLE_MAP", "{}")
 
-# Parse role map
-try:
-    SCIM_ROLE_MAP: dict[str, list[str]] = json.loads(SCIM_ROLE_MAP_STR)
-except Exception:
-    SCIM_ROLE_MAP = {}
+def _invert_role_map(role_map: Any) -> dict[str, frozenset[str]]:
+    """Map each lowercased IdP group name to the roles it grants.
+
+    ``role_map`` is the parsed SCIM_ROLE_MAP JSON of role -> list of group names. A bare
+    string counts as a single group; other malformed entries are ignored.
+    """
+    if not isinstance(role_map, dict):
+        return {}
+    roles_by_group: dict[str, set[str]] = defaultdict(set)
+    for role, role_groups in role_map.items():
+        if isinstance(role_groups, str):
+            role_groups = [role_groups]
+        elif not isinstance(role_groups, list):
+            continue
+        for role_group in role_groups:
+            roles_by_group[str(role_group).lower()].add(role)
+    return {group: frozenset(roles) for group, roles in roles_by_group.items()}
+
+
+@dataclass(frozen=True, slots=True)
+class ScimSettings:
+    """SCIM configuration from the SCIM_* environment variables."""
+
+    enabled: bool
+    bearer_token: bytes
+    # Lowercased IdP group name -> roles it grants
+    roles_by_group: Mapping[str, frozenset[str]]
+
+
+@lru_cache(maxsize=1)
+def scim_settings() -> ScimSettings:
+    """SCIM configuration, read from the environment on first use and immutable after."""
+    try:
+        role_map = json.loads(os.getenv("SCIM_ROLE_MAP", "{}"))
+    except ValueError:
+        role_map = {}
+    return ScimSettings(
+        enabled=os.getenv("SCIM_ENABLED", "false").lower() == "true",
+        bearer_token=os.getenv("SCIM_BEARER_TOKEN", "").encode(),
+        roles_by_group=MappingProxyType(_invert_role_map(role_map)),
+    )
+
+
+SCIM_PROVIDER_ID = "scim"
+# Provider ids seen committed in the DB. The row is never deleted, so once found it needs no
+# further lookups; a provider created by a request that rolls back is never recorded here.
+_known_providers: set[str] = set()
 
 
 def verify_scim_auth(request: Request) -> None:
@@ -44,71 +92,231 @@ def verify_scim_auth(request: Request) -> None:
     auth_header = request.headers.get("Authorization", "")
     if not auth_header.startswith("Bearer "):
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="missing bearer token")
-    token = auth_header[7:]
-    if token != SCIM_BEARER_TOKEN:
+    # Starlette decodes headers as latin-1; re-encoding yields the raw bytes the client sent
+    token = auth_header[7:].encode("latin-1")
+    # Constant-time compare so response timing does not reveal how much of the token matched.
+    # An unset token never authenticates, even against an empty bearer value.
+    expected = scim_settings().bearer_token
+    if not expected or not hmac.compare_digest(token, expected):
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="invalid bearer token")
 
 
-def sync_user_roles(db: Session, user_id: str, tenant_id: str, groups: list[str]) -> None:
-    """Sync role bindings for user based on group membership."""
-    # Get user email
-    user = db.get(User, user_id)
-    if not user:
-        return
+def require_scim(request: Request) -> None:
+    """Dependency of every SCIM endpoint: 503 while SCIM is disabled, bearer auth otherwise."""
+    if not scim_settings().enabled:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="SCIM not enabled")
+    verify_scim_auth(request)
 
-    # Get current bindings for this user
-    existing_bindings = db.scalars(
-        select(RoleBinding).where(
-            RoleBinding.tenant_id == tenant_id,
-            RoleBinding.project_id.is_(None),
-            RoleBinding.subject_type == "user",
-            RoleBinding.subject_id == user.email,
+
+def _scim_provider_id(db: Session) -> str | None:
+    """Id of the SCIM identity provider, or None when no user was provisioned yet."""
+    if SCIM_PROVIDER_ID in _known_providers:
+        return SCIM_PROVIDER_ID
+    if db.get(IdentityProvider, SCIM_PROVIDER_ID) is None:
+        return None
+    _known_providers.add(SCIM_PROVIDER_ID)
+    return SCIM_PROVIDER_ID
+
+
+def _ensure_scim_provider(db: Session) -> str:
+    """Id of the SCIM identity provider, creating its row on first use."""
+    if _scim_provider_id(db) is None:
+        db.execute(
+            insert_on_conflict_do_nothing(db, IdentityProvider).values(
+                id=SCIM_PROVIDER_ID, name="SCIM", issuer="scim", client_id="scim"
+            )
         )
-    ).all()
+    return SCIM_PROVIDER_ID
 
-    # Determine which roles should exist based on groups
-    expected_roles: set[str] = set()
-    for group_name in groups:
-        group_lower = group_name.lower()
-        for role, role_groups in SCIM_ROLE_MAP.items():
-            for role_group in role_groups:
-                if role_group.lower() == group_lower:
-                    expected_roles.add(role)
-
-    user = db.get(User, user_id)
-    if not user:
-        return
 
-    # Remove bindings for roles not in expected set
-    for binding in existing_bindings:
-        if binding.role not in expected_roles:
-            db.delete(binding)
-
-    # Add bindings for new roles
-    existing_role_names = {b.role for b in existing_bindings}
-    for role in expected_roles:
-        if role not in existing_role_names:
-            binding = RoleBinding(
-                tenant_id=tenant_id,
-                project_id=None,
-                subject_type="user",
-                subject_id=user.email,
-                role=role,
+def _identity_by_external_id(scim_provider_id: str, external_id: str) -> StatementLambdaElement:
+    """User and SCIM identity by resource id, compiled once and rebound per call."""
+    return lambda_stmt(
+        lambda: select(User, UserIdentity)
+        .join(UserIdentity, UserIdentity.user_id == User.id)
+        .where(
+            UserIdentity.provider_id == scim_provider_id,
+            UserIdentity.external_id == external_id,
+        )
+    )
+
+
+def resolve_scim_identity(db: Session, user_id: str) -> tuple[User, UserIdentity]:
+    """User and SCIM identity behind the resource id ``user_id``, or 404."""
+    scim_provider_id = _scim_provider_id(db)
+    row = None
+    if scim_provider_id:
+        row = db.execute(_identity_by_external_id(scim_provider_id, user_id)).first()
+    if row is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="user not found")
+    return row[0], row[1]
+
+
+def _group_by_external_id(tenant_id: str, external_id: str) -> StatementLambdaElement:
+    """Tenant's SCIM group by resource id, compiled once and rebound per call."""
+    return lambda_stmt(
+        lambda: select(Group).where(Group.tenant_id == tenant_id, Group.external_id == external_id)
+    )
+
+
+def _member_resources(db: Session, group_ids: list[str]) -> dict[str, list[dict[str, Any]]]:
+    """SCIM member references of each group, read with one query for all of ``group_ids``."""
+    members: dict[str, list[dict[str, Any]]] = {group_id: [] for group_id in group_ids}
+    scim_provider_id = _scim_provider_id(db)
+    if not scim_provider_id or not group_ids:
+        return members
+    rows = db.execute(
+        select(GroupMember.group_id, UserIdentity.external_id)
+        .join(UserIdentity, UserIdentity.user_id == GroupMember.user_id)
+        .where(
+            GroupMember.group_id.in_(group_ids),
+            UserIdentity.provider_id == scim_provider_id,
+            UserIdentity.external_id.is_not(None),
+        )
+    )
+    for group_id, external_id in rows:
+        members[group_id].append({"value": external_id, "type": "User"})
+    return members
+
+
+def _member_user_ids(
+    db: Session, scim_provider_id: str, members: list[dict[str, Any]]
+) -> list[str]:
+    """Users referenced by SCIM ``members``, in request order; unknown references are skipped."""
+    member_ids = [member["value"] for member in members if member.get("value")]
+    if not member_ids:
+        return []
+    user_by_external_id = dict(
+        db.execute(
+            select(UserIdentity.external_id, UserIdentity.user_id).where(
+                UserIdentity.provider_id == scim_provider_id,
+                UserIdentity.external_id.in_(member_ids),
             )
-            db.add(binding)
+        ).all()
+    )
+    return list(
+        dict.fromkeys(
+            user_by_external_id[member_id]
+            for member_id in member_ids
+            if member_id in user_by_external_id
+        )
+    )
+
+
+def _total_results(
+    db: Session, model: Any, where_clauses: list[Any], start_index: int, count: int, page_size: int
+) -> int:
+    """SCIM totalResults of a list page: rows matching ``where_clauses`` across all pages."""
+    # A short page ends the listing, so it already tells the total; only a full page, or an
+    # empty one past the start, needs the COUNT
+    if page_size < count and (page_size or start_index <= 1):
+        return start_index - 1 + page_size
+    return db.scalar(select(func.count()).select_from(model).where(*where_clauses)) or 0
+
 
+def sync_users_roles(db: Session, tenant_id: str, user_ids: Iterable[str]) -> None:
+    """Sync tenant role bindings of ``user_ids`` with their current group memberships.
+
+    Users, memberships and bindings of the whole batch are read with one query each, so
+    group-wide changes cost the same number of round trips for any member count.
+    """
+    user_ids = list(dict.fromkeys(user_ids))
+    if not user_ids:
+        return
+    # Pending membership changes must be visible to the queries below
     db.flush()
 
-    # Audit log
-    write_audit(
-        actor_type="system",
-        actor_id="scim",
-        tenant_id=tenant_id,
-        action="scim.roles.sync",
-        resource_type="user",
-        resource_id=user_id,
-        payload={"groups": groups, "roles": list(expected_roles)},
+    emails: dict[str, str] = dict(
+        db.execute(select(User.id, User.email).where(User.id.in_(user_ids))).all()
     )
+    roles_by_group = scim_settings().roles_by_group
+    groups_by_user: dict[str, list[str]] = defaultdict(list)
+    # Roles granted by each distinct group, resolved once however many members it has
+    group_roles: dict[str, frozenset[str]] = {}
+    for user_id, display_name in db.execute(
+        select(GroupMember.user_id, Group.display_name)
+        .join(Group, Group.id == GroupMember.group_id)
+        .where(GroupMember.user_id.in_(user_ids), Group.tenant_id == tenant_id)
+    ):
+        groups_by_user[user_id].append(display_name)
+        if display_name not in group_roles:
+            group_roles[display_name] = roles_by_group.get(display_name.lower(), frozenset())
+    bindings_by_email: dict[str, list[RoleBinding]] = defaultdict(list)
+    for binding in db.scalars(
+        select(RoleBinding).where(
+            RoleBinding.tenant_id == tenant_id,
+            RoleBinding.project_id.is_(None),
+            RoleBinding.subject_type == "user",
+            RoleBinding.subject_id.in_(emails.values()),
+        )
+    ):
+        bindings_by_email[binding.subject_id].append(binding)
+
+    stale_binding_ids: list[str] = []
+    new_bindings: list[dict[str, Any]] = []
+    audit_entries: list[dict[str, Any]] = []
+    for user_id in user_ids:
+        email = emails.get(user_id)
+        if email is None:
+            continue
+        groups = groups_by_user[user_id]
+
+        # Determine which roles should exist based on groups
+        expected_roles: set[str] = set().union(*(group_roles[name] for name in groups))
+
+        # Remove bindings for roles not in expected set
+        existing_bindings = bindings_by_email[email]
+        stale_binding_ids.extend(b.id for b in existing_bindings if b.role not in expected_roles)
+
+        # Add bindings for new roles
+        existing_role_names = {b.role for b in existing_bindings}
+        new_bindings.extend(
+            {
+                "tenant_id": tenant_id,
+                "project_id": None,
+                "subject_type": "user",
+                "subject_id": email,
+                "role": role,
+            }
+            for role in expected_roles
+            if role not in existing_role_names
+        )
+
+        audit_entries.append(
+            {
+                "actor_type": "system",
+                "actor_id": "scim",
+                "action": "scim.roles.sync",
+                "resource_type": "user",
+                "resource_id": user_id,
+                "payload": {"groups": groups, "roles": list(expected_roles)},
+            }
+        )
+
+    # One hash-chain read and one INSERT for every synced user's audit entry
+    write_audit_batch(db, tenant_id, audit_entries)
+    if stale_binding_ids:
+        db.execute(delete(RoleBinding).where(RoleBinding.id.in_(stale_binding_ids)))
+    if new_bindings:
+        db.execute(insert(RoleBinding), new_bindings)
+
+
+def _eq_filter_value(filter: str, attribute: str) -> str:
+    """Value of an ``attribute eq "value"`` filter, the only kind the list endpoints apply.
+
+    Any other filter answers 400 invalidFilter (RFC 7644 section 3.4.2.2); skipping it would
+    list every resource, and a provisioner checking for one would take an unrelated match.
+    """
+    parsed = parse_scim_filter(filter)
+    if not parsed or parsed["attribute"] != attribute or parsed["op"] != "eq":
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={
+                "scimType": "invalidFilter",
+                "detail": f'only {attribute} eq "value" filters are supported',
+            },
+        )
+    return parsed["value"]
 
 
 @router.get("/scim/v2/Users")
@@ -117,56 +325,72 @@ def list_scim_users(
     filter: str | None = Query(default=None, alias="filter"),
     startIndex: int = Query(default=1),
     count: int = Query(default=100),
+    _scim: None = Depends(require_scim),
     db: Session = Depends(get_db),
-) -> dict[str, Any]:
+) -> Response:
     """List SCIM users with optional filtering."""
-    verify_scim_auth(request)
-    if not SCIM_ENABLED:
-        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="SCIM not enabled")
-
     tenant_id, _ = get_tenant_and_project(request, db)
+    user_name = _eq_filter_value(filter, "userName") if filter else None
 
-    # Get SCIM provider
-    scim_provider = db.scalar(select(IdentityProvider).where(IdentityProvider.id == "scim"))
-    if not scim_provider:
-        return {"schemas": SCIM_USER_SCHEMAS, "totalResults": 0, "itemsPerPage": 0, "startIndex": 1, "Resources": []}
+    scim_provider_id = _scim_provider_id(db)
+    if not scim_provider_id:
+        return ORJSONResponse(
+            {"schemas": SCIM_USER_SCHEMAS, "totalResults": 0, "itemsPerPage": 0, "startIndex": 1, "Resources": []}
+        )
 
-    stmt = select(UserIdentity).where(UserIdentity.provider_id == scim_provider.id)
+    where_clauses = [UserIdentity.provider_id == scim_provider_id]
+    if user_name is not None:
+        where_clauses.append(UserIdentity.email == user_name)
+
+    # Load each identity together with its user instead of one db.get per row
+    rows = db.execute(
+        select(UserIdentity, User)
+        .join(User, UserIdentity.user_id == User.id)
+        .where(*where_clauses)
+        .order_by(UserIdentity.created_at, UserIdentity.id)
+        .offset(startIndex - 1)
+        .limit(count)
+    ).all()
 
-    # Parse filter
-    if filter:
-        parsed = parse_scim_filter(filter)
-        if parsed and parsed.get("attribute") == "userName":
-            stmt = stmt.where(UserIdentity.email == parsed["value"])
+    resources = [
+        build_scim_user(user, identity.email, identity.external_id) for identity, user in rows
+    ]
+    total = _total_results(db, UserIdentity, where_clauses, startIndex, count, len(resources))
+
+    # Returning the response directly skips FastAPI's jsonable_encoder pass over every
+    # resource; orjson serializes the plain dicts in one call
+    return ORJSONResponse(
+        {
+            "schemas": ["urn:ietf:params:scim:api:messages:2.0:ListResponse"],
+            "totalResults": total,
+            "itemsPerPage": count,
+            "startIndex": startIndex,
+            "Resources": resources,
+        }
+    )
 
-    identities = db.scalars(stmt).offset(startIndex - 1).limit(count).all()
 
-    resources = []
-    for identity in identities:
-        user = db.get(User, identity.user_id)
-        if user:
-            resources.append(build_scim_user(user, identity.email, identity.external_id))
+def _commit(db: Session, conflict_detail: str) -> None:
+    """Commit a SCIM write before responding, answering 409 if a unique index rejects it.
 
-    return {
-        "schemas": ["urn:ietf:params:scim:api:messages:2.0:ListResponse"],
-        "totalResults": len(resources),
-        "itemsPerPage": count,
-        "startIndex": startIndex,
-        "Resources": resources,
-    }
+    Left to get_db, the commit would run after the response went out, so a rejected write
+    would still have been reported as a success to the provisioner.
+    """
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=conflict_detail) from None
 
 
 @router.post("/scim/v2/Users", status_code=status.HTTP_201_CREATED)
 def create_scim_user(
     payload: dict[str, Any],
     request: Request,
+    _scim: None = Depends(require_scim),
     db: Session = Depends(get_db),
 ) -> dict[str, Any]:
     """Create SCIM user."""
-    verify_scim_auth(request)
-    if not SCIM_ENABLED:
-        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="SCIM not enabled")
-
     tenant_id, _ = get_tenant_and_project(request, db)
     email = payload.get("userName") or (payload.get("emails", [{}])[0].get("value") if payload.get("emails") else None)
     if not email:
@@ -175,75 +399,56 @@ def create_scim_user(
     external_id = payload.get("id") or str(uuid4())
     active = payload.get("active", True)
 
-    # Get or create SCIM provider
-    scim_provider = db.scalar(select(IdentityProvider).where(IdentityProvider.id == "scim"))
-    if not scim_provider:
-        scim_provider = IdentityProvider(id="scim", name="SCIM", issuer="scim", client_id="scim")
-        db.add(scim_provider)
-        db.flush()
-
-    # Find or create user
-    user = db.scalar(select(User).where(User.email == email))
-    if not user:
-        user = User(email=email, password_hash=None, is_disabled=not active)
-        db.add(user)
-        db.flush()
-
-    # Find or create user identity
-    identity = db.scalar(
-        select(UserIdentity).where(
-            UserIdentity.provider_id == scim_provider.id, UserIdentity.subject == email
+    scim_provider_id = _ensure_scim_provider(db)
+
+    # Create the user or update its status in one statement
+    user = db.scalars(
+        insert_on_conflict_do_update(db, User, ["email"], {"is_disabled": not active})
+        .values(email=email, password_hash=None, is_disabled=not active)
+        .returning(User),
+        execution_options={"populate_existing": True},
+    ).one()
+
+    # Point an existing identity at the new resource id, or create it. Both run right away,
+    # so a clash with another identity's subject or id surfaces here rather than at commit
+    try:
+        updated = db.execute(
+            update(UserIdentity)
+            .where(UserIdentity.provider_id == scim_provider_id, UserIdentity.subject == email)
+            .values(external_id=external_id)
         )
-    )
-    if not identity:
-        identity = UserIdentity(
-            user_id=user.id,
-            provider_id=scim_provider.id,
-            subject=email,
-            email=email,
-            external_id=external_id,
-        )
-        db.add(identity)
-    else:
-        identity.external_id = external_id
-
-    user.is_disabled = not active
-    db.commit()
-    db.refresh(user)
-    db.refresh(identity)
+        if not updated.rowcount:
+            db.execute(
+                insert(UserIdentity).values(
+                    user_id=user.id,
+                    provider_id=scim_provider_id,
+                    subject=email,
+                    email=email,
+                    external_id=external_id,
+                )
+            )
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT, detail="userName or id already in use"
+        ) from None
 
-    return build_scim_user(user, email, external_id, active)
+    resource = build_scim_user(user, email, external_id, active)
+    _commit(db, "userName already in use")
+    return resource
 
 
 @router.get("/scim/v2/Users/{user_id}")
 def get_scim_user(
     user_id: str,
     request: Request,
+    _scim: None = Depends(require_scim),
     db: Session = Depends(get_db),
 ) -> dict[str, Any]:
     """Get SCIM user by external ID."""
-    verify_scim_auth(request)
-    if not SCIM_ENABLED:
-        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="SCIM not enabled")
-
     tenant_id, _ = get_tenant_and_project(request, db)
 
-    scim_provider = db.scalar(select(IdentityProvider).where(IdentityProvider.id == "scim"))
-    if not scim_provider:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="user not found")
-
-    identity = db.scalar(
-        select(UserIdentity).where(
-            UserIdentity.provider_id == scim_provider.id,
-            UserIdentity.external_id == user_id,
-        )
-    )
-    if not identity:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="user not found")
-
-    user = db.get(User, identity.user_id)
-    if not user:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="user not found")
+    user, identity = resolve_scim_identity(db, user_id)
 
     return build_scim_user(user, identity.email, identity.external_id)
 
@@ -253,31 +458,13 @@ def update_scim_user(
     user_id: str,
     payload: dict[str, Any],
     request: Request,
+    _scim: None = Depends(require_scim),
     db: Session = Depends(get_db),
 ) -> dict[str, Any]:
     """Update SCIM user (full replace)."""
-    verify_scim_auth(request)
-    if not SCIM_ENABLED:
-        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="SCIM not enabled")
-
     tenant_id, _ = get_tenant_and_project(request, db)
 
-    scim_provider = db.scalar(select(IdentityProvider).where(IdentityProvider.id == "scim"))
-    if not scim_provider:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="user not found")
-
-    identity = db.scalar(
-        select(UserIdentity).where(
-            UserIdentity.provider_id == scim_provider.id,
-            UserIdentity.external_id == user_id,
-        )
-    )
-    if not identity:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="user not found")
-
-    user = db.get(User, identity.user_id)
-    if not user:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="user not found")
+    user, identity = resolve_scim_identity(db, user_id)
 
     # Update fields
     active = payload.get("active", True)
@@ -288,11 +475,9 @@ def update_scim_user(
         identity.email = email
         user.email = email
 
-    db.commit()
-    db.refresh(user)
-    db.refresh(identity)
-
-    return build_scim_user(user, identity.email, identity.external_id, active)
+    resource = build_scim_user(user, identity.email, identity.external_id, active)
+    _commit(db, "userName already in use")
+    return resource
 
 
 @router.patch("/scim/v2/Users/{user_id}")
@@ -300,31 +485,13 @@ def patch_scim_user(
     user_id: str,
     payload: dict[str, Any],
     request: Request,
+    _scim: None = Depends(require_scim),
     db: Session = Depends(get_db),
 ) -> dict[str, Any]:
     """Patch SCIM user (partial update)."""
-    verify_scim_auth(request)
-    if not SCIM_ENABLED:
-        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="SCIM not enabled")
-
     tenant_id, _ = get_tenant_and_project(request, db)
 
-    scim_provider = db.scalar(select(IdentityProvider).where(IdentityProvider.id == "scim"))
-    if not scim_provider:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="user not found")
-
-    identity = db.scalar(
-        select(UserIdentity).where(
-            UserIdentity.provider_id == scim_provider.id,
-            UserIdentity.external_id == user_id,
-        )
-    )
-    if not identity:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="user not found")
-
-    user = db.get(User, identity.user_id)
-    if not user:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="user not found")
+    user, identity = resolve_scim_identity(db, user_id)
 
     operations = payload.get("Operations", [])
     parsed = parse_scim_patch(operations)
@@ -336,42 +503,22 @@ def patch_scim_user(
         # Revoke sessions (clear all sessions for this user)
         # TODO: Invalidate session tokens in session store
 
+    resource = build_scim_user(user, identity.email, identity.external_id, not user.is_disabled)
     db.commit()
-    db.refresh(user)
-    db.refresh(identity)
-
-    return build_scim_user(user, identity.email, identity.external_id, not user.is_disabled)
+    return resource
 
 
 @router.delete("/scim/v2/Users/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_scim_user(
     user_id: str,
     request: Request,
+    _scim: None = Depends(require_scim),
     db: Session = Depends(get_db),
 ) -> None:
     """Delete SCIM user (soft delete - disable)."""
-    verify_scim_auth(request)
-    if not SCIM_ENABLED:
-        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="SCIM not enabled")
-
     tenant_id, _ = get_tenant_and_project(request, db)
 
-    scim_provider = db.scalar(select(IdentityProvider).where(IdentityProvider.id == "scim"))
-    if not scim_provider:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="user not found")
-
-    identity = db.scalar(
-        select(UserIdentity).where(
-            UserIdentity.provider_id == scim_provider.id,
-            UserIdentity.external_id == user_id,
-        )
-    )
-    if not identity:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="user not found")
-
-    user = db.get(User, identity.user_id)
-    if not user:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="user not found")
+    user, identity = resolve_scim_identity(db, user_id)
 
     # Soft delete: disable user
     user.is_disabled = True
@@ -384,63 +531,47 @@ def list_scim_groups(
     filter: str | None = Query(default=None, alias="filter"),
     startIndex: int = Query(default=1),
     count: int = Query(default=100),
+    _scim: None = Depends(require_scim),
     db: Session = Depends(get_db),
-) -> dict[str, Any]:
+) -> Response:
     """List SCIM groups."""
-    verify_scim_auth(request)
-    if not SCIM_ENABLED:
-        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="SCIM not enabled")
-
     tenant_id, _ = get_tenant_and_project(request, db)
 
-    stmt = select(Group).where(Group.tenant_id == tenant_id)
-
-    # Parse filter
+    where_clauses = [Group.tenant_id == tenant_id]
     if filter:
-        parsed = parse_scim_filter(filter)
-        if parsed and parsed.get("attribute") == "displayName":
-            stmt = stmt.where(Group.display_name == parsed["value"])
-
-    groups = db.scalars(stmt).offset(startIndex - 1).limit(count).all()
-
-    resources = []
-    for group in groups:
-        members = db.scalars(select(GroupMember).where(GroupMember.group_id == group.id)).all()
-        member_resources = []
-        for member in members:
-            user = db.get(User, member.user_id)
-            if user:
-                scim_provider = db.scalar(select(IdentityProvider).where(IdentityProvider.id == "scim"))
-                if scim_provider:
-                    identity = db.scalar(
-                        select(UserIdentity).where(
-                            UserIdentity.user_id == user.id, UserIdentity.provider_id == scim_provider.id
-                        )
-                    )
-                    if identity and identity.external_id:
-                        member_resources.append({"value": identity.external_id, "type": "User"})
-        resources.append(build_scim_group(group, group.external_id, member_resources))
+        where_clauses.append(Group.display_name == _eq_filter_value(filter, "displayName"))
+
+    groups = db.scalars(
+        select(Group)
+        .where(*where_clauses)
+        .order_by(Group.created_at, Group.id)
+        .offset(startIndex - 1)
+        .limit(count)
+    ).all()
 
-    return {
-        "schemas": ["urn:ietf:params:scim:api:messages:2.0:ListResponse"],
-        "totalResults": len(resources),
-        "itemsPerPage": count,
-        "startIndex": startIndex,
-        "Resources": resources,
-    }
+    members = _member_resources(db, [group.id for group in groups])
+    resources = [build_scim_group(group, group.external_id, members[group.id]) for group in groups]
+    total = _total_results(db, Group, where_clauses, startIndex, count, len(resources))
+
+    return ORJSONResponse(
+        {
+            "schemas": ["urn:ietf:params:scim:api:messages:2.0:ListResponse"],
+            "totalResults": total,
+            "itemsPerPage": count,
+            "startIndex": startIndex,
+            "Resources": resources,
+        }
+    )
 
 
 @router.post("/scim/v2/Groups", status_code=status.HTTP_201_CREATED)
 def create_scim_group(
     payload: dict[str, Any],
     request: Request,
+    _scim: None = Depends(require_scim),
     db: Session = Depends(get_db),
 ) -> dict[str, Any]:
     """Create SCIM group."""
-    verify_scim_auth(request)
-    if not SCIM_ENABLED:
-        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="SCIM not enabled")
-
     tenant_id, _ = get_tenant_and_project(request, db)
     display_name = payload.get("displayName", "")
     if not display_name:
@@ -460,91 +591,53 @@ def create_scim_group(
     else:
         group.external_id = external_id
 
-    # Get SCIM provider
-    scim_provider = db.scalar(select(IdentityProvider).where(IdentityProvider.id == "scim"))
-    if not scim_provider:
-        scim_provider = IdentityProvider(id="scim", name="SCIM", issuer="scim", client_id="scim")
-        db.add(scim_provider)
-        db.flush()
+    scim_provider_id = _ensure_scim_provider(db)
 
-    # Add members
-    for member in members:
-        member_id = member.get("value")
-        if not member_id:
-            continue
-
-        # Find user by external_id (SCIM resource ID)
-        identity = db.scalar(
-            select(UserIdentity).where(
-                UserIdentity.external_id == member_id, UserIdentity.provider_id == scim_provider.id
-            )
-        )
-        if identity:
-            # Check if member already exists
-            existing = db.scalar(
-                select(GroupMember).where(
-                    GroupMember.group_id == group.id, GroupMember.user_id == identity.user_id
+    # Add members that are not in the group yet
+    user_ids = _member_user_ids(db, scim_provider_id, members)
+    if user_ids:
+        existing = set(
+            db.scalars(
+                select(GroupMember.user_id).where(
+                    GroupMember.group_id == group.id, GroupMember.user_id.in_(user_ids)
                 )
             )
-            if not existing:
-                group_member = GroupMember(group_id=group.id, user_id=identity.user_id)
-                db.add(group_member)
-
-    db.commit()
-    db.refresh(group)
+        )
+        new_rows = [
+            {"group_id": group.id, "user_id": user_id}
+            for user_id in user_ids
+            if user_id not in existing
+        ]
+        if new_rows:
+            db.execute(insert(GroupMember), new_rows)
 
     # Sync roles for all members
-    for member in db.scalars(select(GroupMember).where(GroupMember.group_id == group.id)).all():
-        user_groups_list = [
-            g.display_name
-            for g in db.scalars(
-                select(Group).join(GroupMember).where(GroupMember.user_id == member.user_id)
-            ).all()
-        ]
-        sync_user_roles(db, member.user_id, tenant_id, user_groups_list)
+    member_ids = db.scalars(select(GroupMember.user_id).where(GroupMember.group_id == group.id))
+    sync_users_roles(db, tenant_id, member_ids)
 
     member_resources = [
         {"value": m.get("value", ""), "type": "User"} for m in members if m.get("value")
     ]
-    return build_scim_group(group, group.external_id, member_resources)
+    resource = build_scim_group(group, group.external_id, member_resources)
+    _commit(db, "displayName already in use")
+    return resource
 
 
 @router.get("/scim/v2/Groups/{group_id}")
 def get_scim_group(
     group_id: str,
     request: Request,
+    _scim: None = Depends(require_scim),
     db: Session = Depends(get_db),
 ) -> dict[str, Any]:
     """Get SCIM group by external ID."""
-    verify_scim_auth(request)
-    if not SCIM_ENABLED:
-        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="SCIM not enabled")
-
     tenant_id, _ = get_tenant_and_project(request, db)
 
-    group = db.scalar(
-        select(Group).where(Group.tenant_id == tenant_id, Group.external_id == group_id)
-    )
+    group = db.scalar(_group_by_external_id(tenant_id, group_id))
     if not group:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="group not found")
 
-    members = db.scalars(select(GroupMember).where(GroupMember.group_id == group.id)).all()
-    member_resources = []
-    for member in members:
-        user = db.get(User, member.user_id)
-        if user:
-                scim_provider = db.scalar(select(IdentityProvider).where(IdentityProvider.id == "scim"))
-                if scim_provider:
-                    identity = db.scalar(
-                        select(UserIdentity).where(
-                            UserIdentity.user_id == user.id, UserIdentity.provider_id == scim_provider.id
-                        )
-                    )
-                else:
-                    identity = None
-                if identity and identity.external_id:
-                    member_resources.append({"value": identity.external_id, "type": "User"})
-
+    member_resources = _member_resources(db, [group.id])[group.id]
     return build_scim_group(group, group.external_id, member_resources)
 
 
@@ -553,18 +646,13 @@ def update_scim_group(
     group_id: str,
     payload: dict[str, Any],
     request: Request,
+    _scim: None = Depends(require_scim),
     db: Session = Depends(get_db),
 ) -> dict[str, Any]:
     """Update SCIM group (full replace)."""
-    verify_scim_auth(request)
-    if not SCIM_ENABLED:
-        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="SCIM not enabled")
-
     tenant_id, _ = get_tenant_and_project(request, db)
 
-    group = db.scalar(
-        select(Group).where(Group.tenant_id == tenant_id, Group.external_id == group_id)
-    )
+    group = db.scalar(_group_by_external_id(tenant_id, group_id))
     if not group:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="group not found")
 
@@ -576,46 +664,27 @@ def update_scim_group(
     # Replace members
     members = payload.get("members", [])
     # Remove all existing members
-    existing_members = db.scalars(select(GroupMember).where(GroupMember.group_id == group.id)).all()
-    for member in existing_members:
-        db.delete(member)
-    # Get SCIM provider
-    scim_provider = db.scalar(select(IdentityProvider).where(IdentityProvider.id == "scim"))
-    if not scim_provider:
-        scim_provider = IdentityProvider(id="scim", name="SCIM", issuer="scim", client_id="scim")
-        db.add(scim_provider)
-        db.flush()
+    former_user_ids = db.scalars(
+        delete(GroupMember).where(GroupMember.group_id == group.id).returning(GroupMember.user_id)
+    ).all()
+    scim_provider_id = _ensure_scim_provider(db)
     # Add new members
-    for member in members:
-        member_id = member.get("value")
-        if not member_id:
-            continue
-        identity = db.scalar(
-            select(UserIdentity).where(
-                UserIdentity.external_id == member_id, UserIdentity.provider_id == scim_provider.id
-            )
+    user_ids = _member_user_ids(db, scim_provider_id, members)
+    if user_ids:
+        db.execute(
+            insert(GroupMember),
+            [{"group_id": group.id, "user_id": user_id} for user_id in user_ids],
         )
-        if identity:
-            group_member = GroupMember(group_id=group.id, user_id=identity.user_id)
-            db.add(group_member)
 
-    db.commit()
-    db.refresh(group)
-
-    # Sync roles for all members
-    for member in db.scalars(select(GroupMember).where(GroupMember.group_id == group.id)).all():
-        user_groups_list = [
-            g.display_name
-            for g in db.scalars(
-                select(Group).join(GroupMember).where(GroupMember.user_id == member.user_id)
-            ).all()
-        ]
-        sync_user_roles(db, member.user_id, tenant_id, user_groups_list)
+    # Sync roles for current and former members
+    sync_users_roles(db, tenant_id, [*former_user_ids, *user_ids])
 
     member_resources = [
         {"value": m.get("value", ""), "type": "User"} for m in members if m.get("value")
     ]
-    return build_scim_group(group, group.external_id, member_resources)
+    resource = build_scim_group(group, group.external_id, member_resources)
+    _commit(db, "displayName already in use")
+    return resource
 
 
 @router.patch("/scim/v2/Groups/{group_id}")
@@ -623,139 +692,77 @@ def patch_scim_group(
     group_id: str,
     payload: dict[str, Any],
     request: Request,
+    _scim: None = Depends(require_scim),
     db: Session = Depends(get_db),
 ) -> dict[str, Any]:
     """Patch SCIM group (partial update)."""
-    verify_scim_auth(request)
-    if not SCIM_ENABLED:
-        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="SCIM not enabled")
-
     tenant_id, _ = get_tenant_and_project(request, db)
 
-    group = db.scalar(
-        select(Group).where(Group.tenant_id == tenant_id, Group.external_id == group_id)
-    )
+    group = db.scalar(_group_by_external_id(tenant_id, group_id))
     if not group:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="group not found")
 
     operations = payload.get("Operations", [])
     parsed = parse_scim_patch(operations)
+    scim_provider_id = _scim_provider_id(db)
 
     # Handle member changes
-    if "members" in parsed.get("add", {}):
-        for member in parsed["add"]["members"]:
-            member_id = member.get("value")
-            if not member_id:
-                continue
-            scim_provider = db.scalar(select(IdentityProvider).where(IdentityProvider.id == "scim"))
-            if not scim_provider:
-                continue
-            identity = db.scalar(
-                select(UserIdentity).where(
-                    UserIdentity.external_id == member_id, UserIdentity.provider_id == scim_provider.id
-                )
-            )
-            if identity:
-                existing = db.scalar(
-                    select(GroupMember).where(
-                        GroupMember.group_id == group.id, GroupMember.user_id == identity.user_id
-                    )
-                )
-                if not existing:
-                    group_member = GroupMember(group_id=group.id, user_id=identity.user_id)
-                    db.add(group_member)
-                    # Sync roles
-                    user_groups_stmt = (
-                        select(Group)
-                        .join(GroupMember)
-                        .where(GroupMember.user_id == identity.user_id, Group.tenant_id == tenant_id)
+    changed_user_ids: list[str] = []
+    if scim_provider_id and "members" in parsed.get("add", {}):
+        user_ids = _member_user_ids(db, scim_provider_id, parsed["add"]["members"])
+        if user_ids:
+            existing = set(
+                db.scalars(
+                    select(GroupMember.user_id).where(
+                        GroupMember.group_id == group.id, GroupMember.user_id.in_(user_ids)
                     )
-                    user_groups_list = [g.display_name for g in db.scalars(user_groups_stmt).all()]
-                    sync_user_roles(db, identity.user_id, tenant_id, user_groups_list)
-
-    if "members" in parsed.get("remove", {}):
-        for member in parsed["remove"]["members"]:
-            member_id = member.get("value")
-            if not member_id:
-                continue
-            scim_provider = db.scalar(select(IdentityProvider).where(IdentityProvider.id == "scim"))
-            if not scim_provider:
-                continue
-            identity = db.scalar(
-                select(UserIdentity).where(
-                    UserIdentity.external_id == member_id, UserIdentity.provider_id == scim_provider.id
                 )
             )
-            if identity:
-                group_member = db.scalar(
-                    select(GroupMember).where(
-                        GroupMember.group_id == group.id, GroupMember.user_id == identity.user_id
-                    )
+            added = [user_id for user_id in user_ids if user_id not in existing]
+            if added:
+                db.execute(
+                    insert(GroupMember),
+                    [{"group_id": group.id, "user_id": user_id} for user_id in added],
                 )
-                if group_member:
-                    db.delete(group_member)
-                    # Sync roles
-                    user_groups_stmt = (
-                        select(Group)
-                        .join(GroupMember)
-                        .where(GroupMember.user_id == identity.user_id, Group.tenant_id == tenant_id)
-                    )
-                    user_groups_list = [g.display_name for g in db.scalars(user_groups_stmt).all()]
-                    sync_user_roles(db, identity.user_id, tenant_id, user_groups_list)
+                changed_user_ids.extend(added)
+
+    if scim_provider_id and "members" in parsed.get("remove", {}):
+        user_ids = _member_user_ids(db, scim_provider_id, parsed["remove"]["members"])
+        if user_ids:
+            removed = db.scalars(
+                delete(GroupMember)
+                .where(GroupMember.group_id == group.id, GroupMember.user_id.in_(user_ids))
+                .returning(GroupMember.user_id)
+            ).all()
+            changed_user_ids.extend(removed)
 
-    db.commit()
-    db.refresh(group)
-
-    members = db.scalars(select(GroupMember).where(GroupMember.group_id == group.id)).all()
-    member_resources = []
-    for member in members:
-        user = db.get(User, member.user_id)
-        if user:
-                scim_provider = db.scalar(select(IdentityProvider).where(IdentityProvider.id == "scim"))
-                if scim_provider:
-                    identity = db.scalar(
-                        select(UserIdentity).where(
-                            UserIdentity.user_id == user.id, UserIdentity.provider_id == scim_provider.id
-                        )
-                    )
-                else:
-                    identity = None
-                if identity and identity.external_id:
-                    member_resources.append({"value": identity.external_id, "type": "User"})
+    # Sync roles of members that joined or left
+    sync_users_roles(db, tenant_id, changed_user_ids)
 
-    return build_scim_group(group, group.external_id, member_resources)
+    member_resources = _member_resources(db, [group.id])[group.id]
+    resource = build_scim_group(group, group.external_id, member_resources)
+    _commit(db, "displayName already in use")
+    return resource
 
 
 @router.delete("/scim/v2/Groups/{group_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_scim_group(
     group_id: str,
     request: Request,
+    _scim: None = Depends(require_scim),
     db: Session = Depends(get_db),
 ) -> None:
     """Delete SCIM group."""
-    verify_scim_auth(request)
-    if not SCIM_ENABLED:
-        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="SCIM not enabled")
-
     tenant_id, _ = get_tenant_and_project(request, db)
 
-    group = db.scalar(
-        select(Group).where(Group.tenant_id == tenant_id, Group.external_id == group_id)
-    )
+    group = db.scalar(_group_by_external_id(tenant_id, group_id))
     if not group:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="group not found")
 
-    # Sync roles for all members before deleting
-    for member in db.scalars(select(GroupMember).where(GroupMember.group_id == group.id)).all():
-        # Get all groups for this user except the one being deleted
-        user_groups_stmt = (
-            select(Group)
-            .join(GroupMember)
-            .where(GroupMember.user_id == member.user_id, Group.tenant_id == tenant_id, Group.id != group.id)
-        )
-        user_groups_list = [g.display_name for g in db.scalars(user_groups_stmt).all()]
-        sync_user_roles(db, member.user_id, tenant_id, user_groups_list)
-
+    # Drop the memberships first so the role sync sees the users' remaining groups
+    user_ids = db.scalars(
+        delete(GroupMember).where(GroupMember.group_id == group.id).returning(GroupMember.user_id)
+    ).all()
     db.delete(group)
-    db.commit()
-
+    sync_users_roles(db, tenant_id, user_ids)
+    _commit(db, "displayName already in use")
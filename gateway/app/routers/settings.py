@@ -2,14 +2,16 @@
 
 from __future__ import annotations
 
+import os
 from typing import Optional
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 
 from fastapi import APIRouter, Depends, HTTPException, Request, status
 from pydantic import BaseModel, EmailStr
-from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
+from ..cache import TTLCache
 from ..db import get_db
 from ..models import User, Tenant
 from ..rbac import authorize
@@ -18,6 +20,12 @@ from ..security import hash_password, verify_password
 
 router = APIRouter(prefix="/settings", tags=["settings"])
 
+PROFILE_CACHE_TTL_SEC = float(os.getenv("PROFILE_CACHE_TTL_SEC", "60"))
+
+# Profile responses keyed by (user_id, tenant_id), dropped when the profile is updated here.
+# Process-local, so other workers (and SCIM edits) may show a profile up to the TTL old.
+_profile_cache = TTLCache(ttl=PROFILE_CACHE_TTL_SEC, maxsize=4096)
+
 
 class UserProfileUpdate(BaseModel):
     name: Optional[str] = None
@@ -49,7 +57,7 @@ class DataRetentionSettings(BaseModel):
 
 
 @router.get("/profile")
-async def get_profile(
+def get_profile(
     request: Request,
     db: Session = Depends(get_db),
     _auth: None = Depends(authorize("read", "*")),
@@ -60,29 +68,36 @@ async def get_profile(
     if not user_id:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Not authenticated")
     
+    tenant_id, _ = get_tenant_and_project(request, db)
+    cache_key = (user_id, tenant_id)
+    profile = _profile_cache.get(cache_key)
+    if profile is not None:
+        return profile
+
     user = db.get(User, user_id)
     if not user:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
     
-    tenant_id, _ = get_tenant_and_project(request, db)
     tenant = db.get(Tenant, tenant_id) if tenant_id else None
     
-    return {
+    profile = {
         "id": user.id,
         "email": user.email,
-        "name": user.email.split("@")[0].replace(".", " ").title(),  # Derive from email
+        "name": user.display_name,
         "role": "admin",  # TODO: Get from role bindings
         "timezone": "UTC",
         "tenant": {
             "id": tenant.id if tenant else None,
             "name": tenant.name if tenant else "Default",
-            "slug": tenant.name.lower().replace(" ", "-") if tenant else "default",
+            "slug": tenant.slug if tenant else "default",
         } if tenant else None,
     }
+    _profile_cache.set(cache_key, profile)
+    return profile
 
 
 @router.put("/profile")
-async def update_profile(
+def update_profile(
     payload: UserProfileUpdate,
     request: Request,
     db: Session = Depends(get_db),
@@ -98,18 +113,22 @@ async def update_profile(
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
     
     if payload.email and payload.email != user.email:
-        # Check if email already exists
-        existing = db.scalar(select(User).where(User.email == payload.email))
-        if existing:
-            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Email already in use")
         user.email = payload.email
     
-    db.commit()
+    try:
+        # The unique index on users.email rejects an address in use; no need to probe first
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT, detail="Email already in use"
+        ) from None
+    _profile_cache.discard_where(lambda key: key[0] == user_id)
     return {"message": "Profile updated successfully"}
 
 
 @router.put("/password")
-async def update_password(
+def update_password(
     payload: PasswordUpdate,
     request: Request,
     db: Session = Depends(get_db),
@@ -137,7 +156,7 @@ async def update_password(
 
 
 @router.get("/notifications")
-async def get_notification_settings(
+def get_notification_settings(
     request: Request,
     db: Session = Depends(get_db),
     _auth: None = Depends(authorize("read", "*")),
@@ -158,7 +177,7 @@ async def get_notification_settings(
 
 
 @router.put("/notifications")
-async def update_notification_settings(
+def update_notification_settings(
     payload: NotificationSettings,
     request: Request,
     db: Session = Depends(get_db),
@@ -170,7 +189,7 @@ async def update_notification_settings(
 
 
 @router.get("/data-retention")
-async def get_data_retention_settings(
+def get_data_retention_settings(
     request: Request,
     db: Session = Depends(get_db),
     _auth: None = Depends(authorize("read", "*")),
@@ -184,7 +203,7 @@ async def get_data_retention_settings(
 
 
 @router.put("/data-retention")
-async def update_data_retention_settings(
+def update_data_retention_settings(
     payload: DataRetentionSettings,
     request: Request,
     db: Session = Depends(get_db),
@@ -197,27 +216,28 @@ async def update_data_retention_settings(
 
 
 @router.get("/sessions")
-async def get_active_sessions(
+def get_active_sessions(
     request: Request,
     db: Session = Depends(get_db),
     _auth: None = Depends(authorize("read", "*")),
 ):
     """Get active sessions for current user."""
     # TODO: Track sessions in DB
+    now = datetime.now(timezone.utc)
     return {
         "sessions": [
             {
                 "id": "session-1",
                 "device": "Chrome on macOS",
                 "location": "San Francisco, CA",
-                "lastActive": datetime.now(timezone.utc).isoformat(),
+                "lastActive": now.isoformat(),
                 "current": True,
             },
             {
                 "id": "session-2",
                 "device": "Safari on iPhone",
                 "location": "San Francisco, CA",
-                "lastActive": (datetime.now(timezone.utc).replace(hour=datetime.now().hour - 2)).isoformat(),
+                "lastActive": (now - timedelta(hours=2)).isoformat(),
                 "current": False,
             },
         ]
@@ -225,7 +245,7 @@ async def get_active_sessions(
 
 
 @router.delete("/sessions/{session_id}")
-async def revoke_session(
+def revoke_session(
     session_id: str,
     request: Request,
     db: Session = Depends(get_db),
@@ -237,7 +257,7 @@ async def revoke_session(
 
 
 @router.get("/webhooks")
-async def get_webhooks(
+def get_webhooks(
     request: Request,
     db: Session = Depends(get_db),
     _auth: None = Depends(authorize("read", "*")),
@@ -258,7 +278,7 @@ async def get_webhooks(
 
 
 @router.post("/webhooks")
-async def create_webhook(
+def create_webhook(
     payload: dict,
     request: Request,
     db: Session = Depends(get_db),
@@ -20,7 +20,7 @@ async def get_status(check: Optional[str] = Query(None, description="Check type
     """Get current SLO status."""
     evaluator = get_slo_evaluator()
     is_canary_check = check == "canary"
-    status = await evaluator.check_status(check_canary=is_canary_check)
+    status = await evaluator.cached_status()
     
     # For canary checks, return simple ok/eligible format
     if is_canary_check:
@@ -2,16 +2,24 @@
 
 from __future__ import annotations
 
-import json
+import os
+import time
 import uuid
+import zlib
+from collections.abc import Iterator
+from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
-from sqlalchemy import select
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Select, insert, select
 from sqlalchemy.orm import Session
 
 from ..audit import write_audit
-from ..db import get_db
+from ..cache import invalidate_lists_on_commit, invalidate_policy_cache_on_commit
+from ..db import SessionLocal, get_db
 from ..models import (
     Approval,
     IncidentLink,
@@ -29,188 +37,211 @@ from ..tenancy import get_tenant_and_project
 router = APIRouter(prefix="/export", tags=["export"])
 
 
+# Rows fetched and serialized per chunk of the streamed export, and inserted per import statement
+EXPORT_BATCH_SIZE = 1000
+# Largest accepted import bundle; the body is buffered once as bytes before parsing
+IMPORT_MAX_BYTES = int(os.getenv("IMPORT_MAX_BYTES", str(256 * 1024 * 1024)))
+# orjson writes datetimes natively as RFC 3339; SQLite hands back naive UTC values
+EXPORT_JSON_OPTIONS = orjson.OPT_NAIVE_UTC
+
+
+def _export_collections(tenant_id: str) -> list[tuple[str, Select]]:
+    """(bundle key, query) of every exported collection of ``tenant_id``, in bundle order.
+
+    Queries select the bundle's fields as plain columns, so rows go to orjson without ORM
+    hydration and no relationship can be lazy-loaded per row.
+    """
+    # Children of runs are selected through this subquery rather than loaded per run, so each
+    # collection is one query whatever the number of runs
+    tenant_run_ids = select(Run.id).where(Run.tenant_id == tenant_id)
+    return [
+        (
+            "projects",
+            select(Project.id, Project.name, Project.created_at).where(
+                Project.tenant_id == tenant_id
+            ),
+        ),
+        (
+            "runbooks",
+            select(
+                Runbook.id, Runbook.name, Runbook.yaml, Runbook.project_id, Runbook.created_at
+            ).where(Runbook.tenant_id == tenant_id),
+        ),
+        (
+            "policies",
+            select(
+                Policy.id,
+                Policy.name,
+                Policy.yaml,
+                Policy.version,
+                Policy.project_id,
+                Policy.created_at,
+            ).where(Policy.tenant_id == tenant_id),
+        ),
+        (
+            "runs",
+            select(
+                Run.id, Run.runbook_id, Run.status, Run.metrics, Run.project_id, Run.created_at
+            ).where(Run.tenant_id == tenant_id),
+        ),
+        (
+            "steps",
+            select(
+                Step.id,
+                Step.run_id,
+                Step.name,
+                Step.tool,
+                Step.status,
+                Step.input,
+                Step.output,
+                Step.error,
+                Step.started_at.label("created_at"),
+            ).where(Step.run_id.in_(tenant_run_ids)),
+        ),
+        (
+            "approvals",
+            select(
+                Approval.id,
+                Approval.run_id,
+                Approval.step_name,
+                Approval.required_roles,
+                Approval.approved,
+                Approval.created_at,
+            ).where(Approval.run_id.in_(tenant_run_ids)),
+        ),
+        (
+            "incident_links",
+            select(
+                IncidentLink.id,
+                IncidentLink.run_id,
+                IncidentLink.pd_incident_id,
+                IncidentLink.jira_issue_key,
+                IncidentLink.created_at,
+            ).where(IncidentLink.run_id.in_(tenant_run_ids)),
+        ),
+        (
+            "role_bindings",
+            select(
+                RoleBinding.id,
+                RoleBinding.tenant_id,
+                RoleBinding.project_id,
+                RoleBinding.subject_type,
+                RoleBinding.subject_id,
+                RoleBinding.role,
+                RoleBinding.created_at,
+            ).where(RoleBinding.tenant_id == tenant_id),
+        ),
+    ]
+
+
+def _stream_bundle(header: Dict[str, Any], actor_id: str) -> Iterator[bytes]:
+    """Yield the export bundle as JSON, one chunk per batch of rows.
+
+    Runs on its own session; the request's session gives back its connection before streaming.
+    The summary follows the data since counts are only known after every row was sent. The
+    export is audited once the generator finishes or is closed, so a client disconnecting
+    mid-stream or a failing query still leaves an entry, marked as not completed.
+    """
+    tenant_id = header["tenant_id"]
+    summary: Dict[str, int] = {}
+    completed = False
+    try:
+        with SessionLocal() as db:
+            yield orjson.dumps(header)[:-1] + b',"data":{'
+            for name, stmt in _export_collections(tenant_id):
+                yield orjson.dumps(name) + b":["
+                count = 0
+                result = db.execute(stmt.execution_options(yield_per=EXPORT_BATCH_SIZE))
+                fields = tuple(result.keys())
+                for batch in result.partitions():
+                    chunk = b",".join(
+                        orjson.dumps(
+                            dict(zip(fields, row, strict=True)), option=EXPORT_JSON_OPTIONS
+                        )
+                        for row in batch
+                    )
+                    yield (b"," if count else b"") + chunk
+                    count += len(batch)
+                yield b"],"
+                summary[name] = count
+
+            # Export audit hashes (for integrity verification)
+            # TODO: Query audit logs and compute hashes
+            audit_hashes = {
+                "note": "Audit log integrity hashes would be computed here",
+                "algorithm": "sha256",
+            }
+            yield b'"audit_hashes":' + orjson.dumps(audit_hashes) + b"},"
+            yield b'"summary":' + orjson.dumps(summary) + b"}"
+        completed = True
+    finally:
+        write_audit(
+            action="export.tenant",
+            actor_type="user",
+            actor_id=actor_id,
+            tenant_id=tenant_id,
+            resource_type="tenant",
+            resource_id=tenant_id,
+            payload={"summary": summary, "completed": completed},
+        )
+
+
+def _accepts_gzip(accept_encoding: str) -> bool:
+    """Whether an Accept-Encoding header allows gzip (a bare ``q=0`` refuses it)."""
+    for coding in accept_encoding.split(","):
+        name, _, params = coding.partition(";")
+        if name.strip().lower() in ("gzip", "*"):
+            _, _, qvalue = params.replace(" ", "").partition("q=")
+            try:
+                return float(qvalue or 1) > 0
+            except ValueError:
+                return True
+    return False
+
+
+def _gzip_chunks(chunks: Iterator[bytes]) -> Iterator[bytes]:
+    """Gzip a byte stream incrementally; bundles repeat their field names on every row."""
+    compressor = zlib.compressobj(wbits=31)  # 16 + 15: gzip container, 32 KiB window
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
 @router.get("/tenant/{tenant_id}")
-async def export_tenant(
+def export_tenant(
     tenant_id: str,
     request: Request,
     db: Session = Depends(get_db),
     _auth: None = Depends(authorize("read", "*")),
-) -> Response:
-    """Export tenant data as JSON bundle for DR/migration."""
+) -> StreamingResponse:
+    """Export tenant data as JSON bundle for DR/migration, streamed collection by collection."""
     # Verify tenant exists and user has access
     tenant = db.get(Tenant, tenant_id)
     if not tenant:
         raise HTTPException(status_code=404, detail="Tenant not found")
 
-    # Build export bundle
-    bundle: Dict[str, Any] = {
+    header = {
         "version": "1.0",
         "tenant_id": tenant_id,
         "tenant_name": tenant.name,
-        "exported_at": None,
-        "summary": {},
-        "data": {},
+        "exported_at": datetime.now(timezone.utc).isoformat(),
     }
-
-    # Export projects
-    projects = db.execute(select(Project).where(Project.tenant_id == tenant_id)).scalars().all()
-    bundle["data"]["projects"] = [
-        {
-            "id": p.id,
-            "name": p.name,
-            "created_at": p.created_at.isoformat() if p.created_at else None,
-        }
-        for p in projects
-    ]
-    bundle["summary"]["projects"] = len(projects)
-
-    # Export runbooks
-    runbooks = db.execute(select(Runbook).where(Runbook.tenant_id == tenant_id)).scalars().all()
-    bundle["data"]["runbooks"] = [
-        {
-            "id": r.id,
-            "name": r.name,
-            "yaml": r.yaml,
-            "project_id": r.project_id,
-            "created_at": r.created_at.isoformat() if r.created_at else None,
-        }
-        for r in runbooks
-    ]
-    bundle["summary"]["runbooks"] = len(runbooks)
-
-    # Export policies
-    policies = db.execute(select(Policy).where(Policy.tenant_id == tenant_id)).scalars().all()
-    bundle["data"]["policies"] = [
-        {
-            "id": p.id,
-            "name": p.name,
-            "yaml": p.yaml,
-            "version": p.version,
-            "project_id": p.project_id,
-            "created_at": p.created_at.isoformat() if p.created_at else None,
-        }
-        for p in policies
-    ]
-    bundle["summary"]["policies"] = len(policies)
-
-    # Export runs metadata
-    runs = db.execute(select(Run).where(Run.tenant_id == tenant_id)).scalars().all()
-    bundle["data"]["runs"] = [
-        {
-            "id": r.id,
-            "runbook_id": r.runbook_id,
-            "status": r.status,
-            "metrics": r.metrics,
-            "project_id": r.project_id,
-            "created_at": r.created_at.isoformat() if r.created_at else None,
-        }
-        for r in runs
-    ]
-    bundle["summary"]["runs"] = len(runs)
-
-    # Export steps
-    run_ids = [r.id for r in runs]
-    steps = []
-    if run_ids:
-        steps_query = select(Step).where(Step.run_id.in_(run_ids))
-        steps = db.execute(steps_query).scalars().all()
-    bundle["data"]["steps"] = [
-        {
-            "id": s.id,
-            "run_id": s.run_id,
-            "name": s.name,
-            "tool": s.tool,
-            "status": s.status,
-            "input": s.input,
-            "output": s.output,
-            "error": s.error,
-            "created_at": s.started_at.isoformat() if s.started_at else None,
-        }
-        for s in steps
-    ]
-    bundle["summary"]["steps"] = len(steps)
-
-    # Export approvals
-    approvals = []
-    if run_ids:
-        approvals_query = select(Approval).where(Approval.run_id.in_(run_ids))
-        approvals = db.execute(approvals_query).scalars().all()
-    bundle["data"]["approvals"] = [
-        {
-            "id": a.id,
-            "run_id": a.run_id,
-            "step_name": a.step_name,
-            "status": a.status,
-            "approved_by": a.approved_by,
-            "approved_at": a.approved_at.isoformat() if a.approved_at else None,
-            "created_at": a.created_at.isoformat() if a.created_at else None,
-        }
-        for a in approvals
-    ]
-    bundle["summary"]["approvals"] = len(approvals)
-
-    # Export incident links
-    incident_links = []
-    if run_ids:
-        links_query = select(IncidentLink).where(IncidentLink.run_id.in_(run_ids))
-        incident_links = db.execute(links_query).scalars().all()
-    bundle["data"]["incident_links"] = [
-        {
-            "id": il.id,
-            "run_id": il.run_id,
-            "pd_incident_id": il.pd_incident_id,
-            "jira_issue_key": il.jira_issue_key,
-            "created_at": il.created_at.isoformat() if il.created_at else None,
-        }
-        for il in incident_links
-    ]
-    bundle["summary"]["incident_links"] = len(incident_links)
-
-    # Export role bindings
-    role_bindings = db.execute(select(RoleBinding).where(RoleBinding.tenant_id == tenant_id)).scalars().all()
-    bundle["data"]["role_bindings"] = [
-        {
-            "id": rb.id,
-            "tenant_id": rb.tenant_id,
-            "project_id": rb.project_id,
-            "subject_type": rb.subject_type,
-            "subject_id": rb.subject_id,
-            "role": rb.role,
-            "created_at": rb.created_at.isoformat() if rb.created_at else None,
-        }
-        for rb in role_bindings
-    ]
-    bundle["summary"]["role_bindings"] = len(role_bindings)
-
-    # Export audit hashes (for integrity verification)
-    # TODO: Query audit logs and compute hashes
-    bundle["data"]["audit_hashes"] = {
-        "note": "Audit log integrity hashes would be computed here",
-        "algorithm": "sha256",
+    actor_id = request.state.user_email if hasattr(request.state, "user_email") else "unknown"
+    # The request session stays open until the response is sent; end its transaction so it
+    # gives its connection back instead of holding a second one for the whole stream
+    db.commit()
+
+    chunks = _stream_bundle(header, actor_id)
+    headers = {
+        "Content-Disposition": f'attachment; filename="tenant_{tenant_id}_export.json"',
+        "Vary": "Accept-Encoding",
     }
-
-    from datetime import datetime
-
-    bundle["exported_at"] = datetime.utcnow().isoformat()
-
-    # Audit log
-    write_audit(
-        db=db,
-        action="export.tenant",
-        actor_type="user",
-        actor_id=request.state.user_email if hasattr(request.state, "user_email") else "unknown",
-        resource_type="tenant",
-        resource_id=tenant_id,
-        payload={"summary": bundle["summary"]},
-    )
-
-    # Stream JSON response (chunked for large exports)
-    json_str = json.dumps(bundle, indent=2)
-    return Response(
-        content=json_str,
-        media_type="application/json",
-        headers={"Content-Disposition": f'attachment; filename="tenant_{tenant_id}_export.json"'},
-    )
+    if _accepts_gzip(request.headers.get("accept-encoding", "")):
+        chunks = _gzip_chunks(chunks)
+        headers["Content-Encoding"] = "gzip"
+    return StreamingResponse(chunks, media_type="application/json", headers=headers)
 
 
 @router.post("/import/tenant")
@@ -220,16 +251,69 @@ async def import_tenant(
     _auth: None = Depends(authorize("write", "*")),
 ) -> Dict[str, Any]:
     """Import tenant data from JSON bundle."""
+    body = await _read_body(request, IMPORT_MAX_BYTES)
+
     # Parse JSON from request body
     try:
-        bundle = await request.json()
-    except Exception as e:
+        bundle = await run_in_threadpool(orjson.loads, body)
+    except orjson.JSONDecodeError as e:
         raise HTTPException(status_code=400, detail=f"Invalid JSON: {str(e)}")
+    del body
 
     # Validate bundle structure
     if not isinstance(bundle, dict) or "data" not in bundle:
         raise HTTPException(status_code=400, detail="Invalid bundle format: missing 'data'")
 
+    # Only the body read needs the event loop; the import itself is blocking DB work
+    return await run_in_threadpool(_import_bundle, request, db, bundle)
+
+
+async def _read_body(request: Request, limit: int) -> bytes:
+    """Read the request body into one buffer, answering 413 once it grows past ``limit``."""
+    declared = request.headers.get("content-length")
+    if declared and declared.isdigit() and int(declared) > limit:
+        raise _body_too_large(limit)
+
+    body = bytearray()
+    async for chunk in request.stream():
+        body += chunk
+        if len(body) > limit:
+            raise _body_too_large(limit)
+    return bytes(body)
+
+
+def _body_too_large(limit: int) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f"Import bundle exceeds {limit} bytes",
+    )
+
+
+def _insert_rows(db: Session, model: Any, rows: List[Dict[str, Any]]) -> int:
+    """Insert ``rows`` of ``model`` in executemany batches; returns the row count."""
+    for start in range(0, len(rows), EXPORT_BATCH_SIZE):
+        db.execute(insert(model), rows[start : start + EXPORT_BATCH_SIZE])
+    return len(rows)
+
+
+def _time_ordered_ids(count: int) -> Iterator[str]:
+    """Up to ``count`` UUIDv7 strings in ascending order, drawn from a single urandom read.
+
+    Ascending ids make bulk-inserted rows append to the primary key indexes instead of
+    splitting pages across them, as random uuid4 keys do.
+    """
+    unix_ms = time.time_ns() // 1_000_000
+    entropy = os.urandom(8 * count)
+    for i in range(count):
+        # 48-bit ms timestamp, version 7, 12-bit sequence, RFC 4122 variant, 62 random bits;
+        # every 4096 ids borrow the next millisecond so the order holds for any count
+        rand = int.from_bytes(entropy[8 * i : 8 * i + 8]) >> 2
+        value = ((unix_ms + (i >> 12)) << 80) | (0x7 << 76) | ((i & 0xFFF) << 64) | (0b10 << 62)
+        yield str(uuid.UUID(int=value | rand))
+
+
+def _import_bundle(request: Request, db: Session, bundle: Dict[str, Any]) -> Dict[str, Any]:
+    """Recreate the bundle's resources in the request's tenant under fresh ids."""
     # Get target tenant/project from headers or create default
     tenant_id, project_id = get_tenant_and_project(request, db)
 
@@ -255,172 +339,171 @@ async def import_tenant(
         "role_bindings_created": 0,
     }
 
+    data = bundle.get("data", {})
     try:
-        # Import projects
-        for proj_data in bundle.get("data", {}).get("projects", []):
-            old_id = proj_data["id"]
-            new_id = str(uuid.uuid4())
-            id_mapping["projects"][old_id] = new_id
-
-            project = Project(
-                id=new_id,
-                tenant_id=tenant_id,
-                name=proj_data["name"],
-            )
-            db.add(project)
-            summary["projects_created"] += 1
+        # One id per bundle row at most; rows skipped below just leave theirs unused
+        row_count = sum(len(rows) for rows in data.values() if isinstance(rows, list))
+        new_ids = _time_ordered_ids(row_count)
 
-        db.flush()
+        # Import projects
+        project_rows = []
+        for proj_data in data.get("projects", []):
+            new_id = next(new_ids)
+            id_mapping["projects"][proj_data["id"]] = new_id
+            project_rows.append({"id": new_id, "tenant_id": tenant_id, "name": proj_data["name"]})
+        summary["projects_created"] = _insert_rows(db, Project, project_rows)
 
         # Import runbooks
-        for rb_data in bundle.get("data", {}).get("runbooks", []):
-            old_id = rb_data["id"]
-            new_id = str(uuid.uuid4())
-            id_mapping["runbooks"][old_id] = new_id
-
+        runbook_rows = []
+        for rb_data in data.get("runbooks", []):
+            new_id = next(new_ids)
+            id_mapping["runbooks"][rb_data["id"]] = new_id
             project_id_mapped = id_mapping["projects"].get(rb_data.get("project_id"), project_id)
-
-            runbook = Runbook(
-                id=new_id,
-                tenant_id=tenant_id,
-                project_id=project_id_mapped,
-                name=rb_data["name"],
-                yaml=rb_data["yaml"],
+            runbook_rows.append(
+                {
+                    "id": new_id,
+                    "tenant_id": tenant_id,
+                    "project_id": project_id_mapped,
+                    "name": rb_data["name"],
+                    "yaml": rb_data["yaml"],
+                }
             )
-            db.add(runbook)
-            summary["runbooks_created"] += 1
-
-        db.flush()
+        summary["runbooks_created"] = _insert_rows(db, Runbook, runbook_rows)
 
         # Import policies
-        for pol_data in bundle.get("data", {}).get("policies", []):
-            old_id = pol_data["id"]
-            new_id = str(uuid.uuid4())
-            id_mapping["policies"][old_id] = new_id
-
+        policy_rows = []
+        for pol_data in data.get("policies", []):
+            new_id = next(new_ids)
+            id_mapping["policies"][pol_data["id"]] = new_id
             project_id_mapped = id_mapping["projects"].get(pol_data.get("project_id"), project_id)
-
-            policy = Policy(
-                id=new_id,
-                tenant_id=tenant_id,
-                project_id=project_id_mapped,
-                name=pol_data["name"],
-                yaml=pol_data["yaml"],
-                version=pol_data.get("version", "1.0"),
+            policy_rows.append(
+                {
+                    "id": new_id,
+                    "tenant_id": tenant_id,
+                    "project_id": project_id_mapped,
+                    "name": pol_data["name"],
+                    "yaml": pol_data["yaml"],
+                    "version": pol_data.get("version", "1.0"),
+                }
             )
-            db.add(policy)
-            summary["policies_created"] += 1
-
-        db.flush()
+        summary["policies_created"] = _insert_rows(db, Policy, policy_rows)
 
         # Import runs
-        for run_data in bundle.get("data", {}).get("runs", []):
-            old_id = run_data["id"]
-            new_id = str(uuid.uuid4())
-            id_mapping["runs"][old_id] = new_id
-
+        run_rows = []
+        run_projects: Dict[str, Optional[str]] = {}
+        for run_data in data.get("runs", []):
             runbook_id_mapped = id_mapping["runbooks"].get(run_data.get("runbook_id"))
             if not runbook_id_mapped:
                 continue  # Skip if runbook not imported
 
+            new_id = next(new_ids)
+            id_mapping["runs"][run_data["id"]] = new_id
             project_id_mapped = id_mapping["projects"].get(run_data.get("project_id"), project_id)
-
-            run = Run(
-                id=new_id,
-                tenant_id=tenant_id,
-                project_id=project_id_mapped,
-                runbook_id=runbook_id_mapped,
-                status=run_data["status"],
-                metrics=run_data.get("metrics", {}),
+            run_projects[new_id] = project_id_mapped
+            run_rows.append(
+                {
+                    "id": new_id,
+                    "tenant_id": tenant_id,
+                    "project_id": project_id_mapped,
+                    "runbook_id": runbook_id_mapped,
+                    "status": run_data["status"],
+                    "metrics": run_data.get("metrics", {}),
+                }
             )
-            db.add(run)
-            summary["runs_created"] += 1
-
-        db.flush()
+        summary["runs_created"] = _insert_rows(db, Run, run_rows)
 
         # Import steps
-        for step_data in bundle.get("data", {}).get("steps", []):
+        step_rows = []
+        for step_data in data.get("steps", []):
             run_id_mapped = id_mapping["runs"].get(step_data.get("run_id"))
             if not run_id_mapped:
                 continue  # Skip if run not imported
 
-            step = Step(
-                id=str(uuid.uuid4()),
-                run_id=run_id_mapped,
-                name=step_data["name"],
-                tool=step_data["tool"],
-                status=step_data["status"],
-                input=step_data.get("input"),
-                output=step_data.get("output"),
-                error=step_data.get("error"),
+            step_rows.append(
+                {
+                    "id": next(new_ids),
+                    "run_id": run_id_mapped,
+                    "name": step_data["name"],
+                    "tool": step_data["tool"],
+                    "status": step_data["status"],
+                    "input": step_data.get("input"),
+                    "output": step_data.get("output"),
+                    "error": step_data.get("error"),
+                }
             )
-            db.add(step)
-            summary["steps_created"] += 1
-
-        db.flush()
+        summary["steps_created"] = _insert_rows(db, Step, step_rows)
 
         # Import approvals
-        for appr_data in bundle.get("data", {}).get("approvals", []):
+        approval_rows = []
+        for appr_data in data.get("approvals", []):
             run_id_mapped = id_mapping["runs"].get(appr_data.get("run_id"))
             if not run_id_mapped:
                 continue
 
-            approval = Approval(
-                id=str(uuid.uuid4()),
-                run_id=run_id_mapped,
-                step_name=appr_data["step_name"],
-                status=appr_data["status"],
-                approved_by=appr_data.get("approved_by"),
+            approval_rows.append(
+                {
+                    "id": next(new_ids),
+                    "run_id": run_id_mapped,
+                    "tenant_id": tenant_id,
+                    "project_id": run_projects[run_id_mapped],
+                    "step_name": appr_data["step_name"],
+                    "required_roles": appr_data.get("required_roles"),
+                    "approved": appr_data.get("approved", False),
+                }
             )
-            db.add(approval)
-            summary["approvals_created"] += 1
-
-        db.flush()
+        summary["approvals_created"] = _insert_rows(db, Approval, approval_rows)
 
         # Import incident links
-        for link_data in bundle.get("data", {}).get("incident_links", []):
+        link_rows = []
+        for link_data in data.get("incident_links", []):
             run_id_mapped = id_mapping["runs"].get(link_data.get("run_id"))
             if not run_id_mapped:
                 continue
 
-            incident_link = IncidentLink(
-                id=str(uuid.uuid4()),
-                run_id=run_id_mapped,
-                pd_incident_id=link_data.get("pd_incident_id"),
-                jira_issue_key=link_data.get("jira_issue_key"),
+            link_rows.append(
+                {
+                    "id": next(new_ids),
+                    "run_id": run_id_mapped,
+                    "tenant_id": tenant_id,
+                    "project_id": run_projects[run_id_mapped],
+                    "pd_incident_id": link_data.get("pd_incident_id"),
+                    "jira_issue_key": link_data.get("jira_issue_key"),
+                }
             )
-            db.add(incident_link)
-            summary["incident_links_created"] += 1
-
-        db.flush()
+        summary["incident_links_created"] = _insert_rows(db, IncidentLink, link_rows)
 
         # Import role bindings
-        for rb_data in bundle.get("data", {}).get("role_bindings", []):
+        binding_rows = []
+        for rb_data in data.get("role_bindings", []):
             project_id_mapped = id_mapping["projects"].get(rb_data.get("project_id"), project_id)
-
-            role_binding = RoleBinding(
-                id=str(uuid.uuid4()),
-                tenant_id=tenant_id,
-                project_id=project_id_mapped if project_id_mapped else None,
-                subject_type=rb_data["subject_type"],
-                subject_id=rb_data["subject_id"],
-                role=rb_data["role"],
+            binding_rows.append(
+                {
+                    "id": next(new_ids),
+                    "tenant_id": tenant_id,
+                    "project_id": project_id_mapped if project_id_mapped else None,
+                    "subject_type": rb_data["subject_type"],
+                    "subject_id": rb_data["subject_id"],
+                    "role": rb_data["role"],
+                }
             )
-            db.add(role_binding)
-            summary["role_bindings_created"] += 1
-
-        db.commit()
+        summary["role_bindings_created"] = _insert_rows(db, RoleBinding, binding_rows)
 
-        # Audit log
+        # Audit log, committed with the imported rows
         write_audit(
             db=db,
             action="import.tenant",
             actor_type="user",
-            actor_id=request.state.user_email if hasattr(request.state, "user_email") else "unknown",
+            actor_id=getattr(request.state, "user_email", "unknown"),
+            tenant_id=tenant_id,
             resource_type="tenant",
             resource_id=tenant_id,
             payload={"summary": summary, "source_tenant": bundle.get("tenant_id")},
         )
+        for resource in ("projects", "runbooks", "policies"):
+            invalidate_lists_on_commit(db, resource, tenant_id)
+        invalidate_policy_cache_on_commit(db)
+        # Commit before reporting success; the commit also runs the cache invalidations above
+        db.commit()
 
         return {
             "status": "success",
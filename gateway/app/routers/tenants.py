@@ -67,9 +67,14 @@ def create_tenant(payload: TenantCreate, db: Session = Depends(get_db)) -> Tenan
             resource_type="tenant",
             resource_id=tenant.id,
             payload={"name": payload.name},
+            db=db,
         )
         db.refresh(tenant)
-        return TenantRead.model_validate(tenant)
+        tenant_read = TenantRead.model_construct(
+            id=tenant.id, name=tenant.name, created_at=tenant.created_at
+        )
+        db.commit()
+        return tenant_read
     except Exception:
         db.rollback()
         raise HTTPException(
@@ -104,14 +109,18 @@ def create_api_key(tenant_id: str, payload: APIKeyCreate, db: Session = Depends(
         resource_type="apikey",
         resource_id=api_key.id,
         payload={"name": payload.name},
+        db=db,
     )
     db.refresh(api_key)
-    return APIKeyCreateResponse(
+    response = APIKeyCreateResponse.model_construct(
         id=api_key.id,
         name=api_key.name,
         plain=plain_key,
         created_at=api_key.created_at,
     )
+    # Commit before the one-time key is handed out, so it is never returned for a lost write
+    db.commit()
+    return response
 
 
 @router.get("/tenants/{tenant_id}/apikeys", response_model=list[APIKeyRead])
@@ -120,9 +129,14 @@ def list_api_keys(tenant_id: str, db: Session = Depends(get_db)) -> list[APIKeyR
     tenant = db.get(Tenant, tenant_id)
     if not tenant:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="tenant not found")
-    stmt = select(APIKey).where(APIKey.tenant_id == tenant_id).order_by(APIKey.created_at.desc())
-    keys = db.scalars(stmt).all()
-    return [APIKeyRead.model_validate(k) for k in keys]
+    # Only the listed columns; the key hash never leaves the database
+    stmt = (
+        select(APIKey.id, APIKey.name, APIKey.created_at, APIKey.last_used_at, APIKey.is_active)
+        .where(APIKey.tenant_id == tenant_id)
+        .order_by(APIKey.created_at.desc())
+    )
+    # Typed columns straight from the database already match APIKeyRead; skip re-validating
+    return [APIKeyRead.model_construct(**row._mapping) for row in db.execute(stmt)]
 
 
 @router.post("/apikeys/{key_id}/rotate", response_model=APIKeyCreateResponse)
@@ -152,14 +166,17 @@ def rotate_api_key(key_id: str, db: Session = Depends(get_db)) -> APIKeyCreateRe
         resource_type="apikey",
         resource_id=new_key.id,
         payload={"old_key_id": key_id},
+        db=db,
     )
     db.refresh(new_key)
-    return APIKeyCreateResponse(
+    response = APIKeyCreateResponse.model_construct(
         id=new_key.id,
         name=new_key.name,
         plain=plain_key,
         created_at=new_key.created_at,
     )
+    db.commit()
+    return response
 
 
 @router.delete("/apikeys/{key_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -170,8 +187,6 @@ def revoke_api_key(key_id: str, db: Session = Depends(get_db)) -> None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="api key not found")
     
     api_key.is_active = False
-    db.commit()
-    
     write_audit(
         actor_type="user",
         actor_id="admin",
@@ -180,5 +195,7 @@ def revoke_api_key(key_id: str, db: Session = Depends(get_db)) -> None:
         resource_type="apikey",
         resource_id=key_id,
         payload={"name": api_key.name},
+        db=db,
     )
+    db.commit()
 
@@ -3,7 +3,7 @@ from __future__ import annotations
 import time
 from typing import Any, Callable, Dict, Optional
 
-from fastapi import APIRouter, Depends, Header, HTTPException, Request, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Request, Response, status
 from opentelemetry import trace
 from prometheus_client import Counter, Histogram
 from sqlalchemy import select
@@ -18,12 +18,12 @@ from adapters.k8s import mock as k8s_mock
 from adapters.pagerduty import adapter as pagerduty_real
 from adapters.pagerduty import mock as pagerduty_mock
 from app.audit import write_audit
+from app.cache import policy_cache
 from app.feature_flags import which_adapter
 from app.policy_guard import guard_tool_call, parse_policy
 from app.db import get_db
 from app.models import Policy
-from app.schemas import PolicyRead
-from app.billing.quotas import check_quota, enforce_quota, QuotaExceeded
+from app.billing.quotas import enforce_quota, QuotaExceeded
 from app.tenancy import get_tenant_and_project
 from adapters.types import AdapterResponse, ToolCall
 from pydantic import BaseModel, Field
@@ -42,6 +42,27 @@ adapter_latency_seconds = Histogram(
     ["adapter", "tool"],
 )
 
+# Bound children of the adapter metrics; labels() validates and hashes its arguments on every
+# call, while the set of (adapter, tool) pairs seen in practice is small.
+_invocation_counters: dict[tuple[str, str, str], Any] = {}
+_latency_histograms: dict[tuple[str, str], Any] = {}
+
+
+def _invocation_counter(adapter: str, tool: str, dry_run: bool) -> Any:
+    key = (adapter, tool, str(dry_run))
+    counter = _invocation_counters.get(key)
+    if counter is None:
+        counter = _invocation_counters[key] = adapter_invocations_total.labels(*key)
+    return counter
+
+
+def _latency_histogram(adapter: str, tool: str) -> Any:
+    key = (adapter, tool)
+    histogram = _latency_histograms.get(key)
+    if histogram is None:
+        histogram = _latency_histograms[key] = adapter_latency_seconds.labels(*key)
+    return histogram
+
 ADAPTERS: dict[str, dict[str, Any]] = {
     "github": {"real": github_real, "mock": github_mock},
     "jira": {"real": jira_real, "mock": jira_mock},
@@ -74,12 +95,20 @@ def get_user_roles(
     return ["Admin"]
 
 
-def _latest_policy(db: Session, name: str = "default") -> PolicyRead | None:
-    stmt = select(Policy).where(Policy.name == name).order_by(Policy.created_at.desc())
-    obj = db.scalars(stmt).first()
-    if obj:
-        return PolicyRead.model_validate(obj)
-    return None
+def _latest_policy(db: Session, name: str = "default") -> dict[str, Any]:
+    """Parsed YAML of the newest policy called ``name``, or ``{}`` when there is none."""
+    parsed = policy_cache.get(name)
+    if parsed is None:
+        stmt = (
+            select(Policy.yaml)
+            .where(Policy.name == name)
+            .order_by(Policy.created_at.desc())
+            .limit(1)
+        )
+        policy_yaml = db.scalars(stmt).first()
+        parsed = parse_policy(policy_yaml) if policy_yaml is not None else {}
+        policy_cache.set(name, parsed)
+    return parsed
 
 
 class ToolRequest(BaseModel):
@@ -104,9 +133,7 @@ async def plan_tool(
     db: Session = Depends(get_db),
     user_roles: list[str] = Depends(get_user_roles),
 ) -> ToolPlanResponse:
-    policy = _latest_policy(db)
-    parsed_policy = parse_policy(policy.yaml) if policy else {}
-    guard_tool_call(req.tool, req.args, user_roles, parsed_policy)
+    guard_tool_call(req.tool, req.args, user_roles, _latest_policy(db))
 
     # Check which adapter would be used (for info, doesn't affect plan)
     request_headers = {}
@@ -121,21 +148,19 @@ async def plan_tool(
 async def invoke_tool(
     req: ToolRequest,
     request: Request,
+    response: Response,
     db: Session = Depends(get_db),
     user_roles: list[str] = Depends(get_user_roles),
     x_adapter_real: Optional[str] = Header(default=None),
 ) -> AdapterResponse:
-    policy = _latest_policy(db)
-    parsed_policy = parse_policy(policy.yaml) if policy else {}
-    guard_tool_call(req.tool, req.args, user_roles, parsed_policy)
+    guard_tool_call(req.tool, req.args, user_roles, _latest_policy(db))
 
     # Check quotas
     tenant_id, _ = get_tenant_and_project(request, db)
-    response_headers = {}
     try:
         # Projected usage: 1 adapter call
         projected = {"adapter_calls": 1, "tokens": 0, "cost": 0.01}  # Estimate
-        enforce_quota(db, tenant_id, projected)
+        is_warning = enforce_quota(db, tenant_id, projected)
     except QuotaExceeded as e:
         raise HTTPException(
             status_code=402,
@@ -147,10 +172,9 @@ async def invoke_tool(
             },
         )
 
-    # Check for warnings
-    is_warning, quota_info = check_quota(db, tenant_id)
+    # Warn from the usage snapshot enforce_quota already checked
     if is_warning:
-        response_headers["X-Quota-Warn"] = "true"
+        response.headers["X-Quota-Warn"] = "true"
 
     use_real = x_adapter_real in ("github", "k8s", "jira", "pagerduty")
     adapter_mod = pick_adapter(req.tool, use_real=use_real)
@@ -166,14 +190,14 @@ async def invoke_tool(
         "idempotencyKey": req.idempotencyKey,
     }
     adapter_name = adapter_mod.__name__.split(".")[-1]
-    adapter_invocations_total.labels(adapter=adapter_name, tool=req.tool, dry_run=str(req.dryRun)).inc()
+    _invocation_counter(adapter_name, req.tool, req.dryRun).inc()
 
     start = time.perf_counter()
     with tracer.start_as_current_span("tools.invoke") as span:
         span.set_attribute("tool.name", req.tool)
         span.set_attribute("tool.dry_run", req.dryRun)
         result = await adapter_mod.invoke(call)
-    adapter_latency_seconds.labels(adapter=adapter_name, tool=req.tool).observe(time.perf_counter() - start)
+    _latency_histogram(adapter_name, req.tool).observe(time.perf_counter() - start)
     
     # Audit log
     tenant_id_for_audit = tenant_id if tenant_id else None
@@ -187,14 +211,5 @@ async def invoke_tool(
         payload={"args": req.args, "dry_run": req.dryRun, "adapter": adapter_name},
     )
     
-    # Return response with quota warning headers if needed
-    if response_headers:
-        from fastapi import Response as FastAPIResponse
-        import json
-        return FastAPIResponse(
-            content=json.dumps(result.model_dump() if hasattr(result, "model_dump") else result.dict()),
-            media_type="application/json",
-            headers=response_headers,
-        )
     return result
 
@@ -0,0 +1,216 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+from collections import defaultdict
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import event, select, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from .db import SessionLocal, engine
+from .models import Step, StepStatus
+
+logger = logging.getLogger(__name__)
+
+STEP_UPDATE_CHANNEL = "step_update"
+# Step changes are pushed to watchers; this is only a safety-net recheck for missed wake-ups.
+SSE_RECHECK_SEC = float(os.getenv("SSE_RECHECK_SEC", "15"))
+
+# (step id, name, status) in the order steps are listed for a run
+StepState = tuple[str, str, StepStatus]
+
+# Postgres announces every step insert/status change on STEP_UPDATE_CHANNEL with the run id
+# as payload, so steps written by the Temporal worker wake SSE streams in every gateway.
+STEP_NOTIFY_DDL = (
+    f"""
+    CREATE OR REPLACE FUNCTION notify_step_update() RETURNS trigger AS $$
+    BEGIN
+        PERFORM pg_notify('{STEP_UPDATE_CHANNEL}', NEW.run_id);
+        RETURN NEW;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    "DROP TRIGGER IF EXISTS steps_notify_update ON steps",
+    """
+    CREATE TRIGGER steps_notify_update
+    AFTER INSERT OR UPDATE OF status ON steps
+    FOR EACH ROW EXECUTE FUNCTION notify_step_update()
+    """,
+)
+
+_CHANGED_RUNS_KEY = "changed_run_ids"
+
+
+class RunEventHub:
+    """Per-run wake-ups for SSE streams living on this process's event loop."""
+
+    def __init__(self) -> None:
+        self._waiters: dict[str, set[asyncio.Event]] = defaultdict(set)
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    def subscribe(self, run_id: str) -> asyncio.Event:
+        self._loop = asyncio.get_running_loop()
+        waiter = asyncio.Event()
+        self._waiters[run_id].add(waiter)
+        return waiter
+
+    def unsubscribe(self, run_id: str, waiter: asyncio.Event) -> None:
+        waiters = self._waiters.get(run_id)
+        if waiters is not None:
+            waiters.discard(waiter)
+            if not waiters:
+                del self._waiters[run_id]
+
+    def publish(self, run_id: str) -> None:
+        """Wake every stream of ``run_id``; safe to call from threadpool workers."""
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            self._wake(run_id)
+        else:
+            loop.call_soon_threadsafe(self._wake, run_id)
+
+    def _wake(self, run_id: str) -> None:
+        for waiter in self._waiters.get(run_id, ()):
+            waiter.set()
+
+
+hub = RunEventHub()
+
+
+def mark_run_changed(db: Session, run_id: str) -> None:
+    """Publish ``run_id`` once ``db`` commits; for bulk statements the flush hook can't see."""
+    db.info.setdefault(_CHANGED_RUNS_KEY, set()).add(run_id)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_changed_steps(session: Session, flush_context) -> None:
+    for obj in (*session.new, *session.dirty):
+        if isinstance(obj, Step) and obj.run_id:
+            mark_run_changed(session, obj.run_id)
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_changed_runs(session: Session) -> None:
+    for run_id in session.info.pop(_CHANGED_RUNS_KEY, ()):
+        hub.publish(run_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changed_runs(session: Session) -> None:
+    session.info.pop(_CHANGED_RUNS_KEY, None)
+
+
+def install_step_notify_trigger(conn: Connection) -> None:
+    for statement in STEP_NOTIFY_DDL:
+        conn.execute(text(statement))
+
+
+async def listen_for_step_updates() -> None:
+    """Relay Postgres step notifications into the hub until cancelled, reconnecting on errors."""
+    import psycopg
+
+    dsn = engine.url.set(drivername="postgresql").render_as_string(hide_password=False)
+    while True:
+        try:
+            async with await psycopg.AsyncConnection.connect(dsn, autocommit=True) as conn:
+                await conn.execute(f"LISTEN {STEP_UPDATE_CHANNEL}")
+                async for notify in conn.notifies():
+                    hub.publish(notify.payload)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning("step update listener disconnected, retrying: %s", e)
+            await asyncio.sleep(5)
+
+
+def _load_step_states(run_id: str) -> list[StepState]:
+    with SessionLocal() as db:
+        rows = db.execute(
+            select(Step.id, Step.name, Step.status)
+            .where(Step.run_id == run_id)
+            .order_by(Step.started_at.asc().nullsfirst(), Step.name)
+        )
+        return [tuple(row) for row in rows]
+
+
+def _offer(queue: asyncio.Queue[list[StepState]], states: list[StepState]) -> None:
+    # Every snapshot is the run's full state, so a slow subscriber only needs the newest one.
+    if queue.full():
+        queue.get_nowait()
+    queue.put_nowait(states)
+
+
+class _RunWatch:
+    """One step reader per watched run, fanning snapshots out to every subscribed stream."""
+
+    def __init__(self, run_id: str) -> None:
+        self.run_id = run_id
+        self.queues: set[asyncio.Queue[list[StepState]]] = set()
+        self.latest: list[StepState] | None = None
+        self.task: asyncio.Task[None] | None = None
+
+    def add(self) -> asyncio.Queue[list[StepState]]:
+        queue: asyncio.Queue[list[StepState]] = asyncio.Queue(maxsize=1)
+        if self.latest is not None:
+            queue.put_nowait(self.latest)
+        self.queues.add(queue)
+        if self.task is None:
+            self.task = asyncio.create_task(self._poll())
+        return queue
+
+    async def _poll(self) -> None:
+        woken = hub.subscribe(self.run_id)
+        try:
+            while True:
+                # Clear before reading so a commit landing mid-query still triggers another pass.
+                woken.clear()
+                try:
+                    states = await run_in_threadpool(_load_step_states, self.run_id)
+                except Exception as e:
+                    logger.warning("failed to read steps of run %s: %s", self.run_id, e)
+                else:
+                    if states != self.latest:
+                        self.latest = states
+                        for queue in self.queues:
+                            _offer(queue, states)
+                try:
+                    await asyncio.wait_for(woken.wait(), timeout=SSE_RECHECK_SEC)
+                except TimeoutError:
+                    pass
+        finally:
+            hub.unsubscribe(self.run_id, woken)
+
+
+_watches: dict[str, _RunWatch] = {}
+
+
+@asynccontextmanager
+async def watch_run(run_id: str) -> AsyncIterator[asyncio.Queue[list[StepState]]]:
+    """Subscribe to step snapshots of ``run_id``; the first one arrives as soon as it is read.
+
+    All streams of a run share one reader, so DB reads scale with watched runs rather than
+    open connections. The reader stops when its last subscriber leaves.
+    """
+    watch = _watches.get(run_id)
+    if watch is None:
+        watch = _watches[run_id] = _RunWatch(run_id)
+    queue = watch.add()
+    try:
+        yield queue
+    finally:
+        watch.queues.discard(queue)
+        if not watch.queues:
+            del _watches[run_id]
+            if watch.task is not None:
+                watch.task.cancel()
@@ -3,7 +3,7 @@ from __future__ import annotations
 from datetime import datetime
 from typing import List, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class RunbookBase(BaseModel):
@@ -19,8 +19,7 @@ class RunbookRead(RunbookBase):
     id: str
     created_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, revalidate_instances="never")
 
 
 class PolicyBase(BaseModel):
@@ -37,8 +36,7 @@ class PolicyRead(PolicyBase):
     id: str
     created_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, revalidate_instances="never")
 
 
 RunbookList = List[RunbookRead]
@@ -56,8 +54,7 @@ class StepRead(BaseModel):
     started_at: Optional[datetime] = None
     ended_at: Optional[datetime] = None
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, revalidate_instances="never")
 
 
 class RunRead(BaseModel):
@@ -68,6 +65,5 @@ class RunRead(BaseModel):
     created_at: datetime
     steps: List[StepRead] = []
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, revalidate_instances="never")
 
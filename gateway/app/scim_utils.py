@@ -1,41 +1,65 @@
 from __future__ import annotations
 
+import re
+from collections.abc import Mapping
+from functools import lru_cache
+from types import MappingProxyType
 from typing import Any
 
-SCIM_USER_SCHEMAS = ["urn:ietf:params:scim:schemas:core:2.0:User"]
-SCIM_GROUP_SCHEMAS = ["urn:ietf:params:scim:schemas:core:2.0:Group"]
+# Shared by every resource built below, so they are tuples nobody can mutate in place
+SCIM_USER_SCHEMAS = ("urn:ietf:params:scim:schemas:core:2.0:User",)
+SCIM_GROUP_SCHEMAS = ("urn:ietf:params:scim:schemas:core:2.0:Group",)
+
+# A single attribute comparison (RFC 7644 section 3.4.2.2): `attr op "value"`, or `attr pr`.
+# Operators are case-insensitive; the value is a double- or single-quoted string (some
+# provisioners send the latter) or a bare literal.
+_SCIM_FILTER_RE = re.compile(
+    r"""^\s*(?P<attr>[\w.:]+)\s+(?:
+        (?P<op>eq|ne|co|sw|ew|gt|ge|lt|le)\s+(?:
+            "(?P<sval>(?:[^"\\]|\\.)*)"
+            |'(?P<qval>(?:[^'\\]|\\.)*)'
+            |(?P<nval>[^\s"']\S*)
+        )
+        |(?P<pr>pr)
+    )\s*$""",
+    re.IGNORECASE | re.VERBOSE,
+)
+_SCIM_ESCAPE_RE = re.compile(r"\\(.)")
 
 
 def build_scim_user(user: Any, email: str, external_id: str | None = None, active: bool = True) -> dict[str, Any]:
     """Build SCIM User resource JSON."""
+    created = getattr(user, "created_at", None)
+    last_login = getattr(user, "last_login_at", None)
     return {
         "schemas": SCIM_USER_SCHEMAS,
-        "id": external_id or user.id if hasattr(user, "id") else "",
+        "id": external_id or getattr(user, "id", ""),
         "userName": email,
         "name": {
             "givenName": getattr(user, "given_name", ""),
             "familyName": getattr(user, "family_name", ""),
         },
-        "active": active and not (getattr(user, "is_disabled", False) if hasattr(user, "is_disabled") else False),
+        "active": active and not getattr(user, "is_disabled", False),
         "emails": [{"value": email, "primary": True}],
         "meta": {
             "resourceType": "User",
-            "created": getattr(user, "created_at", "").isoformat() if hasattr(user, "created_at") and user.created_at else "",
-            "lastModified": getattr(user, "last_login_at", "").isoformat() if hasattr(user, "last_login_at") and user.last_login_at else "",
+            "created": created.isoformat() if created else "",
+            "lastModified": last_login.isoformat() if last_login else "",
         },
     }
 
 
 def build_scim_group(group: Any, external_id: str | None = None, members: list[dict[str, Any]] | None = None) -> dict[str, Any]:
     """Build SCIM Group resource JSON."""
+    created = getattr(group, "created_at", None)
     return {
         "schemas": SCIM_GROUP_SCHEMAS,
-        "id": external_id or group.id if hasattr(group, "id") else "",
-        "displayName": group.display_name if hasattr(group, "display_name") else "",
+        "id": external_id or getattr(group, "id", ""),
+        "displayName": getattr(group, "display_name", ""),
         "members": members or [],
         "meta": {
             "resourceType": "Group",
-            "created": getattr(group, "created_at", "").isoformat() if hasattr(group, "created_at") and group.created_at else "",
+            "created": created.isoformat() if created else "",
         },
     }
 
@@ -71,17 +95,23 @@ def parse_scim_patch(operations: list[dict[str, Any]]) -> dict[str, Any]:
     return result
 
 
-def parse_scim_filter(filter_str: str) -> dict[str, Any] | None:
-    """Parse SCIM filter string like 'userName eq "email@example.com"'."""
-    if not filter_str:
-        return None
-
-    # Simple parser for common filters
-    parts = filter_str.split(" eq ", 1)
-    if len(parts) == 2:
-        attr = parts[0].strip()
-        value = parts[1].strip().strip('"').strip("'")
-        return {"attribute": attr, "value": value}
+@lru_cache(maxsize=1024)
+def parse_scim_filter(filter_str: str) -> Mapping[str, Any] | None:
+    """Parse SCIM filter string like 'userName eq "email@example.com"'.
 
-    return None
+    Returns the attribute, the lower-cased operator and the value (None for ``pr``), or None
+    when the filter is not a single comparison. Provisioners repeat the same filters, so
+    results are cached and returned read-only.
+    """
+    match = _SCIM_FILTER_RE.match(filter_str)
+    if match is None:
+        return None
 
+    if match["pr"]:
+        return MappingProxyType({"attribute": match["attr"], "op": "pr", "value": None})
+    quoted = match["sval"] if match["sval"] is not None else match["qval"]
+    if quoted is not None:
+        value = _SCIM_ESCAPE_RE.sub(r"\1", quoted)
+    else:
+        value = match["nval"]
+    return MappingProxyType({"attribute": match["attr"], "op": match["op"].lower(), "value": value})
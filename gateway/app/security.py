@@ -5,60 +5,93 @@ import hmac
 import json
 import os
 import secrets
+import time
 from datetime import datetime, timedelta, timezone
 
+import bcrypt
 import jwt as pyjwt
-from passlib.context import CryptContext
+import orjson
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+from .cache import TTLCache
+
+# bcrypt work factor for passwords; every step doubles the cost of a hash.
+# OWASP puts the floor at 10; the default 12 keeps a hash in the tens of milliseconds.
+BCRYPT_MIN_ROUNDS = 10
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+if not BCRYPT_MIN_ROUNDS <= BCRYPT_ROUNDS <= 31:
+    raise RuntimeError(f"BCRYPT_ROUNDS must be between {BCRYPT_MIN_ROUNDS} and 31")
+
+# bcrypt only reads the first 72 bytes of a secret; longer ones are truncated as passlib did,
+# so hashes written through it keep verifying.
+BCRYPT_MAX_SECRET_BYTES = 72
 
 AUDIT_HMAC_SECRET = os.getenv("AUDIT_HMAC_SECRET", "dev_audit_secret")
+# Keyed HMAC state shared by audit hashes and approval signatures; each call copies it
+# instead of encoding and padding the key again.
+_AUDIT_HMAC = hmac.new(AUDIT_HMAC_SECRET.encode("utf-8"), digestmod=hashlib.sha256)
 APPROVAL_SIG_TTL_MIN = int(os.getenv("APPROVAL_SIG_TTL_MIN", "30"))
+# Key for API key digests; changing it invalidates every issued key.
+API_KEY_PEPPER = os.getenv("API_KEY_PEPPER", "dev_api_key_pepper")
+
+# Prefix of API key hashes written before keys moved from bcrypt to HMAC-SHA256
+LEGACY_API_KEY_HASH_PREFIX = "$2"
 
 
 def hash_api_key(plain: str) -> str:
-    """Hash API key using bcrypt."""
-    return pwd_context.hash(plain)
+    """Hash API key with HMAC-SHA256.
+
+    Keys are high-entropy server-generated secrets, so a slow KDF adds nothing over a keyed
+    digest, and the digest is deterministic, so a key can be looked up by its hash.
+    """
+    return hmac.new(
+        API_KEY_PEPPER.encode("utf-8"),
+        plain.encode("utf-8"),
+        hashlib.sha256,
+    ).hexdigest()
 
 
 def verify_api_key(plain: str, hashed: str) -> bool:
-    """Verify API key against hash."""
-    return pwd_context.verify(plain, hashed)
+    """Verify API key against hash, accepting legacy bcrypt hashes."""
+    if hashed.startswith(LEGACY_API_KEY_HASH_PREFIX):
+        return verify_password(plain, hashed)
+    return hmac.compare_digest(hashed, hash_api_key(plain))
+
+
+def _bcrypt_secret(secret: str) -> bytes:
+    return secret.encode("utf-8")[:BCRYPT_MAX_SECRET_BYTES]
 
 
 def hash_password(password: str) -> str:
     """Hash password using bcrypt."""
-    return pwd_context.hash(password)
+    return bcrypt.hashpw(_bcrypt_secret(password), bcrypt.gensalt(rounds=BCRYPT_ROUNDS)).decode()
 
 
 def verify_password(plain: str, hashed: str) -> bool:
     """Verify password against hash."""
-    return pwd_context.verify(plain, hashed)
+    return bcrypt.checkpw(_bcrypt_secret(plain), hashed.encode("utf-8"))
 
 
 def hmac_hash(prev_hash: str | None, record: dict) -> str:
     """Compute HMAC hash for audit chain."""
+    # The record encoding must stay byte-for-byte stable: /audit/verify recomputes stored hashes
+    mac = _AUDIT_HMAC.copy()
     if prev_hash:
-        data = prev_hash + json.dumps(record, sort_keys=True, separators=(",", ":"))
-    else:
-        data = json.dumps(record, sort_keys=True, separators=(",", ":"))
-    return hmac.new(
-        AUDIT_HMAC_SECRET.encode("utf-8"),
-        data.encode("utf-8"),
-        hashlib.sha256,
-    ).hexdigest()
+        mac.update(prev_hash.encode("utf-8"))
+    mac.update(json.dumps(record, sort_keys=True, separators=(",", ":")).encode("utf-8"))
+    return mac.hexdigest()
 
 
 def sign_approval(payload: dict, ttl_min: int = APPROVAL_SIG_TTL_MIN) -> dict[str, str | datetime]:
     """Sign approval with HMAC token and expiration."""
     nonce = secrets.token_urlsafe(16)
     expires_at = datetime.now(timezone.utc) + timedelta(minutes=ttl_min)
-    canonical = json.dumps({**payload, "nonce": nonce, "expires_at": expires_at.isoformat()}, sort_keys=True)
-    sig = hmac.new(
-        AUDIT_HMAC_SECRET.encode("utf-8"),
-        canonical.encode("utf-8"),
-        hashlib.sha256,
-    ).hexdigest()
+    canonical = orjson.dumps(
+        {**payload, "nonce": nonce, "expires_at": expires_at.isoformat()},
+        option=orjson.OPT_SORT_KEYS,
+    )
+    mac = _AUDIT_HMAC.copy()
+    mac.update(canonical)
+    sig = mac.hexdigest()
     token = f"{nonce}.{sig[:16]}"
     return {
         "token": token,
@@ -83,6 +116,11 @@ def verify_approval(token: str, sig: str, expires_at: datetime | None) -> bool:
 JWT_SECRET = os.getenv("JWT_SECRET", "dev_jwt_secret_change_in_production")
 JWT_ALGORITHM = "HS256"
 JWT_EXPIRATION_MINUTES = int(os.getenv("JWT_EXPIRATION_MINUTES", "60"))
+JWT_DECODE_CACHE_TTL_SEC = float(os.getenv("JWT_DECODE_CACHE_TTL_SEC", "60"))
+
+# Verified payloads keyed by the token's SHA-256, so clients resending the same token skip
+# signature checks without the cache holding the tokens themselves.
+_decoded_tokens = TTLCache(ttl=JWT_DECODE_CACHE_TTL_SEC, maxsize=4096)
 
 
 def create_access_token(data: dict) -> str:
@@ -94,10 +132,23 @@ def create_access_token(data: dict) -> str:
 
 
 def decode_access_token(token: str) -> dict | None:
-    """Decode and verify JWT access token."""
+    """Decode and verify JWT access token.
+
+    The returned payload may be shared with later calls for the same token; don't mutate it.
+    """
+    key = hashlib.sha256(token.encode("utf-8")).digest()
+    payload = _decoded_tokens.get(key)
+    if payload is not None:
+        # A cached token still expires on time, whatever is left of its cache entry
+        if "exp" in payload and payload["exp"] <= time.time():
+            _decoded_tokens.pop(key)
+            return None
+        return payload
+
     try:
         payload = pyjwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM])
-        return payload
     except Exception:
         return None
+    _decoded_tokens.set(key, payload)
+    return payload
 
@@ -1,6 +1,10 @@
 """SLO (Service Level Objective) management and evaluation."""
 
+import asyncio
+import json
+import logging
 import os
+import time
 import yaml
 from pathlib import Path
 from typing import Any, Dict, List, Optional
@@ -9,9 +13,22 @@ from datetime import datetime, timedelta
 import httpx
 from prometheus_client.parser import text_string_to_metric_families
 
+try:  # LibYAML-backed parser when PyYAML was built with it
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
+logger = logging.getLogger(__name__)
+
+# How long an SLO status evaluation is reused; canary probes poll /slo/status in bursts
+SLO_STATUS_CACHE_SEC = float(os.getenv("SLO_STATUS_CACHE_SEC", "5"))
+PROMETHEUS_TIMEOUT_SEC = 10.0
+# Label that tags each series of a batched SLI query with the target it belongs to
+SLO_TARGET_LABEL = "slo_target"
+
 
 class SLOConfig:
-    """Loads and manages SLO targets from configuration."""
+    """Loads and manages SLO targets from configuration, re-reading the file when it changes."""
 
     def __init__(self, config_path: Optional[str] = None):
         if config_path is None:
@@ -20,61 +37,128 @@ class SLOConfig:
             config_path = project_root / "deploy" / "slo" / "slo.yaml"
         self.config_path = Path(config_path)
         self.targets: Dict[str, Dict[str, Any]] = {}
+        self._mtime_ns: Optional[int] = None
         self._load()
 
+    def _file_mtime_ns(self) -> Optional[int]:
+        try:
+            return self.config_path.stat().st_mtime_ns
+        except OSError:
+            return None
+
     def _load(self) -> None:
         """Load SLO targets from YAML file."""
-        if not self.config_path.exists():
+        self._mtime_ns = self._file_mtime_ns()
+        if self._mtime_ns is None:
             return
         with open(self.config_path, "r") as f:
-            data = yaml.safe_load(f)
+            data = yaml.load(f, Loader=_YamlLoader) or {}
             self.targets = data.get("targets", {})
 
+    def _reload_if_changed(self) -> None:
+        # One stat per lookup; the YAML is only parsed again after the file is modified
+        if self._file_mtime_ns() != self._mtime_ns:
+            self._load()
+
     def get_targets(self) -> Dict[str, Dict[str, Any]]:
         """Get all SLO targets."""
+        self._reload_if_changed()
         return self.targets
 
     def get_target(self, name: str) -> Optional[Dict[str, Any]]:
         """Get a specific SLO target by name."""
+        self._reload_if_changed()
         return self.targets.get(name)
 
 
 class SLOEvaluator:
     """Evaluates SLOs against Prometheus metrics."""
 
-    def __init__(self, prometheus_url: Optional[str] = None):
+    def __init__(self, prometheus_url: Optional[str] = None, config: Optional[SLOConfig] = None):
         self.prometheus_url = prometheus_url or os.getenv(
             "PROMETHEUS_URL", "http://prometheus.monitoring:9090"
         )
-        self.config = SLOConfig()
+        self.config = config or SLOConfig()
+        self._status: Optional[Dict[str, Any]] = None
+        self._status_expires_at = 0.0
+        self._status_task: Optional[asyncio.Task] = None
+        self._client: Optional[httpx.AsyncClient] = None
+
+    def _http_client(self) -> httpx.AsyncClient:
+        """Pooled Prometheus client, so every SLI query reuses kept-alive connections."""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=PROMETHEUS_TIMEOUT_SEC,
+                limits=httpx.Limits(max_keepalive_connections=4),
+            )
+        return self._client
+
+    async def aclose(self) -> None:
+        """Close the pooled Prometheus client; the next query opens a new one."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
 
     async def evaluate_sli(
         self, target_name: str, query: str, window_minutes: int = 5
     ) -> Optional[float]:
         """Evaluate a single SLI using Prometheus query."""
         try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.get(
+            response = await self._http_client().get(
+                f"{self.prometheus_url}/api/v1/query",
+                params={"query": query},
+            )
+            response.raise_for_status()
+            data = response.json()
+            if data.get("status") == "success" and data.get("data", {}).get("result"):
+                result = data["data"]["result"][0]
+                value = float(result.get("value", [None, None])[1])
+                return value
+        except Exception as e:
+            print(f"Error evaluating SLI {target_name}: {e}")
+        return None
+
+    async def evaluate_slis(self, queries: Dict[str, str]) -> Dict[str, Optional[float]]:
+        """Evaluate SLIs keyed by target name, in one Prometheus query when possible.
+
+        Each query's series are tagged with its target name and the queries are joined with
+        ``or``, so one round trip answers every target. If the combined expression fails, for
+        example because a target's SLI is a scalar, the targets are queried one by one.
+        """
+        if len(queries) > 1:
+            combined = " or ".join(
+                f'label_replace(({query}), "{SLO_TARGET_LABEL}", {json.dumps(name)}, "", "")'
+                for name, query in queries.items()
+            )
+            try:
+                response = await self._http_client().post(
                     f"{self.prometheus_url}/api/v1/query",
-                    params={"query": query},
+                    data={"query": combined},
                 )
                 response.raise_for_status()
                 data = response.json()
-                if data.get("status") == "success" and data.get("data", {}).get("result"):
-                    result = data["data"]["result"][0]
-                    value = float(result.get("value", [None, None])[1])
-                    return value
-        except Exception as e:
-            print(f"Error evaluating SLI {target_name}: {e}")
-        return None
+                if data.get("status") == "success" and data["data"]["resultType"] == "vector":
+                    values: Dict[str, float] = {}
+                    for series in data["data"]["result"]:
+                        name = series["metric"].get(SLO_TARGET_LABEL)
+                        if name in queries and name not in values:
+                            values[name] = float(series["value"][1])
+                    return {name: values.get(name) for name in queries}
+            except Exception as e:
+                logger.warning("Error evaluating batched SLIs, querying each target: %s", e)
+
+        values = await asyncio.gather(
+            *(self.evaluate_sli(name, query) for name, query in queries.items())
+        )
+        return dict(zip(queries, values, strict=True))
 
     async def check_status(self, check_canary: bool = False) -> Dict[str, Any]:
         """Check current SLO status and return ok/failure reasons."""
         reasons: List[str] = []
         all_ok = True
 
-        targets = self.config.get_targets()
-        for name, target in targets.items():
+        checked = []
+        for name, target in self.config.get_targets().items():
             sli_query = target.get("sli")
             if not sli_query:
                 continue
@@ -82,9 +166,11 @@ class SLOEvaluator:
             objective = target.get("objective") or target.get("objective_ms")
             if objective is None:
                 continue
+            checked.append((name, target, objective))
 
-            # Evaluate SLI
-            value = await self.evaluate_sli(name, sli_query)
+        values = await self.evaluate_slis({name: target["sli"] for name, target, _ in checked})
+        for name, target, objective in checked:
+            value = values[name]
             if value is None:
                 reasons.append(f"{name}: Could not evaluate SLI")
                 all_ok = False
@@ -108,24 +194,45 @@ class SLOEvaluator:
 
         return {"ok": all_ok, "reasons": reasons, "timestamp": datetime.utcnow().isoformat()}
 
+    async def cached_status(self) -> Dict[str, Any]:
+        """``check_status`` result reused for SLO_STATUS_CACHE_SEC.
+
+        Only one evaluation runs at a time; callers arriving while it is in flight await the
+        same result instead of querying Prometheus again.
+        """
+        if self._status is not None and time.monotonic() < self._status_expires_at:
+            return self._status
+        task = self._status_task
+        if task is None or task.get_loop() is not asyncio.get_running_loop():
+            task = self._status_task = asyncio.create_task(self._refresh_status())
+        # A disconnecting caller must not cancel the evaluation the others are waiting on
+        return await asyncio.shield(task)
+
+    async def _refresh_status(self) -> Dict[str, Any]:
+        try:
+            status = await self.check_status()
+            self._status = status
+            self._status_expires_at = time.monotonic() + SLO_STATUS_CACHE_SEC
+            return status
+        finally:
+            self._status_task = None
+
 
-# Global instance
-_slo_config: Optional[SLOConfig] = None
-_slo_evaluator: Optional[SLOEvaluator] = None
+# Global instances, built at import so the first request does not pay for loading the config
+_slo_config = SLOConfig()
+_slo_evaluator = SLOEvaluator(config=_slo_config)
 
 
 def get_slo_config() -> SLOConfig:
-    """Get or create SLO config singleton."""
-    global _slo_config
-    if _slo_config is None:
-        _slo_config = SLOConfig()
+    """Get SLO config singleton."""
     return _slo_config
 
 
 def get_slo_evaluator() -> SLOEvaluator:
-    """Get or create SLO evaluator singleton."""
-    global _slo_evaluator
-    if _slo_evaluator is None:
-        _slo_evaluator = SLOEvaluator()
+    """Get SLO evaluator singleton."""
     return _slo_evaluator
 
+
+async def close_slo_evaluator() -> None:
+    """Release the evaluator's Prometheus connections."""
+    await _slo_evaluator.aclose()
@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import time
+from typing import Any
+
+from fastapi import FastAPI
+
+TEMPORAL_HOST = os.getenv("TEMPORAL_HOST", "temporal:7233")
+TEMPORAL_NAMESPACE = os.getenv("TEMPORAL_NAMESPACE", "default")
+TEMPORAL_CONNECT_TIMEOUT_SEC = float(os.getenv("TEMPORAL_CONNECT_TIMEOUT_SEC", "5"))
+# After a failed connect, callers fail fast (and fall back) for this long before retrying.
+TEMPORAL_RETRY_AFTER_SEC = float(os.getenv("TEMPORAL_RETRY_AFTER_SEC", "30"))
+
+logger = logging.getLogger(__name__)
+
+_connect_lock = asyncio.Lock()
+# No back-off until a connect has actually failed
+_last_failure = float("-inf")
+
+
+async def get_client(app: FastAPI) -> Any:
+    """Return the process-wide Temporal client cached on ``app.state``, connecting if needed."""
+    global _last_failure
+
+    client = getattr(app.state, "temporal_client", None)
+    if client is not None:
+        return client
+
+    async with _connect_lock:
+        client = getattr(app.state, "temporal_client", None)
+        if client is not None:
+            return client
+        if time.monotonic() - _last_failure < TEMPORAL_RETRY_AFTER_SEC:
+            raise ConnectionError("temporal unavailable; waiting before reconnecting")
+
+        # Lazy import to avoid Pydantic TypedDict conflicts at startup
+        from temporalio.client import Client
+
+        try:
+            client = await asyncio.wait_for(
+                Client.connect(TEMPORAL_HOST, namespace=TEMPORAL_NAMESPACE),
+                timeout=TEMPORAL_CONNECT_TIMEOUT_SEC,
+            )
+        except Exception:
+            _last_failure = time.monotonic()
+            raise
+        app.state.temporal_client = client
+        return client
+
+
+def reset_client(app: FastAPI) -> None:
+    """Forget the cached client after a failed call so the next caller reconnects."""
+    app.state.temporal_client = None
+
+
+async def connect_on_startup(app: FastAPI) -> None:
+    try:
+        await get_client(app)
+    except Exception as e:
+        logger.warning("Temporal not reachable at startup, runs will fall back inline: %s", e)
@@ -7,12 +7,18 @@ from fastapi import Header, HTTPException, Request, status
 from sqlalchemy import select
 from sqlalchemy.orm import Session
 
+from .cache import TTLCache, invalidate_lists_on_commit
 from .db import SessionLocal
 from .models import Project, Tenant
 
 DEFAULT_TENANT_NAME = os.getenv("DEFAULT_TENANT_NAME", "default")
 DEFAULT_PROJECT_NAME = os.getenv("DEFAULT_PROJECT_NAME", "default")
 AUTO_CREATE_PROJECTS = os.getenv("AUTO_CREATE_PROJECTS", "false").lower() == "true"
+TENANCY_CACHE_TTL_SEC = float(os.getenv("TENANCY_CACHE_TTL_SEC", "60"))
+
+# Resolved ids keyed by ("tenant", name) / ("project", tenant_id, name). Only rows that
+# already existed are cached, so a rolled-back auto-create never leaks a dangling id.
+_tenancy_cache = TTLCache(ttl=TENANCY_CACHE_TTL_SEC, maxsize=4096)
 
 
 def resolve_tenant(request: Request, db: Session) -> str:
@@ -28,11 +34,18 @@ def resolve_tenant(request: Request, db: Session) -> str:
         pass
 
     # 3. Fallback to default tenant
+    cache_key = ("tenant", DEFAULT_TENANT_NAME)
+    cached = _tenancy_cache.get(cache_key)
+    if cached:
+        return cached
+
     tenant = db.scalar(select(Tenant).where(Tenant.name == DEFAULT_TENANT_NAME))
     if not tenant:
         tenant = Tenant(name=DEFAULT_TENANT_NAME)
         db.add(tenant)
         db.flush()
+    else:
+        _tenancy_cache.set(cache_key, tenant.id)
 
     return tenant.id
 
@@ -44,6 +57,11 @@ def resolve_project(request: Request, db: Session, tenant_id: str) -> str | None
     if not project_name:
         return None
 
+    cache_key = ("project", tenant_id, project_name)
+    cached = _tenancy_cache.get(cache_key)
+    if cached:
+        return cached
+
     # Find project
     project = db.scalar(
         select(Project).where(Project.tenant_id == tenant_id, Project.name == project_name)
@@ -54,23 +72,32 @@ def resolve_project(request: Request, db: Session, tenant_id: str) -> str | None
             project = Project(tenant_id=tenant_id, name=project_name)
             db.add(project)
             db.flush()
+            invalidate_lists_on_commit(db, "projects", tenant_id)
         else:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"project '{project_name}' not found",
             )
+    else:
+        _tenancy_cache.set(cache_key, project.id)
 
     return project.id
 
 
 def get_tenant_and_project(request: Request, db: Session) -> tuple[str, str | None]:
     """Resolve tenant_id and project_id for request."""
+    # authorize() and the handler both resolve tenancy; only do the work once per request
+    resolved = getattr(request.state, "tenancy", None)
+    if resolved is not None:
+        return resolved
+
     tenant_id = resolve_tenant(request, db)
     project_id = resolve_project(request, db, tenant_id)
 
     # Attach to request state
     request.state.tenant_id = tenant_id
     request.state.project_id = project_id
+    request.state.tenancy = (tenant_id, project_id)
 
     return tenant_id, project_id
 
@@ -0,0 +1,11 @@
+"""Shared test fixtures."""
+
+from __future__ import annotations
+
+import pytest
+
+
+@pytest.fixture
+def no_rate_limit(monkeypatch: pytest.MonkeyPatch) -> None:
+    # Token buckets start empty, so a fresh subject's first request would be throttled
+    monkeypatch.setattr("app.middleware.check_rate_limit", lambda *args, **kwargs: True)
@@ -0,0 +1,96 @@
+"""Tests for the audit hash chain."""
+
+from __future__ import annotations
+
+import json
+import os
+from uuid import uuid4
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+
+os.environ["DATABASE_URL"] = "sqlite+pysqlite:///:memory:"
+
+from app.audit import write_audit, write_audit_batch  # noqa: E402
+from app.db import SessionLocal, init_db  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models import AuditLog  # noqa: E402
+from app.routers.scim import scim_settings  # noqa: E402
+
+
+@pytest.fixture
+def client(no_rate_limit: None) -> TestClient:
+    init_db()
+    return TestClient(app)
+
+
+def _entry(action: str) -> dict:
+    return {
+        "actor_type": "system",
+        "actor_id": "test",
+        "action": action,
+        "resource_type": "test",
+        "resource_id": action,
+    }
+
+
+def test_batch_written_in_one_transaction_verifies(client: TestClient) -> None:
+    tenant_id = str(uuid4())
+    with SessionLocal() as db:
+        write_audit(tenant_id=tenant_id, db=db, **_entry("first"))
+        write_audit_batch(db, tenant_id, [_entry(f"batch-{i}") for i in range(20)])
+        write_audit(tenant_id=tenant_id, db=db, **_entry("last"))
+        db.commit()
+        # Postgres freezes now() for the whole transaction, so the chain order must not rely on it
+        stamps = db.scalars(select(AuditLog.ts).where(AuditLog.tenant_id == tenant_id)).all()
+    assert len(set(stamps)) == len(stamps)
+
+    resp = client.get("/audit/verify", params={"tenant_id": tenant_id})
+    assert resp.status_code == 200
+    assert resp.json() == {"ok": True, "verified_count": 22}
+
+
+def test_scim_role_sync_audits_verify(client: TestClient, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("SCIM_ENABLED", "true")
+    monkeypatch.setenv("SCIM_BEARER_TOKEN", "scim-test-token")
+    monkeypatch.setenv("SCIM_ROLE_MAP", json.dumps({"SRE": ["audit-oncall"]}))
+    scim_settings.cache_clear()
+    headers = {"Authorization": "Bearer scim-test-token"}
+    try:
+        members = []
+        for _ in range(3):
+            external_id = f"audit-user-{uuid4()}"
+            resp = client.post(
+                "/scim/v2/Users",
+                headers=headers,
+                json={"id": external_id, "userName": f"{external_id}@example.com"},
+            )
+            assert resp.status_code == 201
+            members.append({"value": external_id})
+        # Syncs roles of every member, auditing each sync within the request's transaction
+        resp = client.post(
+            "/scim/v2/Groups",
+            headers=headers,
+            json={
+                "id": f"audit-group-{uuid4()}",
+                "displayName": "audit-oncall",
+                "members": members,
+            },
+        )
+        assert resp.status_code == 201
+    finally:
+        scim_settings.cache_clear()
+
+    with SessionLocal() as db:
+        syncs = db.execute(
+            select(AuditLog.tenant_id, AuditLog.ts).where(AuditLog.action == "scim.roles.sync")
+        ).all()
+    assert len(syncs) >= 3
+    assert len({ts for _, ts in syncs}) == len(syncs)
+    (tenant_id,) = {tenant_id for tenant_id, _ in syncs}
+
+    resp = client.get("/audit/verify", params={"tenant_id": tenant_id})
+    assert resp.status_code == 200
+    assert resp.json()["ok"] is True
+
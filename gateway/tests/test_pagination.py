@@ -0,0 +1,101 @@
+"""Tests for cursor pagination of list endpoints."""
+
+from __future__ import annotations
+
+import os
+from uuid import uuid4
+
+import pytest
+from fastapi.testclient import TestClient
+
+os.environ["DATABASE_URL"] = "sqlite+pysqlite:///:memory:"
+
+from app.db import SessionLocal, init_db  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models import RoleBinding, Run  # noqa: E402
+from app.pagination import NEXT_CURSOR_HEADER  # noqa: E402
+from app.security import create_access_token  # noqa: E402
+
+
+@pytest.fixture
+def client(no_rate_limit: None) -> TestClient:
+    init_db()
+    email = f"admin-{uuid4()}@example.com"
+    with SessionLocal() as db:
+        db.add(
+            RoleBinding(tenant_id="default", subject_type="user", subject_id=email, role="Admin")
+        )
+        db.commit()
+    token = create_access_token({"sub": str(uuid4()), "email": email, "roles": ["Admin"]})
+    return TestClient(app, headers={"Authorization": f"Bearer {token}"})
+
+
+@pytest.fixture
+def runbook_names(client: TestClient) -> list[str]:
+    names = [f"paged-{uuid4()}" for _ in range(5)]
+    for name in names:
+        resp = client.post("/runbooks", json={"name": name, "yaml": f"name: {name}\nsteps: []"})
+        assert resp.status_code == 201
+    return names
+
+
+def _names(resp) -> list[str]:
+    return [item["name"] for item in resp.json()]
+
+
+def test_list_without_limit_returns_everything(
+    client: TestClient, runbook_names: list[str]
+) -> None:
+    resp = client.get("/runbooks")
+    assert resp.status_code == 200
+    assert NEXT_CURSOR_HEADER not in resp.headers
+    assert set(runbook_names) <= set(_names(resp))
+
+
+def test_cursor_walks_every_page_once(client: TestClient, runbook_names: list[str]) -> None:
+    total = len(client.get("/runbooks").json())
+    seen: list[str] = []
+    params: dict[str, str | int] = {"limit": 2}
+    while True:
+        resp = client.get("/runbooks", params=params)
+        assert resp.status_code == 200
+        page = _names(resp)
+        assert len(page) <= 2
+        seen += page
+        cursor = resp.headers.get(NEXT_CURSOR_HEADER)
+        if not cursor:
+            break
+        params = {"limit": 2, "cursor": cursor}
+    assert len(seen) == len(set(seen)) == total
+    assert set(runbook_names) <= set(seen)
+
+
+def test_invalid_cursor_and_limit_are_rejected(client: TestClient) -> None:
+    assert client.get("/runbooks", params={"cursor": "not-a-cursor"}).status_code == 400
+    assert client.get("/runbooks", params={"limit": 0}).status_code == 422
+    assert client.get("/runbooks", params={"limit": 10_000}).status_code == 422
+
+
+def test_next_cursor_header_is_exposed_to_browsers(
+    client: TestClient, runbook_names: list[str]
+) -> None:
+    resp = client.get("/runbooks", params={"limit": 1}, headers={"Origin": "http://localhost:5173"})
+    assert resp.headers.get(NEXT_CURSOR_HEADER)
+    exposed = resp.headers["access-control-expose-headers"].lower().split(",")
+    assert NEXT_CURSOR_HEADER.lower() in (header.strip() for header in exposed)
+
+
+def test_runs_offset_still_pages(client: TestClient) -> None:
+    with SessionLocal() as db:
+        db.add_all(Run(tenant_id="default", runbook_id=f"rb-{uuid4()}") for _ in range(3))
+        db.commit()
+    first = client.get("/runs", params={"limit": 2})
+    assert first.status_code == 200
+    cursor = first.headers[NEXT_CURSOR_HEADER]
+    by_cursor = client.get("/runs", params={"limit": 2, "cursor": cursor})
+    by_offset = client.get("/runs", params={"limit": 2, "offset": 2})
+    assert by_offset.status_code == 200
+    assert [run["id"] for run in by_offset.json()] == [run["id"] for run in by_cursor.json()]
+
+    resp = client.get("/runs", params={"offset": 2, "cursor": cursor})
+    assert resp.status_code == 400
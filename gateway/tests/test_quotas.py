@@ -0,0 +1,100 @@
+"""Tests for quota enforcement against the cached usage snapshot."""
+
+from __future__ import annotations
+
+import os
+import threading
+from uuid import uuid4
+
+import pytest
+
+os.environ["DATABASE_URL"] = "sqlite+pysqlite:///:memory:"
+
+from app.billing import quotas  # noqa: E402
+from app.billing.quotas import QuotaExceeded, enforce_quota  # noqa: E402
+
+
+@pytest.fixture
+def db_usage(monkeypatch: pytest.MonkeyPatch) -> dict:
+    """Stand-in for the usage query: returns ``db_usage["adapter_calls"]`` and counts reads."""
+    monkeypatch.setenv("BILLING_ENABLED", "true")
+    monkeypatch.setenv("BILLING_SOFT_LIMIT_ADAPTER_CALLS_DAY", "10")
+    monkeypatch.setenv("BILLING_HARD_LIMIT_ADAPTER_CALLS_DAY", "20")
+    state = {"adapter_calls": 0, "reads": 0}
+
+    def get_day_and_month_usage(db, tenant_id):
+        # The DB is read without holding the snapshot lock
+        assert not quotas._usage_lock.locked()
+        state["reads"] += 1
+        usage = {"tokens": 0, "cost": 0.0, "adapter_calls": state["adapter_calls"]}
+        return {"day": dict(usage), "month": dict(usage)}
+
+    monkeypatch.setattr(quotas, "get_day_and_month_usage", get_day_and_month_usage)
+    quotas._usage_cache.clear()
+    yield state
+    quotas._usage_cache.clear()
+
+
+CALL = {"adapter_calls": 1}
+
+
+def test_snapshot_admits_and_reserves(db_usage: dict) -> None:
+    tenant_id = str(uuid4())
+    for _ in range(5):
+        assert enforce_quota(None, tenant_id, CALL) is False
+    # Only the first call read usage; the rest were admitted from the snapshot
+    assert db_usage["reads"] == 1
+    assert quotas._usage_cache.get(tenant_id)["day"]["adapter_calls"] == 5
+
+
+def test_snapshot_warns_near_soft_limit(db_usage: dict) -> None:
+    tenant_id = str(uuid4())
+    db_usage["adapter_calls"] = 7
+    assert enforce_quota(None, tenant_id, CALL) is False
+    # 8 calls reserved reach 80% of the soft limit of 10
+    assert enforce_quota(None, tenant_id, CALL) is True
+    assert db_usage["reads"] == 1
+
+
+def test_snapshot_without_headroom_refreshes(db_usage: dict) -> None:
+    tenant_id = str(uuid4())
+    db_usage["adapter_calls"] = 18
+    enforce_quota(None, tenant_id, CALL)
+    # The snapshot now holds 19 calls, so the next one is decided on fresh usage
+    db_usage["adapter_calls"] = 2
+    assert enforce_quota(None, tenant_id, CALL) is False
+    assert db_usage["reads"] == 2
+    assert quotas._usage_cache.get(tenant_id)["day"]["adapter_calls"] == 3
+
+
+def test_fresh_usage_over_limit_raises(db_usage: dict) -> None:
+    tenant_id = str(uuid4())
+    db_usage["adapter_calls"] = 18
+    enforce_quota(None, tenant_id, CALL)
+    db_usage["adapter_calls"] = 19
+    with pytest.raises(QuotaExceeded) as exc_info:
+        enforce_quota(None, tenant_id, CALL)
+    assert exc_info.value.metric == "adapter_calls"
+    assert db_usage["reads"] == 2
+    # A refused call reserves nothing
+    assert quotas._usage_cache.get(tenant_id)["day"]["adapter_calls"] == 19
+
+
+def test_concurrent_reservations_are_not_lost(
+    db_usage: dict, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setenv("BILLING_HARD_LIMIT_ADAPTER_CALLS_DAY", "100000")
+    tenant_id = str(uuid4())
+    enforce_quota(None, tenant_id, CALL)
+
+    def admit() -> None:
+        for _ in range(100):
+            enforce_quota(None, tenant_id, CALL)
+
+    threads = [threading.Thread(target=admit) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert db_usage["reads"] == 1
+    assert quotas._usage_cache.get(tenant_id)["day"]["adapter_calls"] == 801
@@ -0,0 +1,87 @@
+"""Tests for SCIM filter parsing."""
+
+from __future__ import annotations
+
+import os
+from collections.abc import Iterator
+
+import pytest
+from fastapi.testclient import TestClient
+
+os.environ["DATABASE_URL"] = "sqlite+pysqlite:///:memory:"
+
+from app.db import init_db  # noqa: E402
+from app.main import app  # noqa: E402
+from app.routers.scim import scim_settings  # noqa: E402
+from app.scim_utils import parse_scim_filter  # noqa: E402
+
+
+@pytest.mark.parametrize(
+    ("filter_str", "value"),
+    [
+        ('userName eq "alice@example.com"', "alice@example.com"),
+        ("userName eq 'alice@example.com'", "alice@example.com"),
+        ("userName eq alice@example.com", "alice@example.com"),
+        ('userName  EQ  "alice@example.com" ', "alice@example.com"),
+        ('displayName eq "On Call"', "On Call"),
+        ("displayName eq 'On Call'", "On Call"),
+        (r'displayName eq "say \"hi\""', 'say "hi"'),
+        (r"displayName eq 'it\'s'", "it's"),
+    ],
+)
+def test_parse_eq_filter(filter_str: str, value: str) -> None:
+    parsed = parse_scim_filter(filter_str)
+    assert parsed is not None
+    assert parsed["op"] == "eq"
+    assert parsed["value"] == value
+
+
+def test_parse_other_operators() -> None:
+    assert dict(parse_scim_filter('userName ne "bob"')) == {
+        "attribute": "userName",
+        "op": "ne",
+        "value": "bob",
+    }
+    assert dict(parse_scim_filter("title pr")) == {"attribute": "title", "op": "pr", "value": None}
+
+
+@pytest.mark.parametrize(
+    "filter_str",
+    [
+        "",
+        "userName",
+        "userName eq",
+        'userName is "alice@example.com"',
+        'userName eq "alice@example.com" and active eq true',
+        'userName eq "unterminated',
+    ],
+)
+def test_parse_non_matching_filter(filter_str: str) -> None:
+    assert parse_scim_filter(filter_str) is None
+
+
+@pytest.fixture
+def scim_client(no_rate_limit: None, monkeypatch: pytest.MonkeyPatch) -> Iterator[TestClient]:
+    init_db()
+    monkeypatch.setenv("SCIM_ENABLED", "true")
+    monkeypatch.setenv("SCIM_BEARER_TOKEN", "scim-test-token")
+    scim_settings.cache_clear()
+    yield TestClient(app, headers={"Authorization": "Bearer scim-test-token"})
+    scim_settings.cache_clear()
+
+
+@pytest.mark.parametrize(
+    ("path", "filter_str"),
+    [
+        ("/scim/v2/Users", 'userName eq "alice@example.com" and active eq true'),
+        ("/scim/v2/Users", 'userName sw "alice"'),
+        ("/scim/v2/Users", 'externalId eq "alice"'),
+        ("/scim/v2/Groups", 'displayName eq "On Call" or displayName eq "SRE"'),
+    ],
+)
+def test_list_rejects_unsupported_filter(
+    scim_client: TestClient, path: str, filter_str: str
+) -> None:
+    resp = scim_client.get(path, params={"filter": filter_str})
+    assert resp.status_code == 400
+    assert resp.json()["detail"]["scimType"] == "invalidFilter"
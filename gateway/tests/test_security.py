@@ -242,3 +242,56 @@ def test_secret_redaction():
     assert redacted["password"] == "***REDACTED***"
     assert redacted["username"] == "user"  # Not sensitive
 
+
+
+def _add_api_key(db_session, hashed_key: str):
+    from app.models import APIKey
+
+    api_key = APIKey(tenant_id=str(uuid4()), name="test-key", hashed_key=hashed_key)
+    db_session.add(api_key)
+    db_session.commit()
+    return api_key
+
+
+def test_resolve_new_api_key(client: TestClient, db_session):
+    """Test that an HMAC-hashed key resolves by its digest."""
+    from app.middleware import resolve_api_key
+    from app.security import hash_api_key
+
+    plain = f"oka_{uuid4().hex}"
+    api_key = _add_api_key(db_session, hash_api_key(plain))
+
+    assert resolve_api_key(plain) == (api_key.tenant_id, "apikey", api_key.id)
+    assert resolve_api_key(f"oka_{uuid4().hex}") == (None, None, None)
+
+
+def test_resolve_legacy_api_key_rehashes(client: TestClient, db_session):
+    """Test that a legacy bcrypt key still resolves and is moved to the HMAC hash."""
+    from app.middleware import resolve_api_key
+    from app.security import LEGACY_API_KEY_HASH_PREFIX, hash_api_key, hash_password
+
+    plain = f"oka_{uuid4().hex}"
+    legacy_hash = hash_password(plain)
+    assert legacy_hash.startswith(LEGACY_API_KEY_HASH_PREFIX)
+    api_key = _add_api_key(db_session, legacy_hash)
+    expected = (api_key.tenant_id, "apikey", api_key.id)
+
+    assert resolve_api_key(plain) == expected
+    db_session.refresh(api_key)
+    assert api_key.hashed_key == hash_api_key(plain)
+
+    # After the rehash the key resolves through the digest lookup
+    assert resolve_api_key(plain) == expected
+
+
+def test_resolve_inactive_api_key(client: TestClient, db_session):
+    """Test that a revoked key no longer resolves."""
+    from app.middleware import resolve_api_key
+    from app.security import hash_api_key
+
+    plain = f"oka_{uuid4().hex}"
+    api_key = _add_api_key(db_session, hash_api_key(plain))
+    api_key.is_active = False
+    db_session.commit()
+
+    assert resolve_api_key(plain) == (None, None, None)